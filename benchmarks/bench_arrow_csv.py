@@ -0,0 +1,95 @@
+"""Benchmark of the CSV parser of the raw partitions.  Synthetic partitions are
+    written, then loaded with pandas.CSVDataSet and with ArrowCSVDataSet (NumPy and
+    Arrow backed columns), with all columns and with Preprocessing.get_load_args(),
+    and parse time and memory are compared.
+
+    Run from the kedro project main folder:
+        python benchmarks/bench_arrow_csv.py --rows 4000000 --partitions 4
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import species_observations.utils as utl
+from species_observations.scripts.data_processing import Preprocessing
+from species_observations.scripts.synthetic_data import SyntheticObservations
+
+ARROW_CSV_TYPE = (
+    "species_observations.extras.datasets.arrow_csv_dataset.ArrowCSVDataSet"
+)
+
+
+def measure_load(folder: Path, dataset: str, load_args: Dict = None) -> Dict:
+    """Loads all partitions of folder and measures the load
+
+    Parameters
+    ----------
+    folder : Path
+        Folder of the partitioned data
+    dataset : str
+        Type of the partitions
+    load_args : Dict, optional
+        Load arguments of each partition, by default None
+
+    Returns
+    -------
+    Dict
+        rows, seconds and size of the loaded dataframe, in MB
+    """
+    pd_dict = utl.load_partitioned_ds_kedro(
+        str(folder), {"type": dataset}, load_args=load_args
+    )
+    start = time.perf_counter()
+    df_loaded = utl.partitioned_ds_to_df(pd_dict, max_workers=1)
+    seconds = time.perf_counter() - start
+    return {
+        "rows": len(df_loaded),
+        "seconds": seconds,
+        "frame_mb": df_loaded.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def run(n_rows: int, n_partitions: int):
+    """Prints the load measurements of every parser
+
+    Parameters
+    ----------
+    n_rows : int
+        Total number of synthetic rows
+    n_partitions : int
+        Number of partitions
+    """
+    config = utl.load_config_file_kedro(kedro_env="base")
+    load_args = Preprocessing(config["parameters"]).get_load_args()
+    with tempfile.TemporaryDirectory() as folder:
+        SyntheticObservations().write(folder, n_rows, n_partitions)
+        results = {
+            "pandas all": measure_load(Path(folder), "pandas.CSVDataSet"),
+            "arrow all": measure_load(Path(folder), ARROW_CSV_TYPE),
+            "pandas projected": measure_load(
+                Path(folder), "pandas.CSVDataSet", load_args
+            ),
+            "arrow projected": measure_load(Path(folder), ARROW_CSV_TYPE, load_args),
+            "arrow projected, arrow dtypes": measure_load(
+                Path(folder), ARROW_CSV_TYPE, {**load_args, "dtype_backend": "pyarrow"}
+            ),
+            "arrow projected, 1 thread": measure_load(
+                Path(folder), ARROW_CSV_TYPE, {**load_args, "use_threads": False}
+            ),
+        }
+    print(f"{'loader':>30} {'rows':>10} {'time [s]':>9} {'frame [MB]':>11}")
+    for name, result in results.items():
+        print(
+            f"{name:>30} {result['rows']:>10} {result['seconds']:>9.3f} "
+            f"{result['frame_mb']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=4_000_000)
+    parser.add_argument("--partitions", type=int, default=4)
+    args = parser.parse_args()
+    run(args.rows, args.partitions)
@@ -0,0 +1,102 @@
+"""Benchmark of the column projection pushed into the species_data loader.
+    The sample partitions are scaled up by repetition, then loaded with all columns
+    and with Preprocessing.get_load_args(), and parse time and memory are compared.
+
+    Run from the kedro project main folder:
+        python benchmarks/bench_column_projection.py --scale 100
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+import species_observations.utils as utl
+from species_observations.scripts.data_processing import Preprocessing
+
+SAMPLE_FOLDER = Path("data//01_raw//species_bigQuery_sample")
+
+
+def write_scaled_partitions(folder: Path, scale: int):
+    """Writes every sample partition repeated scale times
+
+    Parameters
+    ----------
+    folder : Path
+        Folder where the partitions are written
+    scale : int
+        Number of repetitions of the rows of each partition
+    """
+    for sample_file in sorted(SAMPLE_FOLDER.glob("*.csv")):
+        df_sample = pd.read_csv(sample_file)
+        pd.concat([df_sample] * scale, ignore_index=True).to_csv(
+            folder / sample_file.name, index=False
+        )
+
+
+def measure_load(folder: Path, load_args: Dict = None) -> Dict:
+    """Loads all partitions of folder and measures the load
+
+    Parameters
+    ----------
+    folder : Path
+        Folder of the partitioned data
+    load_args : Dict, optional
+        Load arguments of each partition, by default None
+
+    Returns
+    -------
+    Dict
+        seconds, peak traced memory and size of the loaded dataframe, in MB
+    """
+    pd_dict = utl.load_partitioned_ds_kedro(
+        str(folder), "pandas.CSVDataSet", load_args=load_args
+    )
+    tracemalloc.start()
+    start = time.perf_counter()
+    df_loaded = utl.partitioned_ds_to_df(pd_dict, max_workers=1)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": len(df_loaded),
+        "seconds": seconds,
+        "peak_mb": peak / 2**20,
+        "frame_mb": df_loaded.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def run(scale: int):
+    """Prints the load measurements with and without projection
+
+    Parameters
+    ----------
+    scale : int
+        Number of repetitions of the rows of each sample partition
+    """
+    config = utl.load_config_file_kedro(kedro_env="base")
+    load_args = Preprocessing(config["parameters"]).get_load_args()
+    with tempfile.TemporaryDirectory() as folder:
+        write_scaled_partitions(Path(folder), scale)
+        results = {
+            "all columns": measure_load(Path(folder)),
+            "projected": measure_load(Path(folder), load_args),
+        }
+    print(
+        f"{'loader':>12} {'rows':>10} {'time [s]':>9} {'peak [MB]':>10} {'frame [MB]':>11}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:>12} {result['rows']:>10} {result['seconds']:>9.3f} "
+            f"{result['peak_mb']:>10.1f} {result['frame_mb']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+    run(args.scale)
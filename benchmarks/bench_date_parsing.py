@@ -0,0 +1,86 @@
+"""Benchmark of the eventdate parsing.  Compares pd.to_datetime with format inference
+    (previous path of Preprocessing.preprocessing_time_data) against
+    utils.parse_dates_cached with and without the fixed GBIF format, and against
+    utils.dates_from_components.
+
+    Run from the kedro project main folder:
+        python benchmarks/bench_date_parsing.py --rows 5000000 --days 3650
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import species_observations.utils as utl
+
+GBIF_DATE_FORMAT = "%Y-%m-%d %H:%M:%S %Z"
+
+
+def make_dates(n_rows: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """Random GBIF-like event dates, with n_days distinct days
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows
+    n_days : int
+        Number of distinct days, starting on 2015-01-01
+    seed : int, optional
+        Random seed, by default 0
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns eventdate (strings), year, month and day
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp("2015-01-01") + pd.to_timedelta(
+        rng.integers(0, n_days, n_rows), unit="D"
+    )
+    return pd.DataFrame(
+        {
+            "eventdate": days.strftime("%Y-%m-%d 00:00:00 UTC"),
+            "year": days.year,
+            "month": days.month.astype(float),
+            "day": days.day.astype(float),
+        }
+    )
+
+
+def run(n_rows: int, n_days: int):
+    """Prints rows per second of every parser
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows
+    n_days : int
+        Number of distinct days
+    """
+    df_dates = make_dates(n_rows, n_days)
+    parsers = {
+        "pd.to_datetime": lambda: pd.to_datetime(df_dates["eventdate"]),
+        "cached, inferred": lambda: utl.parse_dates_cached(df_dates["eventdate"]),
+        "cached, format": lambda: utl.parse_dates_cached(
+            df_dates["eventdate"], GBIF_DATE_FORMAT
+        ),
+        "components": lambda: utl.dates_from_components(
+            df_dates["year"], df_dates["month"], df_dates["day"], tz="UTC"
+        ),
+    }
+    print(f"{n_rows} rows, {n_days} distinct days")
+    print(f"{'parser':>18} {'time [s]':>9} {'rows/s':>14}")
+    for name, parser in parsers.items():
+        start = time.perf_counter()
+        parser()
+        seconds = time.perf_counter() - start
+        print(f"{name:>18} {seconds:>9.3f} {n_rows / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--days", type=int, default=3650)
+    args = parser.parse_args()
+    run(args.rows, args.days)
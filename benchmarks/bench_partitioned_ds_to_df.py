@@ -0,0 +1,97 @@
+"""Benchmark of utils.partitioned_ds_to_df against the previous implementation,
+    which concatenated the accumulated dataframe once per partition.
+
+    Run from the kedro project main folder:
+        python benchmarks/bench_partitioned_ds_to_df.py
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+import species_observations.utils as utl
+
+SAMPLE_FILEPATH = "data//01_raw//species_bigQuery_sample.csv"
+
+
+def legacy_partitioned_ds_to_df(pd_dict: Dict) -> pd.DataFrame:
+    """Previous implementation of utils.partitioned_ds_to_df, kept as reference
+
+    Parameters
+    ----------
+    pd_dict : Dict
+        Data loaded with PartitionedDataSet
+
+    Returns
+    -------
+    pd.DataFrame
+        Single dataframe with all data
+    """
+    df_joined = pd.DataFrame()
+    for _, partition_load_func in pd_dict.items():
+        partition_data = partition_load_func()
+        df_joined = pd.concat([df_joined, partition_data], ignore_index=True, sort=True)
+    return df_joined
+
+
+def write_partitions(folder: Path, n_partitions: int, rows_per_partition: int):
+    """Writes n_partitions csv files sampled from the project sample data
+
+    Parameters
+    ----------
+    folder : Path
+        Folder where the partitions are written
+    n_partitions : int
+        Number of partitions
+    rows_per_partition : int
+        Number of rows of each partition
+    """
+    df_sample = pd.read_csv(SAMPLE_FILEPATH)
+    for i in range(n_partitions):
+        df_part = df_sample.sample(rows_per_partition, replace=True, random_state=i)
+        df_part.to_csv(folder / f"partition_{i:05d}.csv", index=False)
+
+
+def time_call(func, *args, **kwargs) -> float:
+    """Wall time of a single call, in seconds"""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def run(partition_counts: List[int], rows_per_partition: int, max_workers: int):
+    """Times both implementations for every number of partitions and prints a table
+
+    Parameters
+    ----------
+    partition_counts : List[int]
+        Numbers of partitions to benchmark
+    rows_per_partition : int
+        Number of rows of each partition
+    max_workers : int
+        Maximum number of partitions loaded at the same time by the new implementation
+    """
+    print(f"{'partitions':>10} {'legacy [s]':>12} {'current [s]':>12} {'speedup':>8}")
+    for n_partitions in partition_counts:
+        with tempfile.TemporaryDirectory() as folder:
+            write_partitions(Path(folder), n_partitions, rows_per_partition)
+            pd_dict = utl.load_partitioned_ds_kedro(folder, "pandas.CSVDataSet")
+            legacy = time_call(legacy_partitioned_ds_to_df, pd_dict)
+            current = time_call(
+                utl.partitioned_ds_to_df, pd_dict, max_workers=max_workers
+            )
+        print(
+            f"{n_partitions:>10} {legacy:>12.3f} {current:>12.3f} {legacy / current:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--partitions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run(args.partitions, args.rows, args.workers)
@@ -0,0 +1,182 @@
+"""Stage-level benchmark of Preprocessing on synthetic data.  For every number of
+    rows, synthetic partitions are generated (see scripts/synthetic_data.py) and
+    the stages are measured separately:
+        load: PartitionedDataSet load with the column projection, and concatenation
+        preprocessing_time_data
+        time_resampling
+    Each stage is run once to measure its time, and once more under tracemalloc to
+    measure its peak memory.  Results are appended to a CSV file.
+
+    Run from the kedro project main folder:
+        python benchmarks/bench_stages.py --rows 10000 100000 1000000 --partitions 10
+"""
+import argparse
+import csv
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import species_observations.utils as utl
+from species_observations.scripts.data_processing import Preprocessing
+from species_observations.scripts.synthetic_data import SyntheticObservations
+
+RESULTS_FIELDS = [
+    "timestamp",
+    "host",
+    "rows",
+    "partitions",
+    "file_format",
+    "stage",
+    "seconds",
+    "rows_per_sec",
+    "peak_mb",
+]
+
+
+def measure(stage: Callable, measure_memory: bool) -> Dict:
+    """Runs a stage, then runs it again under tracemalloc if measure_memory
+
+    Parameters
+    ----------
+    stage : Callable
+        Function without arguments running the stage
+    measure_memory : bool
+        If False, peak memory is not measured
+
+    Returns
+    -------
+    Dict
+        'output' of the stage, 'seconds' and 'peak_mb' (None if not measured)
+    """
+    start = time.perf_counter()
+    output = stage()
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if measure_memory:
+        tracemalloc.start()
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 2**20
+    return {"output": output, "seconds": seconds, "peak_mb": peak_mb}
+
+
+def run_stages(
+    folder: Path, parameters: Dict, file_format: str, measure_memory: bool
+) -> Dict[str, Dict]:
+    """Measures every stage on the partitions of folder
+
+    Parameters
+    ----------
+    folder : Path
+        Folder of the partitions
+    parameters : Dict
+        Parameters defined in conf/base/parameters/observations_time.yml
+    file_format : str
+        'csv' or 'parquet'
+    measure_memory : bool
+        If False, peak memory is not measured
+
+    Returns
+    -------
+    Dict[str, Dict]
+        Measurements of every stage
+    """
+    prep = Preprocessing(parameters)
+    dataset = {"csv": "pandas.CSVDataSet", "parquet": "pandas.ParquetDataSet"}
+    pd_dict = utl.load_partitioned_ds_kedro(
+        str(folder), dataset[file_format], load_args=prep.get_load_args(file_format)
+    )
+    results = {}
+    results["load"] = measure(lambda: utl.partitioned_ds_to_df(pd_dict), measure_memory)
+    df_raw = results["load"]["output"]
+    results["preprocessing_time_data"] = measure(
+        lambda: prep.preprocessing_time_data(df_raw.copy()), measure_memory
+    )
+    df_preproc = results["preprocessing_time_data"]["output"]
+    results["time_resampling"] = measure(
+        lambda: prep.time_resampling(df_preproc.copy()), measure_memory
+    )
+    return results
+
+
+def run(
+    rows: List[int],
+    n_partitions: int,
+    file_format: str,
+    results_file: Path,
+    measure_memory: bool,
+):
+    """Prints and appends to results_file the measurements of every number of rows
+
+    Parameters
+    ----------
+    rows : List[int]
+        Numbers of rows
+    n_partitions : int
+        Number of partitions
+    file_format : str
+        'csv' or 'parquet'
+    results_file : Path
+        CSV file of results.  Created if it does not exist
+    measure_memory : bool
+        If False, peak memory is not measured
+    """
+    parameters = utl.load_config_file_kedro(kedro_env="base")["parameters"]
+    generator = SyntheticObservations()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    write_header = not results_file.is_file()
+
+    print(
+        f"{'rows':>11} {'stage':>24} {'time [s]':>9} {'rows/s':>13} {'peak [MB]':>10}"
+    )
+    with open(results_file, "a", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=RESULTS_FIELDS)
+        if write_header:
+            writer.writeheader()
+        for n_rows in rows:
+            with tempfile.TemporaryDirectory() as folder:
+                generator.write(folder, n_rows, n_partitions, file_format)
+                results = run_stages(
+                    Path(folder), parameters, file_format, measure_memory
+                )
+            for stage, result in results.items():
+                record = {
+                    "timestamp": timestamp,
+                    "host": platform.node(),
+                    "rows": n_rows,
+                    "partitions": n_partitions,
+                    "file_format": file_format,
+                    "stage": stage,
+                    "seconds": round(result["seconds"], 4),
+                    "rows_per_sec": round(n_rows / result["seconds"]),
+                    "peak_mb": None
+                    if result["peak_mb"] is None
+                    else round(result["peak_mb"], 1),
+                }
+                writer.writerow(record)
+                peak = "" if record["peak_mb"] is None else f"{record['peak_mb']:.1f}"
+                print(
+                    f"{n_rows:>11} {stage:>24} {record['seconds']:>9.3f} "
+                    f"{record['rows_per_sec']:>13,} {peak:>10}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--partitions", type=int, default=10)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument(
+        "--results", type=Path, default=Path("benchmarks//results//bench_stages.csv")
+    )
+    parser.add_argument("--no-memory", action="store_true")
+    args = parser.parse_args()
+    run(args.rows, args.partitions, args.format, args.results, not args.no_memory)
@@ -0,0 +1,40 @@
+"""Writes GBIF-shaped synthetic raw data, with the columns of the sample partitions.
+
+    Run from the kedro project main folder:
+        python benchmarks/generate_synthetic_data.py data/01_raw/species_synthetic \
+            --rows 10000000 --partitions 100
+    The folder can be loaded as species_data by pointing its catalog path to it
+"""
+import argparse
+import json
+import time
+
+from species_observations.scripts.synthetic_data import SyntheticObservations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("folder")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--partitions", type=int, default=10)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--species", type=int, default=2000)
+    parser.add_argument("--start", default="2015-01-01")
+    parser.add_argument("--end", default="2023-12-31")
+    parser.add_argument("--null-fraction", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = SyntheticObservations(
+        start=args.start,
+        end=args.end,
+        n_species=args.species,
+        null_count_fraction=args.null_fraction,
+        seed=args.seed,
+    )
+    start = time.perf_counter()
+    files = generator.write(args.folder, args.rows, args.partitions, args.format)
+    print(json.dumps(generator.describe()))
+    print(
+        f"{args.rows} rows in {len(files)} partitions written to {args.folder} "
+        f"in {time.perf_counter() - start:.1f} s"
+    )
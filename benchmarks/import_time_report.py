@@ -0,0 +1,86 @@
+"""Import-time report of the package and its commands, measured with
+    `python -X importtime` in a new interpreter for every command.  For each command
+    it prints the wall time, the cumulative time of its imports, the heavy modules
+    (pandas, numpy, pyarrow, kedro_datasets) it imports, and its slowest imports.
+    Budgets are enforced by src/tests/test_import_time.py
+
+    Run from the kedro project main folder:
+        python benchmarks/import_time_report.py --repeats 5 --top 10
+"""
+import argparse
+from typing import Dict, List
+
+from species_observations.scripts.import_time import (
+    heavy_modules_imported,
+    measure_command,
+    slowest_imports,
+)
+
+COMMANDS = {
+    "import species_observations": ["-c", "import species_observations"],
+    "import species_observations.utils": ["-c", "import species_observations.utils"],
+    "import species_observations.settings": [
+        "-c",
+        "import species_observations.settings",
+    ],
+    "python -m species_observations --help": ["-m", "species_observations", "--help"],
+    "python -m species_observations.service --help": [
+        "-m",
+        "species_observations.service",
+        "--help",
+    ],
+}
+
+
+def print_report(name: str, measure: Dict, top: int):
+    """Prints the measures of a command
+
+    Parameters
+    ----------
+    name : str
+        Command
+    measure : Dict
+        Measures given by measure_command()
+    top : int
+        Number of slowest imports printed
+    """
+    heavy = heavy_modules_imported(measure["records"])
+    print(f"\n{name}")
+    print(
+        f"  wall {measure['wall_seconds'] * 1000:.0f} ms, "
+        f"imports {measure['import_seconds'] * 1000:.0f} ms, "
+        f"{len(measure['records'])} modules, "
+        f"heavy modules: {', '.join(heavy) if heavy else 'none'}"
+    )
+    for record in slowest_imports(measure["records"], top):
+        print(
+            f"  {record['cumulative_us'] / 1000:8.1f} ms  "
+            f"{'  ' * record['depth']}{record['module']}"
+        )
+
+
+def main(commands: List[str], repeats: int, top: int):
+    """Measures and reports every command
+
+    Parameters
+    ----------
+    commands : List[str]
+        Keys of COMMANDS
+    repeats : int
+        Runs of every command.  The fastest one is reported
+    top : int
+        Number of slowest imports reported per command
+    """
+    for name in commands:
+        print_report(name, measure_command(COMMANDS[name], repeats=repeats), top)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--commands", nargs="+", choices=list(COMMANDS), default=list(COMMANDS)
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    main(args.commands, args.repeats, args.top)
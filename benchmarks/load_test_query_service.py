@@ -0,0 +1,148 @@
+"""Load test of the query service (species_observations.service).  Sends random
+    range, period and group queries from concurrent keep-alive connections and
+    reports throughput and p50/p99 latency.
+
+    Start the service first, from the kedro project main folder:
+        python -m species_observations.service --env base
+    then run:
+        python benchmarks/load_test_query_service.py --requests 20000 --connections 32
+    --distinct limits the number of different queries, so the LRU cache hit rate
+    can be controlled
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+async def get(reader, writer, target: str) -> dict:
+    """Sends a GET request and reads its JSON response
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        Stream of the responses
+    writer : asyncio.StreamWriter
+        Stream of the requests
+    target : str
+        Path with query
+
+    Returns
+    -------
+    dict
+        JSON body
+    """
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    await reader.readline()
+    length = 0
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(await reader.readexactly(length))
+
+
+def make_targets(health: dict, n_distinct: int, seed: int = 0) -> List[str]:
+    """Random queries within the dates served
+
+    Parameters
+    ----------
+    health : dict
+        Response of /health
+    n_distinct : int
+        Number of different queries
+    seed : int, optional
+        Random seed, by default 0
+
+    Returns
+    -------
+    List[str]
+        Paths with query
+    """
+    rng = random.Random(seed)
+    aggregates = health["aggregates"]
+    days = pd.date_range(aggregates["start"], aggregates["end"], freq="D")
+    targets = []
+    for _ in range(n_distinct):
+        start, end = sorted(rng.sample(range(len(days)), 2))
+        dates = f"start={days[start].date()}&end={days[end].date()}"
+        kind = rng.choice(["range", "period", "groups"])
+        if kind == "period" and aggregates["periods"]:
+            targets.append(
+                f"/period?period={rng.choice(aggregates['periods'])}&{dates}"
+            )
+        elif kind == "groups" and aggregates["group_keys"]:
+            targets.append(f"/groups?by={rng.choice(aggregates['group_keys'])}&{dates}")
+        else:
+            targets.append(f"/range?{dates}")
+    return targets
+
+
+async def run(
+    host: str, port: int, n_requests: int, n_connections: int, n_distinct: int
+):
+    """Prints throughput and latency percentiles
+
+    Parameters
+    ----------
+    host : str
+        Host of the service
+    port : int
+        Port of the service
+    n_requests : int
+        Total number of requests
+    n_connections : int
+        Number of concurrent connections
+    n_distinct : int
+        Number of different queries
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    health = await get(reader, writer, "/health")
+    writer.close()
+    targets = make_targets(health, n_distinct)
+    latencies = []
+
+    async def client(n_client_requests: int, seed: int):
+        rng = random.Random(seed)
+        reader, writer = await asyncio.open_connection(host, port)
+        for _ in range(n_client_requests):
+            target = rng.choice(targets)
+            start = time.perf_counter()
+            await get(reader, writer, target)
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    per_client = n_requests // n_connections
+    start = time.perf_counter()
+    await asyncio.gather(*[client(per_client, seed) for seed in range(n_connections)])
+    seconds = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    print(
+        f"{len(latencies)} requests, {n_connections} connections, {n_distinct} distinct"
+    )
+    print(f"throughput: {len(latencies) / seconds:,.0f} requests/s")
+    print(
+        f"latency [ms]: p50 {np.percentile(latencies_ms, 50):.3f}"
+        f"  p99 {np.percentile(latencies_ms, 99):.3f}"
+        f"  max {latencies_ms.max():.3f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--distinct", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(
+        run(args.host, args.port, args.requests, args.connections, args.distinct)
+    )
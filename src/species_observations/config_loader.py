@@ -0,0 +1,30 @@
+"""Defines CachedConfigLoader, the ConfigLoader returned by
+    utils.load_config_file_kedro().  It is imported by that function, so importing
+    utils does not import kedro.config"""
+import copy
+import threading
+from typing import Any
+
+from kedro.config import ConfigLoader
+
+
+class CachedConfigLoader(ConfigLoader):
+    """ConfigLoader which parses each key ('catalog', 'parameters', ...) only once.
+    Every access with [] returns a deep copy, so callers can modify what they get
+    without changing the cache.  Keys set explicitly on the instance are returned
+    as in ConfigLoader"""
+
+    def __init__(self, *args, **kwargs):
+        """Creates a loader with an empty cache.  Takes the arguments of ConfigLoader"""
+        super().__init__(*args, **kwargs)
+        self._parsed = {}
+        self._parsed_lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self:
+            return super().__getitem__(key)
+        with self._parsed_lock:
+            if key not in self._parsed:
+                self._parsed[key] = super().__getitem__(key)
+            value = self._parsed[key]
+        return copy.deepcopy(value)
@@ -0,0 +1 @@
+"""Custom datasets of the species_observations project"""
@@ -0,0 +1,34 @@
+"""Defines ArrowRecordBatchDataSet, a read-only dataset of Arrow record batches"""
+from species_observations.extras.datasets.backend_dataset import BackendDataSet
+from species_observations.scripts.record_batches import BACKENDS
+
+
+class ArrowRecordBatchDataSet(BackendDataSet):
+    """Loads a RecordBatchSource (see species_observations.scripts.record_batches),
+    which streams the records as Arrow record batches from a backend:
+        local: Arrow IPC or Parquet files, see LocalArrowBackend
+        bigquery: BigQuery Storage Read API, see BigQueryStorageBackend
+    Loading does not read any record.  Preprocessing reads the batches with only
+    the columns it needs and aggregates them one at a time.
+    credentials are only passed to the bigquery backend.
+
+    Example catalog entries:
+        species_data_batches:
+          type: species_observations.extras.datasets.arrow_batch_dataset.ArrowRecordBatchDataSet
+          backend: local
+          backend_args:
+            path: data//01_raw//species_bigQuery_arrow
+            batch_size: 65536
+
+        species_data_bigquery:
+          type: species_observations.extras.datasets.arrow_batch_dataset.ArrowRecordBatchDataSet
+          backend: bigquery
+          backend_args:
+            table: bigquery-public-data.gbif.occurrences
+            project: "${gcp_globals.project_id}"
+            row_restriction: "class = 'Aves'"
+          credentials: gcp_creds
+    """
+
+    BACKENDS = BACKENDS
+    CREDENTIALS_BACKENDS = ["bigquery"]
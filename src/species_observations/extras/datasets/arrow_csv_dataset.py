@@ -0,0 +1,119 @@
+"""Defines ArrowCSVDataSet, a CSV dataset parsed by the multi-threaded pyarrow CSV
+reader"""
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pcsv
+from kedro.io import DataSetError
+from kedro_datasets.pandas import CSVDataSet
+
+from species_observations.utils import arrow_column_type
+
+# Load arguments of pandas.read_csv translated to the pyarrow reader
+_PANDAS_LOAD_ARGS = ["sep", "delimiter", "usecols", "dtype"]
+# Load arguments of the pyarrow reader.  'dtype_backend' has the values of
+# pandas.read_csv, so the partitions can also be read in chunks by pandas
+_ARROW_LOAD_ARGS = ["block_size", "use_threads", "dtype_backend"]
+
+
+class ArrowCSVDataSet(CSVDataSet):
+    """Loads a CSV file with pyarrow.csv, which parses blocks of the file in
+    parallel threads, instead of the single-threaded pandas C parser.
+    Saving is the same as for pandas.CSVDataSet.
+    load_args accepts the arguments of pandas.read_csv used by the column projection
+    of hooks.ProjectHooks ('sep', 'usecols', 'dtype'), so the projected columns are
+    the only ones converted, with the types of data_dtypes, and:
+        block_size: bytes of the blocks parsed by each thread
+        use_threads: False parses in the calling thread, by default True
+        dtype_backend: None (default) for NumPy-backed columns as given by
+            pandas.read_csv, or 'pyarrow' for pd.ArrowDtype columns
+
+    Example catalog entry:
+        species_data:
+          type: PartitionedDataSet
+          path: data//01_raw//species_bigQuery
+          dataset:
+            type: species_observations.extras.datasets.arrow_csv_dataset.ArrowCSVDataSet
+            load_args:
+              sep: ","
+    """
+
+    DEFAULT_LOAD_ARGS: Dict[str, Any] = {}
+
+    def _load(self) -> pd.DataFrame:
+        unknown = set(self._load_args) - set(_PANDAS_LOAD_ARGS + _ARROW_LOAD_ARGS)
+        if unknown:
+            raise DataSetError(
+                f"""load_args {sorted(unknown)} not supported by {self.__class__.__name__}.
+                Valid keys are {_PANDAS_LOAD_ARGS + _ARROW_LOAD_ARGS}"""
+            )
+        load_args = self._load_args
+        read_options = pcsv.ReadOptions(use_threads=load_args.get("use_threads", True))
+        if load_args.get("block_size") is not None:
+            read_options.block_size = int(load_args["block_size"])
+        parse_options = pcsv.ParseOptions(
+            delimiter=load_args.get("sep", load_args.get("delimiter", ","))
+        )
+        convert_options = pcsv.ConvertOptions(
+            column_types={
+                column: arrow_column_type(dtype)
+                for column, dtype in (load_args.get("dtype") or {}).items()
+            },
+            include_columns=list(load_args.get("usecols") or []),
+            # Empty fields of string and category columns are missing values, as
+            # for pandas.read_csv, instead of empty strings
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True,
+        )
+
+        load_path = str(self._get_load_path())
+        with self._fs.open(load_path, "rb") as file:
+            table = pcsv.read_csv(
+                file,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options,
+            )
+        table = table.rename_columns(_pandas_column_names(table.column_names))
+
+        dtype_backend = load_args.get("dtype_backend")
+        if dtype_backend == "pyarrow":
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        if dtype_backend is not None:
+            raise DataSetError(
+                f"""dtype_backend {dtype_backend} not valid.
+                Valid values are [None, 'pyarrow']"""
+            )
+        df_out = table.to_pandas()
+        # Missing strings are None in the converted columns, and NaN for pandas.read_csv,
+        # which also sorts the categories instead of keeping their order of appearance
+        object_columns = df_out.select_dtypes(object).columns
+        df_out[object_columns] = df_out[object_columns].fillna(np.nan)
+        for column in df_out.select_dtypes("category").columns:
+            categories = df_out[column].cat.categories
+            df_out[column] = df_out[column].cat.reorder_categories(
+                categories.sort_values()
+            )
+        return df_out
+
+
+def _pandas_column_names(column_names: List[str]) -> List[str]:
+    """Names given by pandas.read_csv to columns without header, e.g. the index
+        saved by pandas as first column
+
+    Parameters
+    ----------
+    column_names : List[str]
+        Header of the file
+
+    Returns
+    -------
+    List[str]
+        Column names, with 'Unnamed: {position}' for empty names
+    """
+    return [
+        column_name or f"Unnamed: {position}"
+        for position, column_name in enumerate(column_names)
+    ]
@@ -0,0 +1,57 @@
+"""Defines BackendDataSet, the base of the read-only datasets which load an object
+of a backend class chosen in the catalog"""
+import copy
+from typing import Any, Dict, List
+
+from kedro.io import AbstractDataSet, DataSetError
+
+
+class BackendDataSet(AbstractDataSet):
+    """Loads an instance of BACKENDS[backend] created with backend_args.
+    The credentials of the catalog entry are passed only to the backends of
+    CREDENTIALS_BACKENDS, and are not shown by _describe().
+    Subclasses define BACKENDS and CREDENTIALS_BACKENDS"""
+
+    BACKENDS: Dict[str, type] = {}
+    CREDENTIALS_BACKENDS: List[str] = []
+
+    def __init__(
+        self, backend: str, backend_args: Dict[str, Any], credentials: Dict = None
+    ):
+        """Creates a new instance of the dataset.
+
+        Parameters
+        ----------
+        backend : str
+            Key of BACKENDS
+        backend_args : Dict[str, Any]
+            Arguments of the backend class
+        credentials : Dict, optional
+            Credentials passed to the backends of CREDENTIALS_BACKENDS, and ignored
+            by the others, by default None
+        """
+        if backend not in self.BACKENDS:
+            raise DataSetError(
+                f"""backend {backend} not valid.
+                Valid values are {list(self.BACKENDS)}"""
+            )
+        self._backend = backend
+        self._backend_args = copy.deepcopy(backend_args)
+        if credentials is not None and backend in self.CREDENTIALS_BACKENDS:
+            self._backend_args["credentials"] = credentials
+
+    def _load(self) -> Any:
+        return self.BACKENDS[self._backend](**self._backend_args)
+
+    def _save(self, data: Any) -> None:
+        raise DataSetError(f"{self.__class__.__name__} is read-only")
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "backend": self._backend,
+            "backend_args": {
+                key: value
+                for key, value in self._backend_args.items()
+                if key != "credentials"
+            },
+        }
@@ -0,0 +1,163 @@
+"""Defines CachedPartitionedDataSet, a PartitionedDataSet of remote files read through
+a local disk cache"""
+import copy
+from typing import Any, Callable, Dict, Type
+
+from kedro.io import DataSetError, PartitionedDataSet
+
+from species_observations.scripts.remote_cache import RemoteFileCache
+
+# Keys of the configuration of the partitions which only apply to the remote files
+_REMOTE_KEYS = ["credentials", "fs_args"]
+
+
+class CachedPartitionedDataSet(PartitionedDataSet):
+    """PartitionedDataSet whose remote partitions (gs://, s3://, ...) are loaded from
+    local copies kept by a RemoteFileCache (see
+    species_observations.scripts.remote_cache).  Loading lists the partitions with
+    their versions, and each load function downloads its partition on the first
+    call if it is not cached or changed, so only the partitions which are loaded
+    (e.g. those of a shard) are downloaded, and the Prefetcher or the workers of
+    'parallel' download them while others are processed.  Local paths are read
+    directly.  Saving writes to the remote path, as PartitionedDataSet does.
+
+    Example catalog entry:
+        species_data:
+          type: species_observations.extras.datasets.cached_partitioned_dataset.CachedPartitionedDataSet
+          path: gs://bigqueryspecies-container-bucket/species_bigQuery
+          dataset:
+            type: pandas.CSVDataSet
+            load_args:
+              sep: ","
+          cache:
+            path: data//01_raw//species_bigQuery_cache
+            max_size: 10GB
+            max_workers: 8
+          credentials: gcp_creds
+    """
+
+    def __init__(self, path: str, dataset: Any, cache: Dict[str, Any], **kwargs):
+        """Creates a new instance of CachedPartitionedDataSet.
+
+        Parameters
+        ----------
+        path : str
+            Folder of the partitions, e.g. 'gs://bucket/folder'
+        dataset : Any
+            Dataset of the partitions, as in PartitionedDataSet
+        cache : Dict[str, Any]
+            Arguments of RemoteFileCache: 'path' (local folder), and optionally
+            'max_size' and 'max_workers'
+        **kwargs
+            Other arguments of PartitionedDataSet
+        """
+        super().__init__(path=path, dataset=dataset, **kwargs)
+        if "path" not in cache:
+            raise DataSetError("'cache' must define the local folder 'path'")
+        self._cache_args = copy.deepcopy(cache)
+        self._cache = RemoteFileCache(**self._cache_args)
+
+    def _load(self) -> Dict[str, Callable[[], Any]]:
+        if self._protocol in ("file", "local"):
+            return super()._load()
+
+        infos = self._list_partition_infos()
+        if not infos:
+            raise DataSetError(f"No partitions found in '{self._path}'")
+        local_config = copy.deepcopy(self._dataset_config)
+        for key in _REMOTE_KEYS:
+            local_config.pop(key, None)
+
+        partitions = {}
+        for remote_path, info in infos.items():
+            remote_config = copy.deepcopy(self._dataset_config)
+            remote_config[self._filepath_arg] = self._join_protocol(remote_path)
+            partition_id = self._path_to_partition(remote_path)
+            partitions[partition_id] = _CachedPartitionLoad(
+                self._cache,
+                self._filesystem,
+                remote_path,
+                info,
+                self._dataset_type,
+                {"remote": remote_config, "local": local_config},
+                self._filepath_arg,
+            )
+        return partitions
+
+    def _list_partition_infos(self) -> Dict[str, Dict]:
+        """Partitions with their fsspec info, which has their version, from a single
+            listing instead of one info() call per object
+
+        Returns
+        -------
+        Dict[str, Dict]
+            {remote_path: info}
+        """
+        listing = self._filesystem.find(
+            self._normalized_path, detail=True, **self._load_args
+        )
+        return {
+            path: info
+            for path, info in sorted(listing.items())
+            if path.endswith(self._filename_suffix)
+        }
+
+    def _describe(self) -> Dict[str, Any]:
+        return {**super()._describe(), "cache": self._cache_args}
+
+
+class _CachedPartitionLoad:
+    """Load function of a remote partition.  Each call loads the local copy kept by
+    the cache, which is downloaded if it is missing.  __self__ is the dataset of the
+    remote file, so utils.partition_source finds the file without downloading it
+    (e.g. to fingerprint it from its generation or etag)"""
+
+    def __init__(
+        self,
+        cache: RemoteFileCache,
+        file_system,
+        remote_path: str,
+        info: Dict,
+        dataset_type: Type,
+        dataset_configs: Dict[str, Dict],
+        filepath_arg: str,
+    ):
+        """Creates the load function of a remote partition.
+
+        Parameters
+        ----------
+        cache : RemoteFileCache
+            Cache of the local copies
+        file_system : fsspec.AbstractFileSystem
+            Filesystem of the remote file
+        remote_path : str
+            Path of the remote file, as listed by file_system
+        info : Dict
+            fsspec info of the remote file, as given by the listing
+        dataset_type : Type
+            Dataset of the partitions
+        dataset_configs : Dict[str, Dict]
+            'remote' and 'local' arguments of dataset_type, without the file path
+            for 'local'
+        filepath_arg : str
+            Argument of dataset_type with the file path
+        """
+        self._cache = cache
+        self._file_system = file_system
+        self._remote_path = remote_path
+        self._info = info
+        self._dataset_type = dataset_type
+        self._dataset_configs = dataset_configs
+        self._filepath_arg = filepath_arg
+
+    @property
+    def __self__(self):
+        return self._dataset_type(**copy.deepcopy(self._dataset_configs["remote"]))
+
+    def __call__(self) -> Any:
+        with self._cache.use(
+            self._file_system, self._remote_path, self._info
+        ) as local_file:
+            kwargs = copy.deepcopy(self._dataset_configs["local"])
+            kwargs[self._filepath_arg] = str(local_file)
+            return self._dataset_type(**kwargs).load()
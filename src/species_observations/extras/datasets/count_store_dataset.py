@@ -0,0 +1,57 @@
+"""Defines CountStoreDataSet, a dataset saved as a memory-mapped count store"""
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict
+
+import pandas as pd
+from kedro.io import AbstractDataSet, DataSetError
+
+from species_observations.scripts.count_store import (
+    HEADER_FILE,
+    CountStore,
+    write_count_store,
+)
+
+
+class CountStoreDataSet(AbstractDataSet):
+    """Saves a resampled series of counts as a count store (see
+    species_observations.scripts.count_store), and loads it as a CountStore reader
+    that queries date ranges without loading the whole series.
+    The arrays are memory-mapped, so the store must be in the local filesystem.
+
+    Example catalog entry:
+        resampled_data_store:
+          type: species_observations.extras.datasets.count_store_dataset.CountStoreDataSet
+          filepath: data//02_intermediate//species_bigQuery_resampled_obs_store
+    """
+
+    def __init__(self, filepath: str, resample: str = None):
+        """Creates a new instance of CountStoreDataSet.
+
+        Parameters
+        ----------
+        filepath : str
+            Folder of the store
+        resample : str, optional
+            Resampling period of the saved series.  If not specified, the frequency
+            of the index of the saved series is used
+        """
+        self._filepath = PurePosixPath(filepath)
+        self._resample = resample
+
+    def _load(self) -> CountStore:
+        return CountStore(Path(self._filepath))
+
+    def _save(self, data: pd.Series) -> None:
+        resample = self._resample or getattr(data.index, "freqstr", None)
+        if resample is None:
+            raise DataSetError(
+                f"""The resampling period of the data saved in {self._filepath} is unknown.
+                Define 'resample' in the catalog entry, or save a series with an index frequency"""
+            )
+        write_count_store(Path(self._filepath), data, resample)
+
+    def _exists(self) -> bool:
+        return (Path(self._filepath) / HEADER_FILE).is_file()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": self._filepath, "resample": self._resample}
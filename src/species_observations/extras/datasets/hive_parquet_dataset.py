@@ -0,0 +1,62 @@
+"""Defines HiveParquetDataSet, a Parquet dataset saved as a Hive-style partitioned store"""
+from typing import Any, Dict, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from kedro.io.core import get_filepath_str
+from kedro_datasets.pandas import ParquetDataSet
+
+
+class HiveParquetDataSet(ParquetDataSet):
+    """Saves data as a Parquet store partitioned in folders by the values of the
+    columns given in save_args -> partition_cols (e.g. year=2021/month=9/).
+    Loading is the same as for ParquetDataSet, so load_args -> columns and
+    load_args -> filters only read the needed columns and partitions.
+
+    Example catalog entry:
+        species_data_staged:
+          type: species_observations.extras.datasets.hive_parquet_dataset.HiveParquetDataSet
+          filepath: data//02_intermediate//species_bigQuery_staged
+          save_args:
+            partition_cols: [year, month]
+    """
+
+    def _save(self, data: Union[pd.DataFrame, pa.Table, Dict[str, Any]]) -> None:
+        """Replaces the store with data.
+
+        Parameters
+        ----------
+        data : Union[pd.DataFrame, pa.Table, Dict[str, Any]]
+            Data to save.  If dict, each value is a dataframe or Arrow table, or a
+            function returning one, and the entries are written one at a time.
+            Each entry is written with its own schema, so entries should be tables
+            of the same schema (see Preprocessing.staging_table) when a column may
+            have only missing values in some of them
+        """
+        save_path = get_filepath_str(self._get_save_path(), self._protocol)
+        save_args = dict(self._save_args)
+        partition_cols = save_args.pop("partition_cols", None)
+
+        if self._fs.exists(save_path):
+            self._fs.rm(save_path, recursive=True)
+        self._fs.mkdirs(save_path, exist_ok=True)
+
+        if not isinstance(data, dict):
+            data = {"part": data}
+        for name in sorted(data):
+            part = data[name]() if callable(data[name]) else data[name]
+            if not isinstance(part, pa.Table):
+                part = pa.Table.from_pandas(part, preserve_index=False)
+            safe_name = "".join(char if char.isalnum() else "_" for char in name)
+            pq.write_to_dataset(
+                part,
+                root_path=save_path,
+                schema=part.schema,
+                partition_cols=partition_cols,
+                filesystem=self._fs,
+                basename_template=f"{safe_name}-{{i}}.parquet",
+                **save_args,
+            )
+
+        self._invalidate_cache()
@@ -0,0 +1,34 @@
+"""Defines SQLBackendDataSet, a read-only dataset of a SQL backend of the raw data"""
+from species_observations.extras.datasets.backend_dataset import BackendDataSet
+from species_observations.scripts.sql_pushdown import BACKENDS
+
+
+class SQLBackendDataSet(BackendDataSet):
+    """Loads a SQLBackend (see species_observations.scripts.sql_pushdown), the
+    database table holding the raw data.  Loading does not run any query:
+    Preprocessing.pushdown_time_resampling runs the aggregation in the database.
+    Backends:
+        sqlite: SQLite database file, see SQLiteBackend
+        duckdb: DuckDB database, or a query over files, see DuckDBBackend
+        bigquery: BigQuery table, see BigQueryBackend
+    credentials are only passed to the bigquery backend.
+
+    Example catalog entries:
+        species_data_sql:
+          type: species_observations.extras.datasets.sql_backend_dataset.SQLBackendDataSet
+          backend: bigquery
+          backend_args:
+            table: bigquery-public-data.gbif.occurrences
+            project: "${gcp_globals.project_id}"
+            where: "species = 'Anas platyrhynchos'"
+          credentials: gcp_creds
+
+        species_data_sql:
+          type: species_observations.extras.datasets.sql_backend_dataset.SQLBackendDataSet
+          backend: duckdb
+          backend_args:
+            table: "read_csv_auto('data/01_raw/species_bigQuery/*.csv', all_varchar=true)"
+    """
+
+    BACKENDS = BACKENDS
+    CREDENTIALS_BACKENDS = ["bigquery"]
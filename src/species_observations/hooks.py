@@ -0,0 +1,657 @@
+"""Project hooks registered in settings.py.
+    settings.py is imported by every kedro command, so pandas and the preprocessing
+    are imported by the hooks that use them"""
+# pylint: disable=import-outside-toplevel
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+from kedro.framework.hooks import hook_impl
+from kedro.io import AbstractDataSet, DataCatalog
+from kedro.pipeline.node import Node
+
+import species_observations.utils as utl
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ProjectHooks:
+    """Hooks of the project species_observation"""
+
+    @hook_impl
+    def after_catalog_created(
+        self,
+        catalog: DataCatalog,
+        conf_catalog: Dict[str, Any],
+        conf_creds: Dict[str, Any],
+        feed_dict: Dict[str, Any],
+        save_version: str,
+        load_versions: Dict[str, str],
+    ):  # pylint: disable=too-many-arguments
+        """Restricts the raw datasets listed in preprocessing -> column_projection
+            to the columns needed by Preprocessing.  CSV columns are parsed with their
+            types, and Parquet stores only read the partitions within 'date_range'.
+            Unused columns are never parsed or materialised.  The datasets of
+            'grouped_datasets' also load the grouping columns
+
+        Parameters
+        ----------
+        catalog : DataCatalog
+            Catalog that was created
+        conf_catalog : Dict[str, Any]
+            Config from which the catalog was created
+        conf_creds : Dict[str, Any]
+            Credentials conf from which the catalog was created
+        feed_dict : Dict[str, Any]
+            Parameters added to the catalog
+        save_version : str
+            save_version used for all datasets in the catalog
+        load_versions : Dict[str, str]
+            load_versions used for each dataset in the catalog
+        """
+        parameters = feed_dict.get("parameters", {})
+        projection = parameters.get("preprocessing", {}).get("column_projection", {})
+        if not projection.get("enabled", False):
+            return
+
+        from species_observations.scripts.data_processing import Preprocessing
+
+        prep = Preprocessing(parameters)
+        grouped_datasets = projection.get("grouped_datasets") or []
+        for ds_name in list(projection["datasets"]) + list(grouped_datasets):
+            if ds_name not in conf_catalog:
+                continue
+            file_format = utl.dataset_file_format(conf_catalog[ds_name])
+            if file_format is None:
+                continue
+            ds_config = utl.project_dataset_config(
+                conf_catalog[ds_name],
+                prep.get_load_args(file_format, grouped=ds_name in grouped_datasets),
+            )
+            if isinstance(ds_config.get("credentials"), str):
+                ds_config["credentials"] = conf_creds[ds_config["credentials"]]
+            data_set = AbstractDataSet.from_config(
+                ds_name,
+                ds_config,
+                load_versions.get(ds_name),
+                save_version,
+            )
+            catalog.add(ds_name, data_set, replace=True)
+
+
+def _data_rows(data: Any) -> Optional[int]:
+    """Number of rows of data, if it is a dataframe or a series
+
+    Parameters
+    ----------
+    data : Any
+        Data loaded, saved, or passed to a node
+
+    Returns
+    -------
+    Optional[int]
+        Number of rows, or None for other types
+    """
+    import pandas as pd
+
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return len(data)
+    return None
+
+
+def _total_rows(values: Iterable[Any]) -> Optional[int]:
+    """Total number of rows of the dataframes and series in values
+
+    Parameters
+    ----------
+    values : Iterable[Any]
+        Inputs or outputs of a node
+
+    Returns
+    -------
+    Optional[int]
+        Number of rows, or None if no value is a dataframe or a series (e.g. the
+        dict of load functions of a PartitionedDataSet)
+    """
+    rows = [_data_rows(data) for data in values]
+    rows = [value for value in rows if value is not None]
+    return sum(rows) if rows else None
+
+
+def _data_bytes(data: Any) -> Optional[int]:
+    """In-memory size of data, if it is a dataframe or a series.  Object columns
+        are counted as references only, so the measure is cheap for any size
+
+    Parameters
+    ----------
+    data : Any
+        Data loaded or saved
+
+    Returns
+    -------
+    Optional[int]
+        Bytes, or None for other types
+    """
+    import pandas as pd
+
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(index=True, deep=False).sum())
+    if isinstance(data, pd.Series):
+        return int(data.memory_usage(index=True, deep=False))
+    return None
+
+
+def _file_bytes(data_set: AbstractDataSet) -> Optional[int]:
+    """Size in storage of a file-based dataset in the local filesystem.
+        Remote datasets (gs://, s3://, ...) are not measured, as listing a folder
+        in a bucket after every load and save would slow the run down
+
+    Parameters
+    ----------
+    data_set : AbstractDataSet
+        Dataset of the catalog
+
+    Returns
+    -------
+    Optional[int]
+        Bytes of the file, or of all the files of the folder, of the dataset.
+        None if the dataset is not a local file or the size is not available
+    """
+    filepath = getattr(data_set, "_filepath", None) or getattr(data_set, "_path", None)
+    file_system = getattr(data_set, "_fs", None) or getattr(
+        data_set, "_filesystem", None
+    )
+    if filepath is None or file_system is None:
+        return None
+    protocol = file_system.protocol
+    protocols = protocol if isinstance(protocol, (list, tuple)) else [protocol]
+    if not set(protocols) & {"file", "local"}:
+        return None
+    try:
+        return int(file_system.du(str(filepath)))
+    except (OSError, ValueError, NotImplementedError):
+        return None
+
+
+def _prometheus_lines(
+    name: str, help_text: str, samples: List[Dict], value_key: str, labels: List[str]
+) -> List[str]:
+    """Lines of a gauge in the Prometheus text exposition format
+
+    Parameters
+    ----------
+    name : str
+        Metric name
+    help_text : str
+        Description of the metric
+    samples : List[Dict]
+        Records with the labels and the value
+    value_key : str
+        Key of the value in the records.  Records without value are skipped
+    labels : List[str]
+        Keys of the labels in the records
+
+    Returns
+    -------
+    List[str]
+        HELP, TYPE and one line per sample
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for sample in samples:
+        if sample.get(value_key) is None:
+            continue
+        label_text = ",".join(
+            f'{label}="{str(sample[label]).replace(chr(34), chr(39))}"'
+            for label in labels
+        )
+        lines.append(f"{name}{{{label_text}}} {sample[value_key]}")
+    return lines
+
+
+def _is_partitioned(data: Any) -> bool:
+    """Whether data is the dict of load functions of a PartitionedDataSet
+
+    Parameters
+    ----------
+    data : Any
+        Data loaded
+
+    Returns
+    -------
+    bool
+        True for a non-empty dict of callables
+    """
+    return (
+        isinstance(data, dict)
+        and bool(data)
+        and all(callable(load_func) for load_func in data.values())
+    )
+
+
+class _TimedPartitionLoad:
+    """Load function of a partition which reports its duration and rows to
+    TimingHooks.  __self__ is that of the wrapped load function, so
+    utils.partition_source still finds the file of the partition.  It is pickled
+    without the hooks, so in worker processes it only loads the partition"""
+
+    def __init__(self, load_func: Callable, hooks: "TimingHooks", dataset_name: str):
+        self._load_func = load_func
+        self._hooks = hooks
+        self._dataset_name = dataset_name
+
+    @property
+    def __self__(self):
+        return getattr(self._load_func, "__self__", None)
+
+    def __call__(self) -> Any:
+        start = time.perf_counter()
+        data = self._load_func()
+        if self._hooks is not None:
+            self._hooks.add_partition_load(
+                self._dataset_name, time.perf_counter() - start, _data_rows(data)
+            )
+        return data
+
+    def __getstate__(self) -> Dict:
+        return {**self.__dict__, "_hooks": None}
+
+
+class TimingHooks:
+    """Records the wall time, CPU time, rows and throughput of every node, and the
+    duration and size of every dataset load and save.  At the end of the run the
+    records are appended as JSON lines to monitoring -> jsonl_path, and summarised
+    in the Prometheus textfile monitoring -> prometheus_path.
+    Node times do not include loading inputs or saving outputs, which are recorded
+    as dataset events.  CPU time is that of the whole process.
+    The load of a PartitionedDataSet only lists the partitions, which are loaded
+    later by the node.  Their load functions are timed, and the partitions loaded
+    are recorded as a 'dataset_partition_load' event, whose rows are the input
+    rows of the node.  Partitions read directly from their files (chunked reads,
+    Polars and DuckDB engines) or in worker processes are not timed.
+    Nodes run by ParallelRunner run in other processes, and are not recorded"""
+
+    _METRIC_PREFIX = "species_observations"
+
+    def __init__(self):
+        self._enabled = False
+        self._jsonl_path = None
+        self._prometheus_path = None
+        self._catalog = None
+        self._lock = threading.Lock()
+        self._starts = {}
+        self._records = []
+        self._partition_loads = {}
+
+    @hook_impl
+    def after_catalog_created(
+        self,
+        catalog: DataCatalog,
+        feed_dict: Dict[str, Any],
+    ):
+        """Reads the parameters 'monitoring'
+
+        Parameters
+        ----------
+        catalog : DataCatalog
+            Catalog that was created
+        feed_dict : Dict[str, Any]
+            Parameters added to the catalog
+        """
+        monitoring = feed_dict.get("parameters", {}).get("monitoring", {})
+        self._enabled = monitoring.get("enabled", False)
+        self._jsonl_path = monitoring.get("jsonl_path")
+        self._prometheus_path = monitoring.get("prometheus_path")
+        self._catalog = catalog
+
+    def _start(self, key: tuple):
+        with self._lock:
+            self._starts[key, threading.get_ident()] = (
+                time.perf_counter(),
+                time.process_time(),
+            )
+
+    def _stop(self, key: tuple) -> Dict[str, float]:
+        end = (time.perf_counter(), time.process_time())
+        with self._lock:
+            start = self._starts.pop((key, threading.get_ident()), end)
+        return {"wall_seconds": end[0] - start[0], "cpu_seconds": end[1] - start[1]}
+
+    def _add_record(self, record: Dict):
+        record["timestamp"] = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._records.append(record)
+
+    def add_partition_load(
+        self, dataset_name: str, wall_seconds: float, rows: Optional[int]
+    ):
+        """Adds the load of a partition to the totals of its dataset
+
+        Parameters
+        ----------
+        dataset_name : str
+            Name of the PartitionedDataSet in the catalog
+        wall_seconds : float
+            Duration of the load
+        rows : Optional[int]
+            Rows of the partition, or None if it is not a dataframe
+        """
+        with self._lock:
+            totals = self._partition_loads.setdefault(
+                dataset_name, {"partitions": 0, "wall_seconds": 0.0, "rows": None}
+            )
+            totals["partitions"] += 1
+            totals["wall_seconds"] += wall_seconds
+            if rows is not None:
+                totals["rows"] = (totals["rows"] or 0) + rows
+
+    def _add_partition_records(
+        self, dataset_names: Iterable[str] = None
+    ) -> Optional[int]:
+        """Records the partitions loaded of some datasets, and resets their totals
+
+        Parameters
+        ----------
+        dataset_names : Iterable[str], optional
+            Names of the datasets.  All of them if not specified, by default None
+
+        Returns
+        -------
+        Optional[int]
+            Total rows of the partitions loaded, or None if there were none
+        """
+        with self._lock:
+            if dataset_names is None:
+                dataset_names = list(self._partition_loads)
+            loads = {
+                dataset_name: self._partition_loads.pop(dataset_name)
+                for dataset_name in dataset_names
+                if dataset_name in self._partition_loads
+            }
+        for dataset_name, totals in loads.items():
+            self._add_record(
+                {
+                    "event": "dataset_partition_load",
+                    "dataset": dataset_name,
+                    **totals,
+                    "memory_bytes": None,
+                    "file_bytes": None,
+                }
+            )
+        rows = [totals["rows"] for totals in loads.values() if totals["rows"]]
+        return sum(rows) if rows else None
+
+    def _is_tracked(self, dataset_name: str) -> bool:
+        return self._enabled and not (
+            dataset_name == "parameters" or dataset_name.startswith("params:")
+        )
+
+    @hook_impl
+    def before_node_run(self, node: Node):
+        """Starts the timers of a node
+
+        Parameters
+        ----------
+        node : Node
+            Node about to run
+        """
+        if self._enabled:
+            self._start(("node", node.name))
+
+    @hook_impl
+    def after_node_run(
+        self, node: Node, inputs: Dict[str, Any], outputs: Dict[str, Any]
+    ):
+        """Records the times, rows and throughput of a node
+
+        Parameters
+        ----------
+        node : Node
+            Node that ran
+        inputs : Dict[str, Any]
+            Inputs of the node, by dataset name
+        outputs : Dict[str, Any]
+            Outputs of the node, by dataset name
+        """
+        if not self._enabled:
+            return
+        times = self._stop(("node", node.name))
+        partition_rows = self._add_partition_records(node.inputs)
+        input_rows = _total_rows(inputs.values())
+        if partition_rows is not None:
+            input_rows = (input_rows or 0) + partition_rows
+        output_rows = _total_rows(outputs.values())
+        self._add_record(
+            {
+                "event": "node",
+                "node": node.name,
+                **times,
+                "input_rows": input_rows,
+                "output_rows": output_rows,
+                "rows_per_second": input_rows / times["wall_seconds"]
+                if input_rows is not None and times["wall_seconds"] > 0
+                else None,
+            }
+        )
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str):
+        """Starts the timers of a dataset load
+
+        Parameters
+        ----------
+        dataset_name : str
+            Name of the dataset in the catalog
+        """
+        if self._is_tracked(dataset_name):
+            self._start(("load", dataset_name))
+
+    @hook_impl
+    def after_dataset_loaded(self, dataset_name: str, data: Any):
+        """Records the duration and size of a dataset load.  The load functions of
+            a PartitionedDataSet are replaced by timed ones, in the same dict, so
+            the node loads the partitions through them
+
+        Parameters
+        ----------
+        dataset_name : str
+            Name of the dataset in the catalog
+        data : Any
+            Data loaded
+        """
+        if not self._is_tracked(dataset_name):
+            return
+        self._add_dataset_record("load", dataset_name, data)
+        if _is_partitioned(data):
+            for partition_name, load_func in data.items():
+                if not isinstance(load_func, _TimedPartitionLoad):
+                    data[partition_name] = _TimedPartitionLoad(
+                        load_func, self, dataset_name
+                    )
+
+    @hook_impl
+    def before_dataset_saved(self, dataset_name: str):
+        """Starts the timers of a dataset save
+
+        Parameters
+        ----------
+        dataset_name : str
+            Name of the dataset in the catalog
+        """
+        if self._is_tracked(dataset_name):
+            self._start(("save", dataset_name))
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any):
+        """Records the duration and size of a dataset save
+
+        Parameters
+        ----------
+        dataset_name : str
+            Name of the dataset in the catalog
+        data : Any
+            Data saved
+        """
+        if self._is_tracked(dataset_name):
+            self._add_dataset_record("save", dataset_name, data)
+
+    def _add_dataset_record(self, operation: str, dataset_name: str, data: Any):
+        times = self._stop((operation, dataset_name))
+        file_bytes = None
+        if self._catalog is not None and dataset_name in self._catalog.list():
+            # pylint: disable=protected-access
+            file_bytes = _file_bytes(self._catalog._get_dataset(dataset_name))
+        self._add_record(
+            {
+                "event": f"dataset_{operation}",
+                "dataset": dataset_name,
+                "wall_seconds": times["wall_seconds"],
+                "rows": _data_rows(data),
+                "partitions": len(data) if _is_partitioned(data) else None,
+                "memory_bytes": _data_bytes(data),
+                "file_bytes": file_bytes,
+            }
+        )
+
+    @hook_impl
+    def after_pipeline_run(self, run_params: Dict[str, Any]):
+        """Writes the records of the run
+
+        Parameters
+        ----------
+        run_params : Dict[str, Any]
+            Parameters of the run
+        """
+        self.write_records(run_params)
+
+    @hook_impl
+    def on_pipeline_error(self, run_params: Dict[str, Any]):
+        """Writes the records of a failed run
+
+        Parameters
+        ----------
+        run_params : Dict[str, Any]
+            Parameters of the run
+        """
+        self.write_records(run_params, status="error")
+
+    def write_records(self, run_params: Dict[str, Any], status: str = "success"):
+        """Appends the records of the run to jsonl_path and replaces the Prometheus
+            textfile prometheus_path.  Records are emptied afterwards
+
+        Parameters
+        ----------
+        run_params : Dict[str, Any]
+            Parameters of the run
+        status : str, optional
+            Outcome of the run, by default 'success'
+        """
+        if not self._enabled:
+            return
+        # Partitions loaded after their node, e.g. by the save of its output
+        self._add_partition_records()
+        with self._lock:
+            records, self._records = self._records, []
+        run = {
+            "session_id": run_params.get("session_id"),
+            "pipeline": run_params.get("pipeline_name") or "__default__",
+            "env": run_params.get("env"),
+            "status": status,
+        }
+        records = [{**run, **record} for record in records]
+
+        if self._jsonl_path:
+            Path(self._jsonl_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(self._jsonl_path, "a", encoding="utf-8") as file:
+                for record in records:
+                    file.write(json.dumps(record) + "\n")
+        if self._prometheus_path:
+            self._write_prometheus(records, run)
+
+    def _write_prometheus(self, records: List[Dict], run: Dict):
+        """Replaces the Prometheus textfile with the metrics of the run.
+            Loads and saves of the same dataset are summed
+
+        Parameters
+        ----------
+        records : List[Dict]
+            Records of the run
+        run : Dict
+            Session, pipeline, env and status of the run
+        """
+        import pandas as pd
+
+        prefix = self._METRIC_PREFIX
+        nodes = [dict(record) for record in records if record["event"] == "node"]
+        datasets = (
+            pd.DataFrame(
+                [record for record in records if record["event"] != "node"],
+                columns=[
+                    "event",
+                    "dataset",
+                    "wall_seconds",
+                    "memory_bytes",
+                    "file_bytes",
+                ],
+            )
+            .groupby(["event", "dataset"], as_index=False)
+            .agg(
+                wall_seconds=("wall_seconds", "sum"),
+                memory_bytes=("memory_bytes", lambda values: values.sum(min_count=1)),
+                file_bytes=("file_bytes", "last"),
+                operations=("wall_seconds", "size"),
+            )
+        )
+        datasets["operation"] = datasets["event"].str.replace("dataset_", "")
+        datasets = [
+            {key: None if pd.isna(value) else value for key, value in row.items()}
+            for row in datasets.to_dict("records")
+        ]
+        for record in nodes + datasets:
+            record["pipeline"] = run["pipeline"]
+
+        node_labels = ["pipeline", "node"]
+        dataset_labels = ["pipeline", "dataset", "operation"]
+        lines = []
+        for key, help_text in [
+            ("wall_seconds", "Wall time of the node, without its inputs and outputs"),
+            ("cpu_seconds", "CPU time of the process while the node ran"),
+            ("input_rows", "Rows of the dataframe inputs of the node"),
+            ("output_rows", "Rows of the dataframe outputs of the node"),
+            ("rows_per_second", "Input rows per second of wall time of the node"),
+        ]:
+            lines += _prometheus_lines(
+                f"{prefix}_node_{key}", help_text, nodes, key, node_labels
+            )
+        for key, help_text in [
+            ("wall_seconds", "Total wall time of the loads or saves of the dataset"),
+            ("operations", "Number of loads or saves of the dataset"),
+            ("memory_bytes", "In-memory size of the data loaded or saved"),
+            ("file_bytes", "Size in storage of the dataset after the operation"),
+        ]:
+            lines += _prometheus_lines(
+                f"{prefix}_dataset_{key}", help_text, datasets, key, dataset_labels
+            )
+        lines += _prometheus_lines(
+            f"{prefix}_run_timestamp_seconds",
+            "Unix time when the run finished",
+            [{**run, "value": time.time()}],
+            "value",
+            ["pipeline", "status"],
+        )
+
+        prometheus_path = Path(self._prometheus_path)
+        prometheus_path.parent.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file and renamed, so collectors never read a partial
+        # file.  The file is unique to the process, as replicas can run at once
+        temporary_path = prometheus_path.with_name(
+            f"{prometheus_path.name}.{os.getpid()}.tmp"
+        )
+        temporary_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(temporary_path, prometheus_path)
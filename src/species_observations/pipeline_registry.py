@@ -4,6 +4,8 @@ from typing import Dict
 from kedro.framework.project import find_pipelines
 from kedro.pipeline import Pipeline
 
+from species_observations.pipelines import observations_time
+
 
 def register_pipelines() -> Dict[str, Pipeline]:
     """Register the project's pipelines.
@@ -13,6 +15,16 @@ def register_pipelines() -> Dict[str, Pipeline]:
     """
     pipelines = find_pipelines()
     pipelines["__default__"] = sum(pipelines.values())
+    pipelines["observations_staging"] = observations_time.create_staging_pipeline()
+    pipelines["observations_time_staged"] = observations_time.create_staged_pipeline()
+    pipelines["observations_time_grouped"] = observations_time.create_grouped_pipeline()
+    pipelines[
+        "observations_time_pushdown"
+    ] = observations_time.create_pushdown_pipeline()
+    pipelines["observations_time_shard"] = observations_time.create_shard_pipeline()
+    pipelines[
+        "observations_time_shard_merge"
+    ] = observations_time.create_shard_merge_pipeline()
     # pipelines["data_engineering"] = Pipeline(
     #     pipelines["observations_time"], namespace="data_engineering"
     # )
@@ -3,8 +3,24 @@ This is a boilerplate pipeline 'observations_time'
 generated using Kedro 0.18.8
 """
 
-from .pipeline import create_pipeline
+from .pipeline import (
+    create_grouped_pipeline,
+    create_pipeline,
+    create_pushdown_pipeline,
+    create_shard_merge_pipeline,
+    create_shard_pipeline,
+    create_staged_pipeline,
+    create_staging_pipeline,
+)
 
-__all__ = ["create_pipeline"]
+__all__ = [
+    "create_grouped_pipeline",
+    "create_pipeline",
+    "create_pushdown_pipeline",
+    "create_shard_merge_pipeline",
+    "create_shard_pipeline",
+    "create_staged_pipeline",
+    "create_staging_pipeline",
+]
 
 __version__ = "0.1"
@@ -2,20 +2,35 @@
 This is a boilerplate pipeline 'observations_time'
 generated using Kedro 0.18.8
 """
-from typing import Dict
+from functools import partial
+from typing import Callable, Dict
 import pandas as pd
+import pyarrow as pa
 
 from species_observations.scripts.data_processing import Preprocessing
+from species_observations.scripts.record_batches import RecordBatchSource
+from species_observations.scripts.sharding import complete_shards, shard_name
+from species_observations.scripts.sql_pushdown import SQLBackend
 
 
 def node_preprocessing_time_data(
     df_raw: pd.DataFrame, parameters: Dict
 ) -> pd.DataFrame:
-    """Raw data preprocessing
+    """Raw data preprocessing.
+        If 'incremental' is enabled and df_raw is partitioned data, only partitions
+        that changed since the previous run are aggregated.
+        Otherwise, if 'streaming' is enabled, 'parallel' uses more than one worker,
+        or 'max_memory' is defined, and df_raw is partitioned data, each partition is
+        aggregated separately and the partial aggregates are merged.
+        Partitions which would exceed 'max_memory' are read in chunks.
+        Records loaded with ArrowRecordBatchDataSet are aggregated one batch at a time.
+        Otherwise, if 'execution_engine' is not 'pandas', the data is aggregated by
+        that engine
 
     Parameters
     ----------
-    df : pd.DataFrame
+    df_raw : pd.DataFrame, dict of dataframes loaded from partitioned data,
+        or RecordBatchSource
         Raw data
     parameters : Dict
         Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
@@ -26,6 +41,184 @@ def node_preprocessing_time_data(
         Resampled data
     """
     prep = Preprocessing(parameters)
+    if isinstance(df_raw, RecordBatchSource):
+        return prep.record_batch_time_resampling(df_raw)
+    if prep.get_execution_engine() != "pandas":
+        return prep.engine_time_resampling(df_raw)
+    if prep.get_incremental() and isinstance(df_raw, dict):
+        return prep.incremental_time_resampling(df_raw)
+    streaming = (
+        prep.get_streaming()
+        or prep.get_n_workers() > 1
+        or prep.get_max_memory() is not None
+    )
+    if streaming and isinstance(df_raw, dict):
+        return prep.streaming_time_resampling(df_raw)
     df_preproc = prep.preprocessing_time_data(df_raw)
     df_resampled = prep.time_resampling(df_preproc)
     return df_resampled
+
+
+def node_pushdown_time_resampling(
+    sql_backend: SQLBackend, parameters: Dict
+) -> pd.DataFrame:
+    """Resamples the raw data in its SQL backend, with a GROUP BY query generated
+        from 'data_cols' and 'resampling_period'
+
+    Parameters
+    ----------
+    sql_backend : SQLBackend
+        Backend holding the raw data, loaded with SQLBackendDataSet
+    parameters : Dict
+        Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
+
+    Returns
+    -------
+    pd.DataFrame
+        Resampled data, as given by node_preprocessing_time_data
+    """
+    prep = Preprocessing(parameters)
+    return prep.pushdown_time_resampling(sql_backend)
+
+
+def node_shard_time_aggregation(
+    df_raw: Dict, parameters: Dict
+) -> Dict[str, pd.DataFrame]:
+    """Partial aggregate of the raw partitions assigned to the shard
+        'sharding' -> 'shard', e.g. run with
+        kedro run --pipeline observations_time_shard --params preprocessing.sharding.shard:0/4
+
+    Parameters
+    ----------
+    df_raw : Dict
+        Raw data, loaded with PartitionedDataSet
+    parameters : Dict
+        Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
+
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        {'shard_{i}_of_{N}': partial aggregate}, saved as a partition of
+        resampled_data_shards
+    """
+    prep = Preprocessing(parameters)
+    if not isinstance(df_raw, dict):
+        raise ValueError("Only partitioned data can be sharded")
+    df_partial = prep.shard_time_aggregation(df_raw)
+    return {shard_name(*prep.get_shard()): df_partial}
+
+
+def node_merge_shards(shard_partials: Dict, parameters: Dict) -> pd.DataFrame:
+    """Merges the partial aggregates of all the shards of a run.
+        Raises ValueError if some shard is missing
+
+    Parameters
+    ----------
+    shard_partials : Dict
+        Partial aggregates written by node_shard_time_aggregation, loaded with
+        PartitionedDataSet
+    parameters : Dict
+        Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
+
+    Returns
+    -------
+    pd.DataFrame
+        Resampled data, as given by node_preprocessing_time_data
+    """
+    prep = Preprocessing(parameters)
+    return prep.merge_time_aggregations(
+        shard_partials[name]() for name in complete_shards(list(shard_partials))
+    )
+
+
+def node_grouped_time_aggregation(
+    df_raw: pd.DataFrame, parameters: Dict
+) -> pd.DataFrame:
+    """Sums individual counts by the groups defined in 'grouping' -> 'keys' and period
+
+    Parameters
+    ----------
+    df_raw : pd.DataFrame or dict of dataframes loaded from partitioned data
+        Raw data
+    parameters : Dict
+        Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
+
+    Returns
+    -------
+    pd.DataFrame
+        Long table with only the non-empty (group, period) cells
+    """
+    prep = Preprocessing(parameters)
+    return prep.grouped_time_aggregation(df_raw)
+
+
+def node_time_rollups(df_resampled: pd.DataFrame, parameters: Dict) -> pd.DataFrame:
+    """Derives the series of every period in 'rollup_periods' from the resampled data,
+        so the raw data is scanned only once
+
+    Parameters
+    ----------
+    df_resampled : pd.DataFrame
+        Output of node_preprocessing_time_data
+    parameters : Dict
+        Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
+
+    Returns
+    -------
+    pd.DataFrame
+        Long table with the series of every period
+    """
+    prep = Preprocessing(parameters)
+    return prep.time_rollups(df_resampled)
+
+
+def node_count_store(df_resampled: pd.DataFrame, parameters: Dict) -> pd.Series:
+    """Series of counts of the resampled data, to be saved in the memory-mapped
+        store resampled_data_store
+
+    Parameters
+    ----------
+    df_resampled : pd.DataFrame
+        Output of node_preprocessing_time_data
+    parameters : Dict
+        Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
+
+    Returns
+    -------
+    pd.Series
+        Counts indexed by period, with the index frequency set to the resampling period
+    """
+    prep = Preprocessing(parameters)
+    return prep.resampled_counts(df_resampled).asfreq(prep.get_resample())
+
+
+def node_stage_raw_parquet(df_raw: pd.DataFrame, parameters: Dict) -> Dict:
+    """Converts raw data to be saved in the Parquet store species_data_staged,
+        partitioned by year and month, so that CSV files are parsed only once.
+        Partitions are converted one at a time when the store is saved, to Arrow
+        tables with the schema of Preprocessing.staging_schema
+
+    Parameters
+    ----------
+    df_raw : pd.DataFrame or dict of dataframes loaded from partitioned data
+        Raw data
+    parameters : Dict
+        Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
+
+    Returns
+    -------
+    Dict
+        {partition_name: function returning the converted partition}
+    """
+    prep = Preprocessing(parameters)
+    if not isinstance(df_raw, dict):
+        return {"species_data": prep.staging_table(df_raw)}
+    return {
+        partition_name: partial(_stage_partition, prep, load_func)
+        for partition_name, load_func in df_raw.items()
+    }
+
+
+def _stage_partition(prep: Preprocessing, load_func: Callable) -> pa.Table:
+    """Loads a raw partition and converts it with Preprocessing.staging_table"""
+    return prep.staging_table(load_func())
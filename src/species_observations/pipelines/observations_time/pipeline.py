@@ -4,7 +4,16 @@ generated using Kedro 0.18.8
 """
 
 from kedro.pipeline import Pipeline, node, pipeline
-from .nodes import node_preprocessing_time_data
+from .nodes import (
+    node_count_store,
+    node_grouped_time_aggregation,
+    node_merge_shards,
+    node_preprocessing_time_data,
+    node_pushdown_time_resampling,
+    node_shard_time_aggregation,
+    node_stage_raw_parquet,
+    node_time_rollups,
+)
 
 
 def create_pipeline(**kwargs) -> Pipeline:
@@ -16,5 +25,104 @@ def create_pipeline(**kwargs) -> Pipeline:
                 outputs="resampled_data",
                 name="node_preprocessing_time_data",
             ),
+            node(
+                func=node_time_rollups,
+                inputs=["resampled_data", "parameters"],
+                outputs="resampled_data_rollups",
+                name="node_time_rollups",
+            ),
+            node(
+                func=node_count_store,
+                inputs=["resampled_data", "parameters"],
+                outputs="resampled_data_store",
+                name="node_count_store",
+            ),
+        ]
+    )
+
+
+def create_staging_pipeline(**kwargs) -> Pipeline:
+    """Converts the raw data, with all its columns, to the Parquet store
+    species_data_staged"""
+    return pipeline(
+        [
+            node(
+                func=node_stage_raw_parquet,
+                inputs=["species_data_full", "parameters"],
+                outputs="species_data_staged",
+                name="node_stage_raw_parquet",
+            ),
+        ]
+    )
+
+
+def create_staged_pipeline(**kwargs) -> Pipeline:
+    """Same as create_pipeline(), reading the Parquet store species_data_staged"""
+    return pipeline(
+        [
+            node(
+                func=node_preprocessing_time_data,
+                inputs=["species_data_staged", "parameters"],
+                outputs="resampled_data",
+                name="node_preprocessing_staged_time_data",
+            ),
+        ]
+    )
+
+
+def create_grouped_pipeline(**kwargs) -> Pipeline:
+    """Sums individual counts by group and period"""
+    return pipeline(
+        [
+            node(
+                func=node_grouped_time_aggregation,
+                inputs=["species_data_grouped", "parameters"],
+                outputs="grouped_resampled_data",
+                name="node_grouped_time_aggregation",
+            ),
+        ]
+    )
+
+
+def create_pushdown_pipeline(**kwargs) -> Pipeline:
+    """Same output as node_preprocessing_time_data, aggregated in the SQL backend
+    species_data_sql"""
+    return pipeline(
+        [
+            node(
+                func=node_pushdown_time_resampling,
+                inputs=["species_data_sql", "parameters"],
+                outputs="resampled_data",
+                name="node_pushdown_time_resampling",
+            ),
+        ]
+    )
+
+
+def create_shard_pipeline(**kwargs) -> Pipeline:
+    """Partial aggregate of the shard 'sharding' -> 'shard' of species_data.
+    Every replica runs it with a different shard"""
+    return pipeline(
+        [
+            node(
+                func=node_shard_time_aggregation,
+                inputs=["species_data", "parameters"],
+                outputs="resampled_data_shards",
+                name="node_shard_time_aggregation",
+            ),
+        ]
+    )
+
+
+def create_shard_merge_pipeline(**kwargs) -> Pipeline:
+    """Merges the partial aggregates of all the shards into resampled_data"""
+    return pipeline(
+        [
+            node(
+                func=node_merge_shards,
+                inputs=["resampled_data_shards", "parameters"],
+                outputs="resampled_data",
+                name="node_merge_shards",
+            ),
         ]
     )
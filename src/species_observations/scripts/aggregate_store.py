@@ -0,0 +1,249 @@
+"""Defines PartialAggregateStore() class which keeps the partial aggregates of
+    processed partitions between runs, along with a manifest of those partitions.
+    Files are written to a temporary file and renamed, and a partial is written
+    before the manifest entry which refers to it, so a run interrupted at any point
+    leaves a valid checkpoint to resume from.
+    Stale files are removed with:
+        python -m species_observations.scripts.aggregate_store --env base
+    Run from the kedro project main folder
+    """
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+
+import pandas as pd
+
+import species_observations.utils as utl
+
+
+class PartialAggregateStore:
+    """Stores one partial aggregate per partition in a folder, and a manifest with
+    the fingerprint of the partition each partial was computed from.
+    Partials computed with different parameters are not reused"""
+
+    def __init__(self, path: Union[str, Path], parameters_key: str):
+        """Loads the manifest of the folder path, if it exists.
+
+        Parameters
+        ----------
+        path : Union[str, Path]
+            Folder of the store
+        parameters_key : str
+            Identifies the parameters used to compute the partials.
+            If it differs from the one in the manifest, the stored partials are ignored
+        """
+        self._path = Path(path)
+        self._parameters_key = parameters_key
+        self._manifest_file = self._path / "manifest.json"
+        self._partitions = {}
+        # Files replaced since the last manifest, deleted once it no longer refers
+        # to them
+        self._removed_files = []
+
+        if self._manifest_file.is_file():
+            manifest = json.loads(self._manifest_file.read_text(encoding="utf-8"))
+            if manifest["parameters_key"] == parameters_key:
+                self._partitions = manifest["partitions"]
+
+    def names(self) -> List[str]:
+        """Names of the partitions with a stored partial aggregate
+
+        Returns
+        -------
+        List[str]
+            Partition names
+        """
+        return sorted(self._partitions)
+
+    def is_current(self, name: str, fingerprint: Dict) -> bool:
+        """Checks if the partial aggregate of a partition was computed from the
+            version of the partition identified by fingerprint
+
+        Parameters
+        ----------
+        name : str
+            Partition name
+        fingerprint : Dict
+            Current fingerprint of the partition
+
+        Returns
+        -------
+        bool
+            True if the stored partial can be reused
+        """
+        entry = self._partitions.get(name)
+        return (
+            entry is not None
+            and entry["fingerprint"] == fingerprint
+            and (self._path / entry["file"]).is_file()
+        )
+
+    def load_partial(self, name: str) -> pd.DataFrame:
+        """Loads the partial aggregate of a partition
+
+        Parameters
+        ----------
+        name : str
+            Partition name
+
+        Returns
+        -------
+        pd.DataFrame
+            Partial aggregate
+        """
+        return pd.read_pickle(self._path / self._partitions[name]["file"])
+
+    def save_partial(self, name: str, fingerprint: Dict, df_partial: pd.DataFrame):
+        """Stores the partial aggregate of a partition, in a file named after the
+            partition and its fingerprint, so the file of a committed entry is never
+            overwritten.  The manifest is written by save_manifest()
+
+        Parameters
+        ----------
+        name : str
+            Partition name
+        fingerprint : Dict
+            Fingerprint of the partition the partial was computed from
+        df_partial : pd.DataFrame
+            Partial aggregate
+        """
+        self._path.mkdir(parents=True, exist_ok=True)
+        partial_file = _partial_file_name(name, fingerprint)
+        utl.atomic_write(self._path / partial_file, df_partial.to_pickle)
+        previous = self._partitions.get(name)
+        self._partitions[name] = {"fingerprint": fingerprint, "file": partial_file}
+        if previous is not None and previous["file"] != partial_file:
+            self._removed_files.append(previous["file"])
+
+    def remove(self, name: str):
+        """Retracts the partial aggregate of a partition
+
+        Parameters
+        ----------
+        name : str
+            Partition name
+        """
+        entry = self._partitions.pop(name)
+        partial_file = self._path / entry["file"]
+        if partial_file.is_file():
+            os.remove(partial_file)
+
+    def save_manifest(self):
+        """Writes the manifest of the stored partial aggregates.  It commits every
+        partial saved since the previous call"""
+        self._path.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "parameters_key": self._parameters_key,
+            "partitions": self._partitions,
+        }
+        text = json.dumps(manifest, indent=2, sort_keys=True)
+        utl.atomic_write(
+            self._manifest_file,
+            lambda file_path: Path(file_path).write_text(text, encoding="utf-8"),
+        )
+        for partial_file in self._removed_files:
+            if (self._path / partial_file).is_file():
+                os.remove(self._path / partial_file)
+        self._removed_files = []
+
+    def stale_files(self) -> List[Path]:
+        """Files of the folder which no resumed run would read: partials which are
+            not in the manifest (left by interrupted runs or replaced), temporary
+            files, and the whole store if its manifest was written with other
+            parameters
+
+        Returns
+        -------
+        List[Path]
+            Stale files, sorted
+        """
+        if not self._path.is_dir():
+            return []
+        current = {entry["file"] for entry in self._partitions.values()}
+        if self._partitions or self._manifest_matches():
+            current.add(self._manifest_file.name)
+        return sorted(
+            file_path
+            for file_path in self._path.iterdir()
+            if file_path.is_file() and file_path.name not in current
+        )
+
+    def clean(self) -> List[Path]:
+        """Deletes stale_files()
+
+        Returns
+        -------
+        List[Path]
+            Deleted files
+        """
+        stale = self.stale_files()
+        for file_path in stale:
+            os.remove(file_path)
+        return stale
+
+    def _manifest_matches(self) -> bool:
+        """Checks if the manifest of the folder was written with parameters_key
+
+        Returns
+        -------
+        bool
+            True if the manifest exists and has the same parameters_key
+        """
+        if not self._manifest_file.is_file():
+            return False
+        manifest = json.loads(self._manifest_file.read_text(encoding="utf-8"))
+        return manifest["parameters_key"] == self._parameters_key
+
+
+def _partial_file_name(name: str, fingerprint: Dict) -> str:
+    """File name of the partial aggregate of a version of a partition.
+        Partition names can contain folders and characters not valid in file names
+
+    Parameters
+    ----------
+    name : str
+        Partition name
+    fingerprint : Dict
+        Fingerprint of the partition
+
+    Returns
+    -------
+    str
+        File name, unique for each partition name and fingerprint
+    """
+    safe_name = "".join(char if char.isalnum() else "_" for char in name)
+    key = json.dumps([name, fingerprint], sort_keys=True)
+    name_hash = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+    return f"{safe_name}_{name_hash}.pkl"
+
+
+def main():
+    """Removes the stale checkpoints of the incremental aggregation, for the
+    parameters of a kedro environment"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--env", default="base", help="kedro environment")
+    parser.add_argument("--path", default=None, help="folder of the store")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only list the stale files"
+    )
+    args = parser.parse_args()
+
+    # pylint: disable=import-outside-toplevel
+    from species_observations.scripts.data_processing import Preprocessing
+
+    config = utl.load_config_file_kedro(kedro_env=args.env)
+    prep = Preprocessing(config["parameters"])
+    store = PartialAggregateStore(
+        args.path or prep.get_incremental_path(), prep.get_parameters_key()
+    )
+    stale = store.stale_files() if args.dry_run else store.clean()
+    for file_path in stale:
+        print(file_path)
+    print(f"{len(stale)} stale files {'found' if args.dry_run else 'removed'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Defines CountStore() class, a reader of resampled counts stored as fixed-stride
+    binary arrays, and write_count_store() which writes them.
+    A store is a folder with:
+        header.json: resampling period, epoch, ordinal of the first period,
+            number of periods and names of the array files
+        counts.<version>.f8: count of each period, as little-endian float64
+        cumsum.<version>.f8: cumulative sum of the counts, starting with 0
+    The arrays are memory-mapped, so any range of periods is read without parsing
+    text or loading the whole series, and range totals are two lookups in cumsum.f8.
+    The version of the arrays is a hash of their contents, and replacing the header
+    is the only step that changes the store seen by readers
+    """
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+import species_observations.utils as utl
+
+HEADER_FILE = "header.json"
+# Array files of stores whose header has no 'files'
+COUNTS_FILE = "counts.f8"
+CUMSUM_FILE = "cumsum.f8"
+STORE_DTYPE = "<f8"
+EPOCH = "1970-01-01"
+
+
+def write_count_store(path: Union[str, Path], counts: pd.Series, resample: str):
+    """Writes the counts of a resampled series as a count store.
+        Periods missing from counts are stored as 0
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        Folder of the store.  Readers which read the previous header keep its
+        arrays until the next rewrite
+    counts : pd.Series
+        Counts indexed by the period labels, as given by
+        Preprocessing.time_resampling()
+    resample : str
+        Resampling period of counts.  'D' for daily, 'M' for monthly
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    valid = counts.index.notna()
+    ordinals = utl.period_ordinals(counts.index[valid], resample)
+    first_ordinal = int(ordinals.min()) if len(ordinals) else 0
+    periods = int(ordinals.max()) - first_ordinal + 1 if len(ordinals) else 0
+    dense_counts = np.bincount(
+        ordinals - first_ordinal,
+        weights=np.nan_to_num(counts.to_numpy("float64")[valid]),
+        minlength=periods,
+    )
+    dense_counts = dense_counts.astype(STORE_DTYPE)
+    cumsum = np.concatenate([[0.0], np.cumsum(dense_counts)]).astype(STORE_DTYPE)
+    version = hashlib.sha256(dense_counts.tobytes()).hexdigest()[:16]
+    files = {
+        "counts": _versioned_name(COUNTS_FILE, version),
+        "cumsum": _versioned_name(CUMSUM_FILE, version),
+    }
+    # Arrays get new names, so the ones referenced by the current header are never
+    # modified, and are written to temporary files and renamed, so they are never
+    # read partially written
+    utl.atomic_write(path / files["counts"], dense_counts.tofile)
+    utl.atomic_write(path / files["cumsum"], cumsum.tofile)
+
+    previous_files = _header_files(path)
+    header = {
+        "resample": resample,
+        "epoch": EPOCH,
+        "first_ordinal": first_ordinal,
+        "periods": periods,
+        "dtype": STORE_DTYPE,
+        "tz": None if counts.index.tz is None else str(counts.index.tz),
+        "index_name": counts.index.name,
+        "name": counts.name,
+        "files": files,
+    }
+    # Replacing the header commits the new arrays, once both are complete
+    utl.atomic_write(
+        path / HEADER_FILE,
+        lambda file_path: file_path.write_text(
+            json.dumps(header, indent=2), encoding="utf-8"
+        ),
+    )
+    # The arrays of the previous header are kept for readers which read it before
+    # the replacement, and older ones are removed
+    keep = set(files.values()) | set(previous_files.values())
+    for array_file in [COUNTS_FILE, CUMSUM_FILE]:
+        stale = {path / array_file} | set(path.glob(_versioned_name(array_file, "*")))
+        for file_path in stale:
+            if file_path.name not in keep:
+                file_path.unlink(missing_ok=True)
+
+
+def _versioned_name(file_name: str, version: str) -> str:
+    """Name of an array file for a version, e.g. counts.<version>.f8"""
+    name, suffix = file_name.rsplit(".", 1)
+    return f"{name}.{version}.{suffix}"
+
+
+def _header_files(path: Path) -> Dict[str, str]:
+    """Array files referenced by the header of the store in path.  Empty if there
+    is no store"""
+    if not (path / HEADER_FILE).is_file():
+        return {}
+    return _array_files(json.loads((path / HEADER_FILE).read_text(encoding="utf-8")))
+
+
+def _array_files(header: Dict) -> Dict[str, str]:
+    """Names of the counts and cumsum files of a header"""
+    return header.get("files", {"counts": COUNTS_FILE, "cumsum": CUMSUM_FILE})
+
+
+class CountStore:
+    """Reads a count store written by write_count_store().  Dates are mapped to
+    positions in the arrays by their period ordinal since the epoch"""
+
+    def __init__(self, path: Union[str, Path]):
+        """Reads the header and memory-maps the arrays of the store.
+
+        Parameters
+        ----------
+        path : Union[str, Path]
+            Folder of the store
+        """
+        self._path = Path(path)
+        self._header = json.loads(
+            (self._path / HEADER_FILE).read_text(encoding="utf-8")
+        )
+        self._resample = self._header["resample"]
+        self._first_ordinal = self._header["first_ordinal"]
+        self._periods = self._header["periods"]
+        self._tz = self._header["tz"]
+        files = _array_files(self._header)
+        self._counts = self._memmap(files["counts"], self._periods)
+        self._cumsum = self._memmap(files["cumsum"], self._periods + 1)
+
+    def _memmap(self, file_name: str, length: int) -> np.ndarray:
+        """Memory-maps one of the arrays of the store.
+            np.memmap can not map empty files, so empty arrays are returned as such
+
+        Parameters
+        ----------
+        file_name : str
+            File of the array
+        length : int
+            Number of elements of the array
+
+        Returns
+        -------
+        np.ndarray
+            Read-only array
+        """
+        if length == 0:
+            return np.zeros(0, dtype=self._header["dtype"])
+        return np.memmap(
+            self._path / file_name,
+            dtype=self._header["dtype"],
+            mode="r",
+            shape=(length,),
+        )
+
+    def __len__(self) -> int:
+        """Number of periods of the store
+
+        Returns
+        -------
+        int
+            Number of periods, from the first to the last one with data
+        """
+        return self._periods
+
+    def get_header(self) -> Dict:
+        """Allows access to the contents of protected attribute _header
+
+        Returns
+        -------
+        Dict
+            Copy of _header
+        """
+        return dict(self._header)
+
+    def get_resample(self) -> str:
+        """Allows access to the contents of protected attribute _resample
+
+        Returns
+        -------
+        str
+            Contents of _resample
+        """
+        return self._resample
+
+    def _position(self, date) -> int:
+        """Position of the period of date in the arrays.  It can be outside of them
+
+        Parameters
+        ----------
+        date : str, datetime or pd.Timestamp
+            Date.  Dates without time zone are taken in the time zone of the store
+
+        Returns
+        -------
+        int
+            Period ordinal of date minus the ordinal of the first period
+        """
+        date = pd.Timestamp(date)
+        if date.tz is not None and self._tz is not None:
+            date = date.tz_convert(self._tz)
+        ordinal = utl.period_ordinals(pd.DatetimeIndex([date]), self._resample)[0]
+        return int(ordinal) - self._first_ordinal
+
+    def _bounds(self, start=None, end=None) -> slice:
+        """Positions of the periods from start to end, both included, clipped to
+            the periods of the store
+
+        Parameters
+        ----------
+        start : str, datetime or pd.Timestamp, by default None
+            First date.  If not specified, the first period of the store
+        end : str, datetime or pd.Timestamp, by default None
+            Last date.  If not specified, the last period of the store
+
+        Returns
+        -------
+        slice
+            Slice of the counts array
+        """
+        low = 0 if start is None else self._position(start)
+        high = self._periods if end is None else self._position(end) + 1
+        low = min(max(low, 0), self._periods)
+        high = min(max(high, low), self._periods)
+        return slice(low, high)
+
+    def counts(self, start=None, end=None) -> pd.Series:
+        """Counts of the periods from start to end, both included
+
+        Parameters
+        ----------
+        start : str, datetime or pd.Timestamp, by default None
+            First date.  If not specified, the first period of the store
+        end : str, datetime or pd.Timestamp, by default None
+            Last date.  If not specified, the last period of the store
+
+        Returns
+        -------
+        pd.Series
+            Counts indexed by the period labels, as given by
+            Preprocessing.time_resampling()
+        """
+        bounds = self._bounds(start, end)
+        index = utl.period_index(
+            self._first_ordinal + bounds.start,
+            bounds.stop - bounds.start,
+            self._resample,
+            self._tz,
+            self._header["index_name"],
+        )
+        return pd.Series(
+            np.array(self._counts[bounds], dtype="float64"),
+            index=index,
+            name=self._header["name"],
+        )
+
+    def total(self, start=None, end=None) -> float:
+        """Sum of the counts of the periods from start to end, both included.
+            Constant time, whatever the length of the range
+
+        Parameters
+        ----------
+        start : str, datetime or pd.Timestamp, by default None
+            First date.  If not specified, the first period of the store
+        end : str, datetime or pd.Timestamp, by default None
+            Last date.  If not specified, the last period of the store
+
+        Returns
+        -------
+        float
+            Sum of the counts
+        """
+        bounds = self._bounds(start, end)
+        if bounds.stop == bounds.start:
+            return 0.0
+        return float(self._cumsum[bounds.stop] - self._cumsum[bounds.start])
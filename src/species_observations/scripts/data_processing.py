@@ -1,11 +1,38 @@
 """Defines Preprocessing() class which performs various data preprocessing 
     in the species_observation project
     """
-from typing import Dict
+import hashlib
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from pandas.api.types import is_datetime64_any_dtype as is_datetime
+from pandas.api.types import is_bool_dtype, is_integer_dtype
 
 import species_observations.utils as utl
+from species_observations.scripts.aggregate_store import PartialAggregateStore
+from species_observations.scripts.engines import ENGINES
+from species_observations.scripts.memory_budget import (
+    ChunkedPartitionReader,
+    MemoryMonitor,
+    parse_memory_size,
+)
+from species_observations.scripts.prefetch import Prefetcher
+from species_observations.scripts.record_batches import RecordBatchSource
+from species_observations.scripts.sharding import parse_shard, select_shard
+from species_observations.scripts.sql_pushdown import (
+    PERIOD_COLUMN,
+    SQLBackend,
+    period_aggregation_sql,
+)
+
+# Cells (groups times periods) of grouped_time_aggregation which can be identified
+# by an int64
+MAX_CELLS = np.iinfo(np.int64).max
 
 
 class Preprocessing:
@@ -22,9 +49,39 @@ class Preprocessing:
         self._full_cols = parameters["data_cols"]
         self._date_col = self._full_cols["event_date"]
         self._count_col = self._full_cols["individual_count"]
+        self._date_components = [
+            self._full_cols[key] for key in ["date_year", "date_month", "date_day"]
+        ]
+        self._dtypes = parameters["data_dtypes"]
+        self._required_keys = ["event_date", "individual_count"]
 
         self._preproc_params = parameters[catalog_entry]
         self._resample = self._preproc_params["resampling_period"]
+        self._derivable_rollups = {"D": ["D", "W", "M", "Q", "A"], "M": ["M", "Q", "A"]}
+        self._rollup_periods = self._preproc_params["rollup_periods"]
+        if self._rollup_periods is None:
+            self._rollup_periods = self._derivable_rollups.get(self._resample, [])
+
+        self._resampling_engine = self._preproc_params["resampling_engine"]
+        self._allowed_engines = ["pandas", "numpy"]
+        if self._resampling_engine not in self._allowed_engines:
+            raise ValueError(
+                f""" 'resampling_engine' can only take values of {self._allowed_engines}.
+'{self._resampling_engine}' was given"""
+            )
+        self._execution_engine = self._preproc_params["execution_engine"]
+        self._allowed_execution_engines = ["pandas"] + list(ENGINES)
+        if self._execution_engine not in self._allowed_execution_engines:
+            raise ValueError(
+                f""" 'execution_engine' can only take values of {self._allowed_execution_engines}.
+'{self._execution_engine}' was given"""
+            )
+        self._date_format = self._preproc_params["date_format"]
+        self._date_range = self._preproc_params["date_range"]
+        self._grouping = self._preproc_params["grouping"]["enabled"]
+        self._group_keys = self._preproc_params["grouping"]["keys"]
+        if self._grouping:
+            self._required_keys = self._required_keys + self._group_keys
         self._allowed_resamples = ["D", "M"]
         if self._resample not in self._allowed_resamples:
             raise ValueError(
@@ -32,6 +89,15 @@ class Preprocessing:
 '{self._resample}' was given"""
             )
 
+        self._streaming = self._preproc_params["streaming"]
+        self._n_workers = self._preproc_params["parallel"]["n_workers"]
+        self._chunksize = self._preproc_params["parallel"]["chunksize"]
+        self._incremental = self._preproc_params["incremental"]["enabled"]
+        self._incremental_path = self._preproc_params["incremental"]["path"]
+        self._max_memory = parse_memory_size(self._preproc_params["max_memory"])
+        self._shard = parse_shard(self._preproc_params["sharding"]["shard"])
+        self._prefetch_depth = self._preproc_params["prefetch_depth"]
+
         self._datetime_suffix = "_datetime"
 
     def get_date_col(self) -> str:
@@ -64,10 +130,326 @@ class Preprocessing:
         """
         return self._resample
 
+    def _check_rollups(self, periods: List[str], base_resample: str):
+        """Raises ValueError if some period can not be derived from base_resample
+
+        Parameters
+        ----------
+        periods : List[str]
+            Rollup periods
+        base_resample : str
+            Resampling period of the base aggregate
+        """
+        allowed = self._derivable_rollups.get(base_resample, [])
+        invalid = [period for period in periods if period not in allowed]
+        if invalid:
+            raise ValueError(
+                f""" 'rollup_periods' can only take values of {allowed} when
+'resampling_period' is '{base_resample}'. {invalid} were given"""
+            )
+
+    def get_streaming(self) -> bool:
+        """Allows access to the contents of protected attribute _streaming
+
+        Returns
+        -------
+        bool
+            Contents of _streaming
+        """
+        return self._streaming
+
+    def get_n_workers(self) -> int:
+        """Allows access to the contents of protected attribute _n_workers
+
+        Returns
+        -------
+        int
+            Contents of _n_workers
+        """
+        return self._n_workers
+
+    def get_incremental(self) -> bool:
+        """Allows access to the contents of protected attribute _incremental
+
+        Returns
+        -------
+        bool
+            Contents of _incremental
+        """
+        return self._incremental
+
+    def get_incremental_path(self) -> str:
+        """Allows access to the contents of protected attribute _incremental_path
+
+        Returns
+        -------
+        str
+            Contents of _incremental_path
+        """
+        return self._incremental_path
+
+    def get_execution_engine(self) -> str:
+        """Allows access to the contents of protected attribute _execution_engine
+
+        Returns
+        -------
+        str
+            Contents of _execution_engine
+        """
+        return self._execution_engine
+
+    def get_max_memory(self) -> Optional[int]:
+        """Allows access to the contents of protected attribute _max_memory
+
+        Returns
+        -------
+        Optional[int]
+            Contents of _max_memory, in bytes
+        """
+        return self._max_memory
+
+    def get_prefetch_depth(self) -> int:
+        """Allows access to the contents of protected attribute _prefetch_depth
+
+        Returns
+        -------
+        int
+            Contents of _prefetch_depth
+        """
+        return self._prefetch_depth
+
+    def get_shard(self) -> Optional[Tuple[int, int]]:
+        """Allows access to the contents of protected attribute _shard
+
+        Returns
+        -------
+        Optional[Tuple[int, int]]
+            Contents of _shard, as (i, N)
+        """
+        return self._shard
+
+    def get_parameters_key(self, resample: str = None) -> str:
+        """Identifies the parameters that determine the partial aggregate of a
+            partition.  Partials computed with a different key can not be merged
+
+        Parameters
+        ----------
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        str
+            Hash of the parameters
+        """
+        key_params = {
+            "required_columns": self.get_required_columns(),
+            "date_format": self._date_format,
+            "resample": resample or self._resample,
+        }
+        key_json = json.dumps(key_params, sort_keys=True)
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+    def get_required_columns(self, grouped: bool = False) -> Dict[str, str]:
+        """Columns of the raw data used by the preprocessing, with the types
+            defined for them in 'data_dtypes'
+
+        Parameters
+        ----------
+        grouped : bool, optional
+            If True, also the grouping columns of 'grouping' -> 'keys', used by
+            grouped_time_aggregation, by default False
+
+        Returns
+        -------
+        Dict[str, str]
+            {column_name: dtype}
+        """
+        keys = self._required_keys
+        if grouped:
+            keys = keys + [key for key in self._group_keys if key not in keys]
+        return {self._full_cols[key]: self._dtypes[key] for key in keys}
+
+    def get_load_args(self, file_format: str = "csv", grouped: bool = False) -> Dict:
+        """Load arguments that restrict a pandas loader to the columns returned by
+            get_required_columns().
+            For 'csv', columns are parsed with their types.
+            For 'parquet' (a store partitioned by year and month, see staging_data),
+            only the partitions of the months within 'date_range' are read
+
+        Parameters
+        ----------
+        file_format : str, optional
+            'csv' or 'parquet', by default 'csv'
+        grouped : bool, optional
+            If True, also loads the grouping columns, see get_required_columns(),
+            by default False
+
+        Returns
+        -------
+        Dict
+            csv: {'usecols': [column_name, ...], 'dtype': {column_name: dtype}}
+            parquet: {'columns': [column_name, ...], 'filters': [...] or None}
+        """
+        required_columns = self.get_required_columns(grouped)
+        if file_format == "csv":
+            return {"usecols": list(required_columns), "dtype": required_columns}
+        if file_format == "parquet":
+            return {"columns": list(required_columns), "filters": self._month_filters()}
+        raise ValueError(
+            f"'file_format' can only take values of ['csv', 'parquet']. "
+            f"'{file_format}' was given"
+        )
+
+    def _month_filters(self) -> Optional[List[List[Tuple]]]:
+        """Filters selecting the year and month partitions within 'date_range',
+            in the disjunctive normal form used by pd.read_parquet
+
+        Returns
+        -------
+        Optional[List[List[Tuple]]]
+            [[(year_col, '=', year), (month_col, '=', month)], ...].
+            None if no range is defined
+        """
+        start, end = self._date_range["start"], self._date_range["end"]
+        if start is None and end is None:
+            return None
+        if start is None or end is None:
+            raise ValueError("'date_range' needs both 'start' and 'end', or neither")
+        year_col, month_col = self._date_components[:2]
+        return [
+            [(year_col, "=", month.year), (month_col, "=", month.month)]
+            for month in pd.period_range(start, end, freq="M")
+        ]
+
+    def parse_event_dates(self, df_in: pd.DataFrame) -> pd.Series:
+        """Converts the column date_col to datetime.
+            Each distinct date is parsed once with the format 'date_format'.
+            If some date does not follow that format, the dates are built from
+            the year, month and day columns when these have no missing values
+            (at midnight UTC, which is enough for daily or coarser resampling),
+            and are otherwise parsed inferring the format.
+
+        Parameters
+        ----------
+        df_in : pd.DataFrame
+            Data with the column date_col
+
+        Returns
+        -------
+        pd.Series
+            Parsed dates
+        """
+        if is_datetime(df_in[self._date_col]):
+            return df_in[self._date_col]
+        try:
+            return utl.parse_dates_cached(df_in[self._date_col], self._date_format)
+        except (ValueError, TypeError):
+            pass
+        if set(self._date_components).issubset(df_in.columns) and (
+            df_in[self._date_components].notna().all().all()
+        ):
+            return utl.dates_from_components(
+                *[df_in[column] for column in self._date_components], tz="UTC"
+            )
+        return utl.parse_dates_cached(df_in[self._date_col])
+
+    def staging_data(self, df_in: pd.DataFrame) -> pd.DataFrame:
+        """Prepares raw data to be stored in a Parquet store partitioned by year and
+            month.  date_col is parsed to datetime, so it is parsed only once, and the
+            year and month columns are set from it.  Rows without date are dropped.
+            String columns are stored as categoricals and integers are downcast.
+            The columns of 'data_dtypes' of type category are categoricals even when
+            all their values are missing (see staging_table)
+
+        Parameters
+        ----------
+        df_in : pd.DataFrame or dict of dataframes loaded from partitioned data
+            Raw data
+
+        Returns
+        -------
+        pd.DataFrame
+            Data ready to be staged
+        """
+        df_in = utl.validates_dataframe(df_in)
+        df_in[self._date_col] = self.parse_event_dates(df_in)
+        df_in = df_in[df_in[self._date_col].notna()].copy()
+
+        year_col, month_col = self._date_components[:2]
+        df_in[year_col] = df_in[self._date_col].dt.year.astype("int16")
+        df_in[month_col] = df_in[self._date_col].dt.month.astype("int8")
+        df_in = utl.compact_dtypes(df_in, exclude=[self._count_col])
+        for key, dtype in self._staged_dtypes().items():
+            column = self._full_cols[key]
+            if dtype == "category" and df_in[column].dtype != "category":
+                # Columns with only missing values are read as float64
+                df_in[column] = df_in[column].astype(object).astype(dtype)
+        return df_in
+
+    def _staged_dtypes(self) -> Dict[str, str]:
+        """Types of 'data_dtypes' kept in the staged store.  date_col is stored parsed"""
+        return {
+            key: str(dtype)
+            for key, dtype in self._dtypes.items()
+            if self._full_cols[key] != self._date_col
+        }
+
+    def staging_schema(self, df_staged: pd.DataFrame) -> pa.Schema:
+        """Arrow schema of a partition of the staged store.  Each partition is written
+            as a separate file, so the columns of 'data_dtypes' get the type of
+            arrow_column_type instead of the one inferred from their values, which is
+            double for a column with only missing values.  Other categoricals are
+            dictionary encoded with int32 indices
+
+        Parameters
+        ----------
+        df_staged : pd.DataFrame
+            Data returned by staging_data
+
+        Returns
+        -------
+        pa.Schema
+            Schema of the partition
+        """
+        column_types = {
+            self._full_cols[key]: utl.arrow_column_type(dtype)
+            for key, dtype in self._staged_dtypes().items()
+        }
+        schema = pa.Schema.from_pandas(df_staged, preserve_index=False)
+        for i, field in enumerate(schema):
+            if field.name in column_types:
+                field_type = column_types[field.name]
+            elif pa.types.is_dictionary(field.type):
+                field_type = pa.dictionary(pa.int32(), field.type.value_type)
+            else:
+                continue
+            schema = schema.set(i, pa.field(field.name, field_type))
+        return schema.remove_metadata()
+
+    def staging_table(self, df_in: pd.DataFrame) -> pa.Table:
+        """Converts raw data with staging_data into an Arrow table of schema
+            staging_schema, so all the partitions of the store have the same types
+
+        Parameters
+        ----------
+        df_in : pd.DataFrame or dict of dataframes loaded from partitioned data
+            Raw data
+
+        Returns
+        -------
+        pa.Table
+            Data ready to be staged
+        """
+        df_staged = self.staging_data(df_in)
+        return pa.Table.from_pandas(
+            df_staged, schema=self.staging_schema(df_staged), preserve_index=False
+        )
+
     def preprocessing_time_data(self, df_in: pd.DataFrame) -> pd.DataFrame:
         """Fills NaN in the column count_col with zeros.
-            Takes the column date_col of type string and transforms it to datetime.
-            Stores it in a new column of name date_col + "_datetime"
+            Takes the column date_col of type string and transforms it to datetime
+            (see parse_event_dates).  Stores it in a new column of name date_col + "_datetime"
             count_col and date_col are defined at the constructor through 'parameters'
 
         Parameters
@@ -87,14 +469,14 @@ class Preprocessing:
 
         df_in = utl.validates_dataframe(df_in)
 
-        df_in[date_col_datetime] = pd.to_datetime(df_in[date_col])
+        df_in[date_col_datetime] = self.parse_event_dates(df_in)
         df_in[count_col] = df_in[count_col].fillna(0)
         df_out = df_in[[count_col, date_col_datetime]]
 
         return df_out
 
     def time_resampling(
-        self, df_in: pd.DataFrame, resample: str = None
+        self, df_in: pd.DataFrame, resample: str = None, engine: str = None
     ) -> pd.DataFrame:
         """Resamples df to the frequency specified by "resample".
             Used the column date_col_datetime as basis for the resample,
@@ -108,6 +490,10 @@ class Preprocessing:
         resample : str, by default None
             Resampling period.  If not specified it uses the value defined in the constructor
             If not in the list defined by self._allowed_resamples, raises ValueError
+        engine : str, by default None
+            'pandas' uses pd.DataFrame.resample().  'numpy' sums with np.bincount over
+            integer period ordinals, with the same output.
+            If not specified it uses the value defined in the constructor
         Returns
         -------
         pd.DataFrame
@@ -122,6 +508,751 @@ class Preprocessing:
 '{resample}' was given"""
             )
 
+        if engine is None:
+            engine = self._resampling_engine
+        if engine not in self._allowed_engines:
+            raise ValueError(
+                f""" 'engine' can only take values of {self._allowed_engines}.
+'{engine}' was given"""
+            )
+
         if not is_datetime(df_in[date_col_datetime]):
-            df_in[date_col_datetime] = pd.to_datetime(df_in[date_col_datetime])
+            df_in[date_col_datetime] = utl.parse_dates_cached(df_in[date_col_datetime])
+        if engine == "numpy":
+            return self._bincount_resampling(df_in, resample)
         return df_in.set_index(date_col_datetime).resample(resample).sum()
+
+    def _bincount_resampling(self, df_in: pd.DataFrame, resample: str) -> pd.DataFrame:
+        """Resamples df summing each column with np.bincount over the period
+            ordinals of date_col_datetime.  Periods without data are filled with zeros
+            and rows without date are ignored, as with pd.DataFrame.resample().sum()
+
+        Parameters
+        ----------
+        df_in : pd.DataFrame
+            DataFrame to be resampled, with date_col_datetime of type datetime
+        resample : str
+            Resampling period
+
+        Returns
+        -------
+        pd.DataFrame
+            Resample dataframe
+        """
+        date_col_datetime = self._date_col + self._datetime_suffix
+        dates = df_in[date_col_datetime]
+        valid = dates.notna().to_numpy()
+        value_cols = [column for column in df_in.columns if column != date_col_datetime]
+
+        ordinals = utl.period_ordinals(dates[valid], resample)
+        first_ordinal = ordinals.min() if len(ordinals) else 0
+        positions = ordinals - first_ordinal
+        periods = int(positions.max()) + 1 if len(positions) else 0
+
+        resampled = {}
+        for column in value_cols:
+            values = df_in[column].to_numpy()[valid]
+            sums = np.bincount(
+                positions,
+                weights=np.nan_to_num(values.astype("float64")),
+                minlength=periods,
+            )
+            if is_integer_dtype(df_in[column]) or is_bool_dtype(df_in[column]):
+                sums = sums.astype("int64")
+            resampled[column] = sums
+
+        index = utl.period_index(
+            first_ordinal, periods, resample, dates.dt.tz, date_col_datetime
+        )
+        return pd.DataFrame(resampled, index=index, columns=value_cols)
+
+    def grouped_time_aggregation(
+        self, df_in: pd.DataFrame, keys: List[str] = None, resample: str = None
+    ) -> pd.DataFrame:
+        """Sums count_col by group and period.  The grouping columns are encoded as
+            categoricals, and each (group, period) cell is identified by a single
+            integer computed from the category codes and the period ordinal, which
+            is aggregated with np.unique and np.bincount.  If that integer could
+            overflow int64, the cells are the distinct rows of the codes instead.
+            Only cells with at least one observation are returned.  Rows without
+            date or with a missing grouping value are ignored
+
+        Parameters
+        ----------
+        df_in : pd.DataFrame or dict of dataframes loaded from partitioned data
+            Raw data.  If dict, first concatenates all entries into a single df
+        keys : List[str], by default None
+            Keys of 'data_cols' of the grouping columns.  If not specified it uses
+            'grouping' -> 'keys'
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Long table with the grouping columns (categoricals), date_col_datetime
+            and count_col, sorted by group and period
+        """
+        if keys is None:
+            keys = self._group_keys
+        if resample is None:
+            resample = self._resample
+        group_cols = [self._full_cols[key] for key in keys]
+        date_col_datetime = self._date_col + self._datetime_suffix
+
+        df_in = utl.validates_dataframe(df_in)
+        missing_cols = [column for column in group_cols if column not in df_in.columns]
+        if missing_cols:
+            raise ValueError(
+                f"""Grouping columns {missing_cols} are not in the data.
+                Read the raw data from a dataset of 'column_projection' ->
+                'grouped_datasets', e.g. species_data_grouped, so they are loaded"""
+            )
+        dates = self.parse_event_dates(df_in)
+        valid = dates.notna().to_numpy()
+        groups = [df_in[column].astype("category").array for column in group_cols]
+        for group in groups:
+            valid &= group.codes >= 0
+
+        ordinals = utl.period_ordinals(dates[valid], resample)
+        first_ordinal = ordinals.min() if len(ordinals) else 0
+        radixes = [len(group.categories) for group in groups]
+        radixes.append(int(ordinals.max() - first_ordinal) + 1 if len(ordinals) else 1)
+
+        codes = [group.codes[valid] for group in groups]
+        codes.append(ordinals - first_ordinal)
+        if math.prod(radixes) <= MAX_CELLS:
+            cell_ids = np.zeros(len(ordinals), dtype="int64")
+            for position, radix in zip(codes, radixes):
+                cell_ids = cell_ids * radix + position
+            unique_ids, inverse = np.unique(cell_ids, return_inverse=True)
+            positions = []
+            for radix in reversed(radixes):
+                unique_ids, position = np.divmod(unique_ids, radix)
+                positions.insert(0, position)
+        else:
+            # The cell ids would overflow int64, so the cells are the distinct rows
+            # of the codes, in the same order
+            unique_cells, inverse = np.unique(
+                np.column_stack(codes).astype("int64"), axis=0, return_inverse=True
+            )
+            inverse = inverse.reshape(-1)
+            positions = list(unique_cells.T)
+
+        counts = np.nan_to_num(df_in[self._count_col].to_numpy("float64")[valid])
+        sums = np.bincount(inverse, weights=counts, minlength=len(positions[-1]))
+
+        df_out = pd.DataFrame(
+            {
+                column: pd.Categorical.from_codes(codes, group.categories)
+                for column, group, codes in zip(group_cols, groups, positions)
+            }
+        )
+        period_labels = utl.period_index(
+            first_ordinal, radixes[-1], resample, dates.dt.tz, date_col_datetime
+        )
+        df_out[date_col_datetime] = period_labels[positions[-1]]
+        df_out[self._count_col] = sums
+        return df_out
+
+    def _index_by_date(self, df_base: pd.DataFrame) -> pd.DataFrame:
+        """Indexes a resampled aggregate by its periods, if they are in the column
+            date_col_datetime (as when it is loaded from a CSV)
+
+        Parameters
+        ----------
+        df_base : pd.DataFrame
+            Resampled aggregate
+
+        Returns
+        -------
+        pd.DataFrame
+            df_base indexed by the datetimes of its periods
+        """
+        date_col_datetime = self._date_col + self._datetime_suffix
+        if date_col_datetime in df_base.columns:
+            df_base = df_base.set_index(
+                utl.parse_dates_cached(df_base[date_col_datetime])
+            ).drop(columns=date_col_datetime)
+        df_base.index.name = date_col_datetime
+        return df_base
+
+    def resampled_counts(self, df_base: pd.DataFrame) -> pd.Series:
+        """Series of count_col of a resampled aggregate, such as the output of
+            time_resampling
+
+        Parameters
+        ----------
+        df_base : pd.DataFrame
+            Resampled aggregate, indexed by period, or with the periods in the column
+            date_col_datetime (as when it is loaded from a CSV)
+
+        Returns
+        -------
+        pd.Series
+            count_col indexed by the datetimes of the periods
+        """
+        return self._index_by_date(df_base)[self._count_col]
+
+    def time_rollups(
+        self,
+        df_base: pd.DataFrame,
+        periods: List[str] = None,
+        base_resample: str = None,
+    ) -> pd.DataFrame:
+        """Derives coarser series from a resampled base aggregate, such as the output
+            of time_resampling, without going back to the raw data.
+            A daily base gives weekly ('W'), monthly ('M'), quarterly ('Q') and
+            yearly ('A') series.  A monthly base gives 'M', 'Q' and 'A'
+
+        Parameters
+        ----------
+        df_base : pd.DataFrame
+            Base aggregate, indexed by period, or with the periods in the column
+            date_col_datetime (as when it is loaded from a CSV)
+        periods : List[str], by default None
+            Periods of the output.  If not specified it uses 'rollup_periods', or
+            every period derivable from base_resample if 'rollup_periods' is null
+        base_resample : str, by default None
+            Resampling period of df_base.  If not specified it uses the value
+            defined in the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Long table with one row per (period type, period), with the columns
+            'resampling_period', date_col_datetime and those of df_base
+        """
+        if base_resample is None:
+            base_resample = self._resample
+        if periods is None:
+            periods = self._rollup_periods
+            if self._preproc_params["rollup_periods"] is None:
+                periods = self._derivable_rollups.get(base_resample, [])
+        self._check_rollups(periods, base_resample)
+
+        df_base = self._index_by_date(df_base)
+        rollups = {period: df_base.resample(period).sum() for period in periods}
+        return (
+            pd.concat(rollups, names=["resampling_period"])
+            .reset_index()
+            .astype({"resampling_period": "str"})
+        )
+
+    def partition_time_aggregation(
+        self, df_partition: pd.DataFrame, resample: str = None
+    ) -> pd.DataFrame:
+        """Reduces a single partition of raw data to its per-period sums of count_col.
+            Equivalent to preprocessing_time_data followed by time_resampling,
+            applied to one partition only.
+
+        Parameters
+        ----------
+        df_partition : pd.DataFrame
+            Raw data of a single partition
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Partial aggregate of the partition, indexed by period
+        """
+        df_preproc = self.preprocessing_time_data(df_partition)
+        return self.time_resampling(df_preproc, resample=resample)
+
+    def chunked_partition_aggregation(
+        self, load_func: Callable, resample: str = None, max_memory: int = None
+    ) -> pd.DataFrame:
+        """Reduces a partition to its partial aggregate within a memory budget.
+            If the memory needed to process the partition, estimated from the bytes
+            per row of its first rows, exceeds max_memory, the partition is read in
+            row chunks sized to fit and the partials of the chunks are merged.
+            The time and peak memory of every stage are logged
+
+        Parameters
+        ----------
+        load_func : Callable
+            Load function of the partition, as given by PartitionedDataSet
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+        max_memory : int, by default None
+            Memory budget in bytes.  If not specified it uses 'max_memory'
+
+        Returns
+        -------
+        pd.DataFrame
+            Partial aggregate of the partition, indexed by period
+        """
+        reader = ChunkedPartitionReader(max_memory or self._max_memory)
+        partials = []
+        with MemoryMonitor() as monitor:
+            for df_chunk in monitor.iterate("load", reader.iter_chunks(load_func)):
+                with monitor.stage("preprocessing_time_data"):
+                    df_preproc = self.preprocessing_time_data(df_chunk)
+                del df_chunk
+                with monitor.stage("time_resampling"):
+                    partials.append(self.time_resampling(df_preproc, resample=resample))
+                del df_preproc
+            with monitor.stage("merge"):
+                df_partial = self.merge_time_aggregations(partials, resample=resample)
+        return df_partial
+
+    def merge_time_aggregations(
+        self, partials: Iterable[pd.DataFrame], resample: str = None
+    ) -> pd.DataFrame:
+        """Merges partial aggregates produced by partition_time_aggregation into
+            a single resampled dataframe.  Periods present in more than one partial
+            are summed, and periods missing from every partial are filled with zeros,
+            so the output is the same as resampling the concatenated raw data.
+
+        Parameters
+        ----------
+        partials : Iterable[pd.DataFrame]
+            Partial aggregates, indexed by period
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Resampled dataframe
+        """
+        if resample is None:
+            resample = self._resample
+        partials = [df_partial for df_partial in partials if not df_partial.empty]
+        if not partials:
+            return pd.DataFrame(
+                columns=[self._count_col],
+                index=pd.DatetimeIndex([], name=self._date_col + self._datetime_suffix),
+                dtype=float,
+            )
+        df_merged = pd.concat(partials).groupby(level=0).sum()
+        return df_merged.resample(resample).sum()
+
+    def streaming_time_resampling(
+        self, pd_dict: Dict, resample: str = None, n_workers: int = None
+    ) -> pd.DataFrame:
+        """Resamples partitioned data one partition at a time.  Each partition is
+            loaded, reduced to its per-period sums and dropped before the next one is
+            loaded, so peak memory depends on the largest partition instead of on
+            the size of the whole dataset.
+            With more than one worker, partitions are fanned out to a process pool
+            and every worker returns only the partial aggregates.  Partials are
+            merged in the order of the partition names, so the output does not
+            depend on the number of workers
+
+        Parameters
+        ----------
+        pd_dict : Dict
+            Data loaded with PartitionedDataSet
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+        n_workers : int, by default None
+            Number of worker processes.  If not specified it uses the value defined
+            in the constructor.  1 processes all partitions in the current process
+
+        Returns
+        -------
+        pd.DataFrame
+            Resampled dataframe
+        """
+        load_funcs = [pd_dict[partition_name] for partition_name in sorted(pd_dict)]
+        partials = self._aggregate_partitions(load_funcs, resample, n_workers)
+        return self.merge_time_aggregations(partials, resample=resample)
+
+    def shard_time_aggregation(
+        self, pd_dict: Dict, shard: Tuple[int, int] = None, resample: str = None
+    ) -> pd.DataFrame:
+        """Partial aggregate of the partitions assigned to a shard, see
+            sharding.py.  The partitions are aggregated with the execution engine,
+            or with streaming_time_resampling when the engine is 'pandas'.
+            Merging the partials of all the shards with merge_time_aggregations
+            gives the same output as resampling all the partitions
+
+        Parameters
+        ----------
+        pd_dict : Dict
+            Data loaded with PartitionedDataSet
+        shard : Tuple[int, int], by default None
+            (i, N), the i-th of N shards.  If not specified it uses the value
+            defined in the constructor
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Partial aggregate of the shard
+        """
+        if shard is None:
+            shard = self._shard
+        if shard is None:
+            raise ValueError(
+                "'sharding' -> 'shard' must be defined as 'i/N' to aggregate a shard"
+            )
+        pd_shard = select_shard(pd_dict, *shard)
+        if not pd_shard:
+            return self.merge_time_aggregations([], resample=resample)
+        if self._execution_engine != "pandas":
+            return self.engine_time_resampling(pd_shard, resample=resample)
+        return self.streaming_time_resampling(pd_shard, resample=resample)
+
+    def get_pushdown_sql(
+        self, dialect: str, table: str, where: str = None, resample: str = None
+    ) -> str:
+        """Query that sums count_col by period in a SQL backend, equivalent to
+            preprocessing_time_data followed by time_resampling.
+            Only the months within 'date_range' are aggregated
+
+        Parameters
+        ----------
+        dialect : str
+            'sqlite', 'duckdb' or 'bigquery'
+        table : str
+            Table of the raw data
+        where : str, by default None
+            Additional SQL condition on the rows
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        str
+            Query, see sql_pushdown.period_aggregation_sql
+        """
+        return period_aggregation_sql(
+            table,
+            self._date_col,
+            self._count_col,
+            resample or self._resample,
+            dialect,
+            where=where,
+            date_range=self._date_range,
+        )
+
+    def pushdown_time_resampling(
+        self, backend: SQLBackend, resample: str = None
+    ) -> pd.DataFrame:
+        """Resamples the raw data in its SQL backend with the query of
+            get_pushdown_sql(), so only one row per period is transferred.
+            The output is the same as time_resampling, with periods without
+            observations filled with zeros
+
+        Parameters
+        ----------
+        backend : SQLBackend
+            Backend holding the raw data, e.g. loaded with SQLBackendDataSet
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Resampled dataframe
+        """
+        if resample is None:
+            resample = self._resample
+        sql = self.get_pushdown_sql(
+            backend.dialect, backend.get_table(), backend.get_where(), resample
+        )
+        return self._periods_to_resampled(backend.query(sql), resample)
+
+    def engine_time_resampling(
+        self, df_raw: pd.DataFrame, resample: str = None, engine: str = None
+    ) -> pd.DataFrame:
+        """Resamples the raw data with a Polars or DuckDB engine, see engines.py.
+            Partitions of local CSV files are scanned by the engine, reading only
+            date_col and count_col.  Other data is loaded with pandas and its
+            columns are passed to the engine.
+            The output is the same as preprocessing_time_data followed by
+            time_resampling
+
+        Parameters
+        ----------
+        df_raw : pd.DataFrame or dict of dataframes loaded from partitioned data
+            Raw data
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+        engine : str, by default None
+            'polars' or 'duckdb'.  If not specified it uses the value defined in
+            the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Resampled dataframe
+        """
+        if resample is None:
+            resample = self._resample
+        if engine is None:
+            engine = self._execution_engine
+        if engine not in ENGINES:
+            raise ValueError(
+                f""" 'engine' can only take values of {list(ENGINES)}.
+'{engine}' was given"""
+            )
+        execution_engine = ENGINES[engine](self._date_col, self._count_col)
+
+        filepaths = _local_csv_files(df_raw) if isinstance(df_raw, dict) else None
+        if filepaths:
+            df_periods = execution_engine.aggregate_csv_files(filepaths, resample)
+        else:
+            df_periods = execution_engine.aggregate_frame(
+                utl.validates_dataframe(df_raw), resample
+            )
+        return self._periods_to_resampled(df_periods, resample)
+
+    def _periods_to_resampled(
+        self, df_periods: pd.DataFrame, resample: str
+    ) -> pd.DataFrame:
+        """Converts sums by period, as returned by the SQL backends and the execution
+            engines, to the output of time_resampling
+
+        Parameters
+        ----------
+        df_periods : pd.DataFrame
+            Columns PERIOD_COLUMN (start of the period in UTC) and count_col
+        resample : str
+            Resampling period
+
+        Returns
+        -------
+        pd.DataFrame
+            Resampled dataframe, with periods without observations filled with zeros
+        """
+        periods = pd.DatetimeIndex(
+            pd.to_datetime(df_periods[PERIOD_COLUMN].astype(str)),
+            name=self._date_col + self._datetime_suffix,
+        ).tz_localize("UTC")
+        df_partial = pd.DataFrame(
+            {self._count_col: df_periods[self._count_col].astype("float64").to_numpy()},
+            index=periods,
+        )
+        return self.merge_time_aggregations([df_partial], resample=resample)
+
+    def record_batch_time_resampling(
+        self, source: RecordBatchSource, resample: str = None
+    ) -> pd.DataFrame:
+        """Resamples records streamed as Arrow record batches, e.g. loaded with
+            ArrowRecordBatchDataSet.  Only the columns returned by
+            get_required_columns() are read.  Every batch is converted to pandas with
+            strings as categoricals, so each distinct date is a single object, reduced
+            to its per-period sums and merged into the running aggregate before the
+            next batch is read.  Memory depends on the size of a batch, not on the
+            number of records.  The time and peak memory of every stage are logged
+
+        Parameters
+        ----------
+        source : RecordBatchSource
+            Source of the raw records
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Resampled dataframe
+        """
+        columns = list(self.get_required_columns())
+        partials = []
+        with MemoryMonitor() as monitor:
+            batches = source.iter_batches(columns=columns)
+            if self._prefetch_depth > 0:
+                batches = Prefetcher(batches, self._prefetch_depth, name="batches")
+            for batch in monitor.iterate("load", batches):
+                with monitor.stage("to_pandas"):
+                    df_batch = batch.to_pandas(strings_to_categorical=True)
+                del batch
+                with monitor.stage("preprocessing_time_data"):
+                    df_preproc = self.preprocessing_time_data(df_batch)
+                del df_batch
+                with monitor.stage("time_resampling"):
+                    partials.append(self.time_resampling(df_preproc, resample=resample))
+                del df_preproc
+                with monitor.stage("merge"):
+                    partials = [self.merge_time_aggregations(partials, resample)]
+        return self.merge_time_aggregations(partials, resample=resample)
+
+    def incremental_time_resampling(
+        self,
+        pd_dict: Dict,
+        store_path: str = None,
+        resample: str = None,
+        n_workers: int = None,
+    ) -> pd.DataFrame:
+        """Resamples partitioned data reusing the partial aggregates of previous runs.
+            A manifest in store_path keeps the fingerprint of every processed
+            partition (file size and modification time, generation or etag, or a hash
+            of the contents if the partition is not a file) and its partial aggregate.
+            Only new or changed partitions are aggregated, and partials of partitions
+            which are no longer in pd_dict are retracted.
+            Every partial is committed to the manifest as soon as it is computed, so
+            a run which is interrupted resumes from the partitions already aggregated
+
+        Parameters
+        ----------
+        pd_dict : Dict
+            Data loaded with PartitionedDataSet
+        store_path : str, by default None
+            Folder of the partial aggregates and manifest.  If not specified it uses
+            the value defined in the constructor
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+        n_workers : int, by default None
+            Number of worker processes used for the new or changed partitions.
+            If not specified it uses the value defined in the constructor
+
+        Returns
+        -------
+        pd.DataFrame
+            Resampled dataframe
+        """
+        store = PartialAggregateStore(
+            store_path or self._incremental_path, self.get_parameters_key(resample)
+        )
+        for partition_name in set(store.names()) - set(pd_dict):
+            store.remove(partition_name)
+        store.save_manifest()
+
+        pending = {}
+        for partition_name in sorted(pd_dict):
+            load_func = pd_dict[partition_name]
+            fingerprint = utl.partition_fingerprint(load_func)
+            if fingerprint is not None:
+                if not store.is_current(partition_name, fingerprint):
+                    pending[partition_name] = fingerprint
+                continue
+            df_partition = load_func()
+            fingerprint = utl.content_fingerprint(df_partition)
+            if not store.is_current(partition_name, fingerprint):
+                df_partial = self.partition_time_aggregation(df_partition, resample)
+                store.save_partial(partition_name, fingerprint, df_partial)
+                store.save_manifest()
+
+        partials = self._aggregate_partitions(
+            [pd_dict[partition_name] for partition_name in pending], resample, n_workers
+        )
+        for (partition_name, fingerprint), df_partial in zip(pending.items(), partials):
+            store.save_partial(partition_name, fingerprint, df_partial)
+            store.save_manifest()
+
+        return self.merge_time_aggregations(
+            [store.load_partial(partition_name) for partition_name in store.names()],
+            resample=resample,
+        )
+
+    def _aggregate_partitions(
+        self, load_funcs: List[Callable], resample: str = None, n_workers: int = None
+    ) -> Iterator[pd.DataFrame]:
+        """Loads every partition and reduces it to its partial aggregate, in the
+            current process or in a process pool.  Partials are yielded as soon as
+            they, and the ones before them, are ready.
+            In the current process, and without 'max_memory', up to 'prefetch_depth'
+            partitions are loaded by a background thread while the current one is
+            aggregated
+
+        Parameters
+        ----------
+        load_funcs : List[Callable]
+            Load functions of the partitions, as given by PartitionedDataSet
+        resample : str, by default None
+            Resampling period.  If not specified it uses the value defined in the constructor
+        n_workers : int, by default None
+            Number of worker processes.  If not specified it uses the value defined
+            in the constructor
+
+        Yields
+        ------
+        pd.DataFrame
+            Partial aggregates, in the order of load_funcs.
+            If 'max_memory' is defined, it is split evenly between the workers
+        """
+        if n_workers is None:
+            n_workers = self._n_workers
+        max_memory = None
+        if self._max_memory is not None:
+            max_memory = self._max_memory // max(1, min(n_workers, len(load_funcs)))
+        aggregate = partial(
+            _aggregate_partition, self, resample=resample, max_memory=max_memory
+        )
+
+        if n_workers > 1 and len(load_funcs) > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                yield from executor.map(
+                    aggregate, load_funcs, chunksize=self._chunksize
+                )
+            return
+        if self._prefetch_depth > 0 and max_memory is None and len(load_funcs) > 1:
+            # The next partitions are loaded while the current one is aggregated
+            load_funcs = Prefetcher(
+                (load_func() for load_func in load_funcs),
+                self._prefetch_depth,
+                name="partitions",
+            )
+        for load_func in load_funcs:
+            yield aggregate(load_func)
+
+
+def _aggregate_partition(
+    prep: Preprocessing,
+    load_func: Callable,
+    resample: str = None,
+    max_memory: int = None,
+) -> pd.DataFrame:
+    """Loads a partition and reduces it to its partial aggregate.
+        Defined at module level so it can be sent to worker processes
+
+    Parameters
+    ----------
+    prep : Preprocessing
+        Instance holding the preprocessing parameters
+    load_func : Callable or pd.DataFrame
+        Load function of the partition, as given by PartitionedDataSet, or the
+        partition already loaded
+    resample : str, by default None
+        Resampling period.  If not specified it uses the value defined in prep
+    max_memory : int, by default None
+        Memory budget of the partition, in bytes.  If specified, the partition is
+        read in chunks if needed
+
+    Returns
+    -------
+    pd.DataFrame
+        Partial aggregate of the partition
+    """
+    if max_memory is not None:
+        return prep.chunked_partition_aggregation(load_func, resample, max_memory)
+    df_partition = load_func() if callable(load_func) else load_func
+    return prep.partition_time_aggregation(df_partition, resample=resample)
+
+
+def _local_csv_files(pd_dict: Dict) -> Optional[List[str]]:
+    """Files of partitioned data when all the partitions are local CSV files
+        separated by commas, which the execution engines can scan directly
+
+    Parameters
+    ----------
+    pd_dict : Dict
+        Data loaded with PartitionedDataSet
+
+    Returns
+    -------
+    Optional[List[str]]
+        Paths of the partitions, in the order of their names.
+        None if some partition is not a local CSV file
+    """
+    filepaths = []
+    for partition_name in sorted(pd_dict):
+        source = utl.partition_source(pd_dict[partition_name])
+        if source is None:
+            return None
+        file_system, filepath, load_args = source
+        protocol = file_system.protocol
+        protocol = protocol[0] if isinstance(protocol, (list, tuple)) else protocol
+        if protocol not in ("file", "local") or not filepath.endswith(".csv"):
+            return None
+        if load_args.get("sep", load_args.get("delimiter", ",")) != ",":
+            return None
+        filepaths.append(filepath)
+    return filepaths or None
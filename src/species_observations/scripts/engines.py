@@ -0,0 +1,214 @@
+"""Defines the execution engines of Preprocessing.engine_time_resampling, which sum
+    individual counts by day or month with multi-threaded engines instead of pandas:
+        polars: lazy query, scanning CSV files directly when the raw data are local
+        CSV partitions, so only the two needed columns are materialised
+        duckdb: the query of sql_pushdown.period_aggregation_sql, over the CSV
+        files or over a registered dataframe
+    pandas is the reference engine, implemented by Preprocessing itself
+    (preprocessing_time_data followed by time_resampling).
+    Event dates given as text are read as in sql_pushdown: the first 19 characters
+    are the UTC time ('2021-09-01 00:00:00 UTC').  Rows without a valid date are
+    dropped and missing counts are 0, as in the pandas engine.
+    polars and duckdb are optional dependencies, imported when an engine is created
+    """
+# pylint: disable=import-outside-toplevel
+from typing import List
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype as is_datetime
+
+from species_observations.scripts.sql_pushdown import (
+    PERIOD_COLUMN,
+    period_aggregation_sql,
+)
+
+
+class ExecutionEngine:
+    """Sums count_col by period of date_col.  Outputs have the columns PERIOD_COLUMN
+    (start of the period, without time zone) and count_col, and only the periods
+    with observations"""
+
+    name: str = None
+
+    def __init__(self, date_col: str, count_col: str):
+        """Defines the columns of the raw data.
+
+        Parameters
+        ----------
+        date_col : str
+            Column of the event date
+        count_col : str
+            Column of the individual count
+        """
+        self._date_col = date_col
+        self._count_col = count_col
+
+    def _frame_columns(self, df_in: pd.DataFrame) -> pd.DataFrame:
+        """Date and count columns of df_in.  Datetimes with time zone are converted
+            to UTC without time zone, as the engines work in UTC
+
+        Parameters
+        ----------
+        df_in : pd.DataFrame
+            Raw data
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns date_col and count_col
+        """
+        df_columns = df_in[[self._date_col, self._count_col]]
+        dates = df_columns[self._date_col]
+        if is_datetime(dates) and dates.dt.tz is not None:
+            df_columns = df_columns.assign(
+                **{self._date_col: dates.dt.tz_convert("UTC").dt.tz_localize(None)}
+            )
+        return df_columns
+
+    def aggregate_frame(self, df_in: pd.DataFrame, resample: str) -> pd.DataFrame:
+        """Sums the counts of a dataframe by period
+
+        Parameters
+        ----------
+        df_in : pd.DataFrame
+            Raw data
+        resample : str
+            'D' for days, 'M' for months
+
+        Returns
+        -------
+        pd.DataFrame
+            Sums by period
+        """
+        raise NotImplementedError
+
+    def aggregate_csv_files(self, filepaths: List[str], resample: str) -> pd.DataFrame:
+        """Sums the counts of local CSV files with a header, reading only the date
+            and count columns
+
+        Parameters
+        ----------
+        filepaths : List[str]
+            Files of the raw data
+        resample : str
+            'D' for days, 'M' for months
+
+        Returns
+        -------
+        pd.DataFrame
+            Sums by period
+        """
+        raise NotImplementedError
+
+
+class PolarsEngine(ExecutionEngine):
+    """Lazy Polars query.  Needs the package polars"""
+
+    name = "polars"
+
+    def __init__(self, date_col: str, count_col: str):
+        super().__init__(date_col, count_col)
+        import polars
+
+        self._pl = polars
+
+    def _aggregate(self, lazy_frame, resample: str) -> pd.DataFrame:
+        """Adds the period aggregation to a lazy query and runs it
+
+        Parameters
+        ----------
+        lazy_frame : polars.LazyFrame
+            Query with the columns date_col and count_col
+        resample : str
+            'D' for days, 'M' for months
+
+        Returns
+        -------
+        pd.DataFrame
+            Sums by period
+        """
+        pl = self._pl
+        dates = pl.col(self._date_col)
+        if lazy_frame.collect_schema()[self._date_col] == pl.Utf8:
+            dates = dates.str.slice(0, 19).str.strptime(
+                pl.Datetime("us"), "%Y-%m-%d %H:%M:%S", strict=False
+            )
+        every = {"D": "1d", "M": "1mo"}[resample]
+        return (
+            lazy_frame.select(
+                dates.dt.truncate(every).alias(PERIOD_COLUMN),
+                pl.col(self._count_col).cast(pl.Float64).fill_null(0),
+            )
+            .drop_nulls(PERIOD_COLUMN)
+            .group_by(PERIOD_COLUMN)
+            .agg(pl.col(self._count_col).sum())
+            .sort(PERIOD_COLUMN)
+            .collect()
+            .to_pandas()
+        )
+
+    def aggregate_frame(self, df_in: pd.DataFrame, resample: str) -> pd.DataFrame:
+        lazy_frame = self._pl.from_pandas(self._frame_columns(df_in)).lazy()
+        return self._aggregate(lazy_frame, resample)
+
+    def aggregate_csv_files(self, filepaths: List[str], resample: str) -> pd.DataFrame:
+        pl = self._pl
+        lazy_frame = pl.scan_csv(
+            filepaths,
+            schema_overrides={self._date_col: pl.Utf8, self._count_col: pl.Float64},
+        )
+        return self._aggregate(lazy_frame, resample)
+
+
+class DuckDBEngine(ExecutionEngine):
+    """DuckDB query generated by sql_pushdown.period_aggregation_sql, in an in-memory
+    database.  Needs the package duckdb"""
+
+    name = "duckdb"
+
+    def __init__(self, date_col: str, count_col: str):
+        super().__init__(date_col, count_col)
+        import duckdb
+
+        self._duckdb = duckdb
+
+    def _query(self, table: str, resample: str, df_in: pd.DataFrame = None):
+        """Runs the period aggregation over table
+
+        Parameters
+        ----------
+        table : str
+            Table, or table function, of the raw data
+        resample : str
+            'D' for days, 'M' for months
+        df_in : pd.DataFrame, optional
+            Dataframe registered as table, by default None
+
+        Returns
+        -------
+        pd.DataFrame
+            Sums by period
+        """
+        sql = period_aggregation_sql(
+            table, self._date_col, self._count_col, resample, "duckdb"
+        )
+        connection = self._duckdb.connect(":memory:")
+        try:
+            if df_in is not None:
+                connection.register(table, df_in)
+            return connection.execute(sql).df()
+        finally:
+            connection.close()
+
+    def aggregate_frame(self, df_in: pd.DataFrame, resample: str) -> pd.DataFrame:
+        return self._query("raw_data", resample, self._frame_columns(df_in))
+
+    def aggregate_csv_files(self, filepaths: List[str], resample: str) -> pd.DataFrame:
+        paths_sql = ", ".join(
+            "'" + filepath.replace("'", "''") + "'" for filepath in filepaths
+        )
+        table = f"read_csv([{paths_sql}], header=true, all_varchar=true)"
+        return self._query(table, resample)
+
+
+ENGINES = {"polars": PolarsEngine, "duckdb": DuckDBEngine}
@@ -0,0 +1,137 @@
+"""Measures the imports of a python command with `python -X importtime`, to keep
+    the startup of the package and of its commands cheap.  Only the standard library
+    is used, so measuring does not change what is imported
+    """
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Modules that the commands which only need configuration should not import
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "kedro_datasets"]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Reads the records written by `python -X importtime`
+
+    Parameters
+    ----------
+    stderr : str
+        Standard error of the command
+
+    Returns
+    -------
+    List[Dict]
+        'module', 'self_us', 'cumulative_us' and 'depth' (0 for the modules imported
+        directly by the command) of every import, in the order they finished
+    """
+    records = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        records.append(
+            {
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": (len(match.group(3)) - 1) // 2,
+            }
+        )
+    return records
+
+
+def measure_command(
+    args: List[str], repeats: int = 1, cwd: Optional[str] = None
+) -> Dict:
+    """Runs `python -X importtime *args` in a new interpreter and measures it.
+        The package folder is added to PYTHONPATH, so the command runs the package
+        of this file also when it is not installed
+
+    Parameters
+    ----------
+    args : List[str]
+        Arguments of python, e.g. ['-c', 'import species_observations']
+    repeats : int, optional
+        Number of runs.  The fastest one is kept, by default 1
+    cwd : Optional[str], optional
+        Folder where the command runs, by default the current folder
+
+    Returns
+    -------
+    Dict
+        'wall_seconds' of the command, 'import_seconds' (cumulative time of the
+        imports done by the command and interpreter startup), 'returncode', and
+        the import 'records' as given by parse_importtime()
+    """
+    env = dict(os.environ)
+    src_folder = str(Path(__file__).resolve().parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in [src_folder, env.get("PYTHONPATH")] if path
+    )
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", *args],
+            capture_output=True,
+            text=True,
+            cwd=cwd,
+            env=env,
+            check=False,
+        )
+        wall_seconds = time.perf_counter() - start
+        if best is None or wall_seconds < best["wall_seconds"]:
+            records = parse_importtime(completed.stderr)
+            best = {
+                "wall_seconds": wall_seconds,
+                "import_seconds": sum(
+                    record["cumulative_us"]
+                    for record in records
+                    if record["depth"] == 0
+                )
+                / 1e6,
+                "returncode": completed.returncode,
+                "records": records,
+            }
+    return best
+
+
+def heavy_modules_imported(records: List[Dict]) -> List[str]:
+    """Modules of HEAVY_MODULES, or their submodules, found in the import records
+
+    Parameters
+    ----------
+    records : List[Dict]
+        Import records
+
+    Returns
+    -------
+    List[str]
+        Top level names of the heavy modules imported
+    """
+    top_level = {record["module"].split(".")[0] for record in records}
+    return [module for module in HEAVY_MODULES if module in top_level]
+
+
+def slowest_imports(records: List[Dict], top: int = 15) -> List[Dict]:
+    """Imports with the largest cumulative time
+
+    Parameters
+    ----------
+    records : List[Dict]
+        Import records
+    top : int, optional
+        Number of imports returned, by default 15
+
+    Returns
+    -------
+    List[Dict]
+        Records, by decreasing cumulative time
+    """
+    return sorted(records, key=lambda record: -record["cumulative_us"])[:top]
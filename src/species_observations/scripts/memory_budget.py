@@ -0,0 +1,406 @@
+"""Defines ChunkedPartitionReader() class, which reads partitions that would not fit
+    in a memory budget in row chunks, and MemoryMonitor() class, which measures the
+    peak memory of the stages of the preprocessing"""
+import logging
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import species_observations.utils as utl
+
+logger = logging.getLogger(__name__)
+
+# Memory used while a chunk is preprocessed and resampled, relative to the memory of
+# the loaded chunk (parsed dates, masks and the copies made by pandas)
+WORKING_SET_FACTOR = 4
+# Rows read to measure the bytes per row of a partition
+SAMPLE_ROWS = 1000
+# Smallest chunk, so the overhead per chunk stays small whatever the budget
+MIN_CHUNK_ROWS = 1000
+# Load arguments of CSV partitions which pandas.read_csv does not take when a
+# partition is read in chunks (those of ArrowCSVDataSet's pyarrow reader)
+_NOT_READ_CSV_ARGS = ["chunksize", "block_size", "use_threads"]
+
+_UNITS = {"": 1, "B": 1, "KB": 10**3, "MB": 10**6, "GB": 10**9, "TB": 10**12}
+_UNITS.update({"KIB": 2**10, "MIB": 2**20, "GIB": 2**30, "TIB": 2**40})
+
+
+def parse_memory_size(value: Union[int, float, str, None]) -> Optional[int]:
+    """Converts a memory size to bytes
+
+    Parameters
+    ----------
+    value : Union[int, float, str, None]
+        Bytes, or a number with a unit, e.g. '512MB', '2 GiB'
+
+    Returns
+    -------
+    Optional[int]
+        Bytes, or None if value is None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([A-Za-z]*)\s*", str(value))
+    if match is None or match.group(2).upper() not in _UNITS:
+        raise ValueError(
+            f"""Memory size {value} not valid.
+            Use bytes or a number followed by one of {list(_UNITS)[1:]}"""
+        )
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of the current process
+
+    Returns
+    -------
+    Optional[int]
+        Bytes, or None where /proc is not available
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryMonitor:
+    """Measures the peak resident memory of named stages, sampling it from a
+    background thread, and optionally their peak traced allocations with
+    tracemalloc.  A stage run several times (e.g. once per chunk) reports its
+    largest peak and its total time.
+
+    Example:
+        with MemoryMonitor() as monitor:
+            with monitor.stage("load"):
+                ...
+        monitor.report()
+    """
+
+    def __init__(self, interval: float = 0.01, trace: bool = False):
+        """Creates a monitor.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between RSS samples, by default 0.01
+        trace : bool, optional
+            If True, also measures the peak allocations of every stage with
+            tracemalloc, which slows the stages down.  By default False
+        """
+        self._interval = interval
+        self._trace = trace
+        self._stage = None
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def __enter__(self) -> "MemoryMonitor":
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        if self._trace:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._sampler.join()
+        if self._trace:
+            tracemalloc.stop()
+        for name, stage in self.report().items():
+            logger.info(
+                "Stage %s: %.3f s, peak RSS %s MB, peak traced %s MB",
+                name,
+                stage["seconds"],
+                _megabytes(stage["peak_rss_bytes"]),
+                _megabytes(stage["peak_traced_bytes"]),
+            )
+
+    def _sample(self):
+        """Keeps the largest RSS seen during the current stage"""
+        while not self._stop.wait(self._interval):
+            self._record_rss()
+
+    def _record_rss(self):
+        rss = current_rss()
+        with self._lock:
+            if self._stage is not None and rss is not None:
+                stage = self._stages[self._stage]
+                stage["peak_rss_bytes"] = max(stage["peak_rss_bytes"] or 0, rss)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measures the code run within the context as stage name
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage
+        """
+        with self._lock:
+            self._stages.setdefault(
+                name,
+                {"seconds": 0.0, "peak_rss_bytes": None, "peak_traced_bytes": None},
+            )
+            previous_stage, self._stage = self._stage, name
+        if self._trace:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_rss()
+            stage = self._stages[name]
+            stage["seconds"] += time.perf_counter() - start
+            if self._trace:
+                traced = tracemalloc.get_traced_memory()[1]
+                stage["peak_traced_bytes"] = max(
+                    stage["peak_traced_bytes"] or 0, traced
+                )
+            with self._lock:
+                self._stage = previous_stage
+
+    def iterate(self, name: str, iterable) -> Iterator:
+        """Measures the production of every item of iterable as stage name
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage
+        iterable : Iterable
+            Items, e.g. chunks read lazily
+
+        Yields
+        ------
+        Any
+            Items of iterable
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                item = next(iterator, StopIteration)
+            if item is StopIteration:
+                return
+            yield item
+
+    def report(self) -> Dict[str, Dict]:
+        """Measurements of every stage
+
+        Returns
+        -------
+        Dict[str, Dict]
+            'seconds', 'peak_rss_bytes' and 'peak_traced_bytes' (None if not
+            measured) of every stage, in order of first use
+        """
+        with self._lock:
+            return {name: dict(stage) for name, stage in self._stages.items()}
+
+
+def _megabytes(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / 2**20:.1f}"
+
+
+class ChunkedPartitionReader:
+    """Reads a partition given by PartitionedDataSet whole if its estimated memory
+    fits in max_memory, or in row chunks sized to fit otherwise.
+    The bytes per row in memory and in the file are measured on the first rows
+    of the partition, read with its load_args.  CSV and Parquet files are chunked;
+    other partitions are always read whole"""
+
+    def __init__(
+        self,
+        max_memory: int,
+        working_set_factor: float = WORKING_SET_FACTOR,
+        sample_rows: int = SAMPLE_ROWS,
+    ):
+        """Creates a reader.
+
+        Parameters
+        ----------
+        max_memory : int
+            Memory budget of a partition, or chunk, and its processing, in bytes
+        working_set_factor : float, optional
+            Memory used while processing a chunk relative to the loaded chunk
+        sample_rows : int, optional
+            Rows read to measure the bytes per row
+        """
+        self._max_memory = max_memory
+        self._working_set_factor = working_set_factor
+        self._sample_rows = sample_rows
+
+    def estimate(self, load_func: Callable) -> Optional[Dict]:
+        """Estimates the memory needed to process a partition
+
+        Parameters
+        ----------
+        load_func : Callable
+            Load function of the partition, as given by PartitionedDataSet
+
+        Returns
+        -------
+        Optional[Dict]
+            'rows', 'memory_bytes_per_row', 'processing_bytes' and 'chunk_rows'
+            (None if the partition fits in max_memory).
+            None if the partition is not a CSV or Parquet file, or is read with filters
+        """
+        source = utl.partition_source(load_func)
+        file_format = None if source is None else _file_format(source[1])
+        if file_format is None:
+            return None
+        file_system, filepath, load_args = source
+        if "filters" in load_args:
+            return None
+
+        if file_format == "csv":
+            rows, df_sample = self._csv_rows(file_system, filepath, load_args)
+        else:
+            with file_system.open(filepath, "rb") as file:
+                parquet_file = pq.ParquetFile(file)
+                rows = parquet_file.metadata.num_rows
+                df_sample = next(
+                    parquet_file.iter_batches(
+                        batch_size=self._sample_rows, columns=load_args.get("columns")
+                    ),
+                    None,
+                )
+                df_sample = None if df_sample is None else df_sample.to_pandas()
+        if df_sample is None or df_sample.empty:
+            return None
+
+        memory_bytes_per_row = df_sample.memory_usage(deep=True).sum() / len(df_sample)
+        processing_bytes = rows * memory_bytes_per_row * self._working_set_factor
+        chunk_rows = None
+        if processing_bytes > self._max_memory:
+            chunk_rows = max(
+                MIN_CHUNK_ROWS,
+                int(
+                    self._max_memory / (memory_bytes_per_row * self._working_set_factor)
+                ),
+            )
+        return {
+            "rows": rows,
+            "memory_bytes_per_row": memory_bytes_per_row,
+            "processing_bytes": processing_bytes,
+            "chunk_rows": chunk_rows,
+        }
+
+    def _csv_rows(
+        self, file_system, filepath: str, load_args: Dict
+    ) -> Tuple[int, pd.DataFrame]:
+        """Estimated rows of a CSV file from the bytes per row of its first lines,
+            and the first rows read with load_args
+
+        Parameters
+        ----------
+        file_system : fsspec.AbstractFileSystem
+            Filesystem of the file
+        filepath : str
+            Path of the file
+        load_args : Dict
+            Load arguments of the partition
+
+        Returns
+        -------
+        Tuple[int, pd.DataFrame]
+            Estimated number of rows, and the first rows
+        """
+        file_bytes = file_system.size(filepath)
+        with file_system.open(filepath, "rb") as file:
+            header = file.readline()
+            sample_lines = [file.readline() for _ in range(self._sample_rows)]
+        sample_lines = [line for line in sample_lines if line]
+        if not sample_lines:
+            return 0, None
+        file_bytes_per_row = sum(len(line) for line in sample_lines) / len(sample_lines)
+        rows = int((file_bytes - len(header)) / file_bytes_per_row)
+
+        with file_system.open(filepath, "rb") as file:
+            df_sample = pd.read_csv(
+                file, nrows=self._sample_rows, **_read_csv_args(load_args)
+            )
+        return rows, df_sample
+
+    def iter_chunks(self, load_func: Callable) -> Iterator[pd.DataFrame]:
+        """Reads a partition whole or in chunks, as needed to fit in max_memory
+
+        Parameters
+        ----------
+        load_func : Callable
+            Load function of the partition, as given by PartitionedDataSet
+
+        Yields
+        ------
+        pd.DataFrame
+            The whole partition, or its chunks in order
+        """
+        estimate = self.estimate(load_func)
+        if estimate is None or estimate["chunk_rows"] is None:
+            yield load_func()
+            return
+
+        file_system, filepath, load_args = utl.partition_source(load_func)
+        logger.info(
+            "Reading %s in chunks of %d rows: about %d rows needing %.0f MB, "
+            "above the budget of %.0f MB",
+            filepath,
+            estimate["chunk_rows"],
+            estimate["rows"],
+            estimate["processing_bytes"] / 2**20,
+            self._max_memory / 2**20,
+        )
+        with file_system.open(filepath, "rb") as file:
+            if _file_format(filepath) == "csv":
+                yield from pd.read_csv(
+                    file, chunksize=estimate["chunk_rows"], **_read_csv_args(load_args)
+                )
+            else:
+                for batch in pq.ParquetFile(file).iter_batches(
+                    batch_size=estimate["chunk_rows"], columns=load_args.get("columns")
+                ):
+                    yield batch.to_pandas()
+
+
+def _read_csv_args(load_args: Dict) -> Dict:
+    """Load arguments of a CSV partition passed to pandas.read_csv
+
+    Parameters
+    ----------
+    load_args : Dict
+        Load arguments of the partition
+
+    Returns
+    -------
+    Dict
+        load_args without those in _NOT_READ_CSV_ARGS
+    """
+    return {
+        key: value for key, value in load_args.items() if key not in _NOT_READ_CSV_ARGS
+    }
+
+
+def _file_format(filepath: str) -> Optional[str]:
+    """Format of a partition file that can be read in chunks
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the file
+
+    Returns
+    -------
+    Optional[str]
+        'csv' or 'parquet', or None for other files
+    """
+    suffix = os.path.splitext(filepath)[1].lower()
+    return {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}.get(suffix)
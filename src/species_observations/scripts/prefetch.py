@@ -0,0 +1,148 @@
+"""Defines Prefetcher() class, which reads the items of an iterator (partitions,
+    record batches) in a background thread while the previous items are processed,
+    so I/O overlaps parsing and aggregation.
+    The items read ahead wait in a queue of at most 'depth' items: when processing is
+    slower than I/O the reader blocks, which caps the memory at depth + 2 items
+    (queued, being read and being processed).
+    The time each side spends blocked on the other is measured:
+        load_stall_seconds: the reader waits for space in the queue (processing
+        is the bottleneck)
+        process_stall_seconds: processing waits for an item (I/O is the bottleneck)
+    """
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Items read ahead of the one being processed
+PREFETCH_DEPTH = 2
+# Interval at which a blocked reader checks if the consumer stopped, in seconds
+_POLL_SECONDS = 0.1
+
+_END = object()
+
+
+class Prefetcher:
+    """Iterates over the items of an iterable read ahead by a background thread.
+    Items are yielded in order, and errors of the reader are raised by the
+    iteration.  If the iteration stops early, the reader stops too"""
+
+    def __init__(self, items: Iterable, depth: int = PREFETCH_DEPTH, name: str = ""):
+        """Creates a prefetcher over items.  Nothing is read until it is iterated
+
+        Parameters
+        ----------
+        items : Iterable
+            Items to read, e.g. a generator calling the load functions of
+            PartitionedDataSet
+        depth : int, optional
+            Maximum items read ahead, by default PREFETCH_DEPTH
+        name : str, optional
+            Name of the logged stats, by default ''
+        """
+        if depth < 1:
+            raise ValueError(f"depth must be at least 1. {depth} was given")
+        self._items = items
+        self._depth = depth
+        self._name = name
+        self._stats = {
+            "items": 0,
+            "load_seconds": 0.0,
+            "load_stall_seconds": 0.0,
+            "process_seconds": 0.0,
+            "process_stall_seconds": 0.0,
+        }
+
+    def get_depth(self) -> int:
+        """Allows access to the contents of protected attribute _depth
+
+        Returns
+        -------
+        int
+            Contents of _depth
+        """
+        return self._depth
+
+    def stats(self) -> Dict:
+        """Times of the last iteration
+
+        Returns
+        -------
+        Dict
+            'items', and the seconds spent reading ('load_seconds'), processing
+            ('process_seconds') and blocked on the other side
+            ('load_stall_seconds', 'process_stall_seconds')
+        """
+        return dict(self._stats)
+
+    def _read(self, buffer: queue.Queue, stop: threading.Event):
+        """Reads the items into buffer, until they end or stop is set
+
+        Parameters
+        ----------
+        buffer : queue.Queue
+            Queue of the items read ahead
+        stop : threading.Event
+            Set when the iteration stops
+        """
+        iterator = iter(self._items)
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                item = _END
+            except BaseException as exc:  # pylint: disable=broad-exception-caught
+                item = exc
+            self._stats["load_seconds"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    buffer.put((item,), timeout=_POLL_SECONDS)
+                    break
+                except queue.Full:
+                    pass
+            self._stats["load_stall_seconds"] += time.perf_counter() - start
+            if item is _END or isinstance(item, BaseException):
+                return
+
+    def __iter__(self) -> Iterator:
+        for key in self._stats:
+            self._stats[key] = 0 if key == "items" else 0.0
+        buffer = queue.Queue(maxsize=self._depth)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._read, args=(buffer, stop), name="prefetch", daemon=True
+        )
+        reader.start()
+        try:
+            while True:
+                start = time.perf_counter()
+                (item,) = buffer.get()
+                self._stats["process_stall_seconds"] += time.perf_counter() - start
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                self._stats["items"] += 1
+                start = time.perf_counter()
+                yield item
+                self._stats["process_seconds"] += time.perf_counter() - start
+        finally:
+            stop.set()
+            reader.join()
+            logger.info(
+                "Prefetch %s: %d items, depth %d. load %.2fs (stalled %.2fs), "
+                "process %.2fs (stalled %.2fs)",
+                self._name,
+                self._stats["items"],
+                self._depth,
+                self._stats["load_seconds"],
+                self._stats["load_stall_seconds"],
+                self._stats["process_seconds"],
+                self._stats["process_stall_seconds"],
+            )
@@ -0,0 +1,281 @@
+"""Defines the sources of ArrowRecordBatchDataSet, which stream occurrence records as
+    Arrow record batches instead of building a dataframe row by row:
+        LocalArrowBackend reads Arrow IPC or Parquet files, and stands in for
+        BigQueryStorageBackend in tests and local runs
+        BigQueryStorageBackend reads a BigQuery table, or the result of a query,
+        with the BigQuery Storage Read API
+    Batches are read one at a time and only the requested columns are read, so
+    memory depends on the size of a batch and not on the number of rows
+    """
+# pylint: disable=import-outside-toplevel
+import os
+from typing import Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as pds
+
+# Rows of the batches read from local files
+BATCH_SIZE = 65536
+
+_FILE_FORMATS = {
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+    ".feather": "ipc",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+
+class RecordBatchSource:
+    """Source of Arrow record batches, loaded by ArrowRecordBatchDataSet.
+    Every iteration reads the source again from the start"""
+
+    def iter_batches(self, columns: List[str] = None) -> Iterator[pa.RecordBatch]:
+        """Reads the records in batches
+
+        Parameters
+        ----------
+        columns : List[str], optional
+            Columns to read, by default None (all the columns)
+
+        Yields
+        ------
+        pa.RecordBatch
+            Batches of records, in order
+        """
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[pa.RecordBatch]:
+        return self.iter_batches()
+
+    def describe(self) -> Dict:
+        """Parameters of the source, without credentials
+
+        Returns
+        -------
+        Dict
+            Parameters of the source
+        """
+        raise NotImplementedError
+
+
+class LocalArrowBackend(RecordBatchSource):
+    """Reads Arrow IPC (.arrow, .ipc, .feather) or Parquet (.parquet, .pq) files,
+    from a single file or from every file of a folder, in batches of at most
+    batch_size rows"""
+
+    def __init__(
+        self, path: str, file_format: str = None, batch_size: int = BATCH_SIZE
+    ):
+        """Creates a source over the files of path.
+
+        Parameters
+        ----------
+        path : str
+            File, or folder of files with the same columns
+        file_format : str, optional
+            'ipc' or 'parquet'.  If not specified, it is inferred from the extension
+            of the files
+        batch_size : int, optional
+            Maximum rows of a batch, by default BATCH_SIZE
+        """
+        self._path = str(path)
+        self._batch_size = batch_size
+        self._file_format = file_format or _infer_file_format(self._path)
+        if self._file_format not in set(_FILE_FORMATS.values()):
+            raise ValueError(
+                f"""file_format {self._file_format} not valid.
+                Valid values are {sorted(set(_FILE_FORMATS.values()))}"""
+            )
+
+    def _dataset(self) -> pds.Dataset:
+        return pds.dataset(self._path, format=self._file_format)
+
+    def get_schema(self) -> pa.Schema:
+        """Schema of the files, read from their metadata
+
+        Returns
+        -------
+        pa.Schema
+            Columns and types of the records
+        """
+        return self._dataset().schema
+
+    def iter_batches(self, columns: List[str] = None) -> Iterator[pa.RecordBatch]:
+        """Reads the files in order, in batches of at most batch_size rows
+
+        Parameters
+        ----------
+        columns : List[str], optional
+            Columns to read, by default None (all the columns)
+
+        Yields
+        ------
+        pa.RecordBatch
+            Batches of records
+        """
+        for batch in self._dataset().to_batches(
+            columns=columns, batch_size=self._batch_size, use_threads=False
+        ):
+            # IPC files keep the batches they were written with
+            for offset in range(0, batch.num_rows, self._batch_size):
+                yield batch.slice(offset, self._batch_size)
+
+    def describe(self) -> Dict:
+        return {
+            "backend": "local",
+            "path": self._path,
+            "file_format": self._file_format,
+            "batch_size": self._batch_size,
+        }
+
+
+class BigQueryStorageBackend(RecordBatchSource):
+    """Reads a BigQuery table, or the result of a query, with the BigQuery Storage
+    Read API in Arrow format.  Columns and row_restriction are applied by BigQuery,
+    so only the selected data is transferred.
+    Needs the packages google-cloud-bigquery and google-cloud-bigquery-storage"""
+
+    def __init__(
+        self,
+        table: str = None,
+        query: str = None,
+        project: str = None,
+        row_restriction: str = None,
+        max_stream_count: int = 1,
+        credentials: Dict = None,
+    ):  # pylint: disable=too-many-arguments
+        """Creates a source over a table or a query.
+
+        Parameters
+        ----------
+        table : str, optional
+            Table read, as 'project.dataset.table'
+        query : str, optional
+            Query whose result is read, instead of table
+        project : str, optional
+            Project billed for the read session and the query.
+            By default the project of table
+        row_restriction : str, optional
+            SQL filter applied by BigQuery to the rows of table, by default None
+        max_stream_count : int, optional
+            Streams of the read session.  Streams are read one after the other,
+            by default 1
+        credentials : Dict, optional
+            Arguments of google.oauth2.credentials.Credentials, by default None
+            (application default credentials)
+        """
+        if (table is None) == (query is None):
+            raise ValueError("Define either 'table' or 'query'")
+        self._table = table
+        self._query = query
+        self._project = project or (table.split(".")[0] if table else None)
+        self._row_restriction = row_restriction
+        self._max_stream_count = max_stream_count
+        self._credentials = credentials
+
+    def _google_credentials(self):
+        if self._credentials is None:
+            return None
+        from google.oauth2.credentials import Credentials
+
+        return Credentials(**self._credentials)
+
+    def _table_path(self) -> str:
+        """Table read, as 'projects/{project}/datasets/{dataset}/tables/{table}'.
+            A query is run first, and its destination table is read
+
+        Returns
+        -------
+        str
+            Path of the table in the Storage API
+        """
+        if self._query is not None:
+            from google.cloud import bigquery
+
+            client = bigquery.Client(
+                project=self._project, credentials=self._google_credentials()
+            )
+            job = client.query(self._query)
+            job.result()
+            destination = job.destination
+            return (
+                f"projects/{destination.project}/datasets/{destination.dataset_id}"
+                f"/tables/{destination.table_id}"
+            )
+        project, dataset, table = self._table.split(".")
+        return f"projects/{project}/datasets/{dataset}/tables/{table}"
+
+    def iter_batches(self, columns: List[str] = None) -> Iterator[pa.RecordBatch]:
+        """Reads the table or query result, one page of every stream at a time
+
+        Parameters
+        ----------
+        columns : List[str], optional
+            Columns to read, by default None (all the columns)
+
+        Yields
+        ------
+        pa.RecordBatch
+            Batches of records, as sent by BigQuery
+        """
+        try:
+            from google.cloud.bigquery_storage import BigQueryReadClient, types
+        except ImportError as exc:
+            raise ImportError(
+                """BigQueryStorageBackend needs google-cloud-bigquery-storage.
+                Install it with: pip install google-cloud-bigquery-storage[pyarrow]"""
+            ) from exc
+
+        client = BigQueryReadClient(credentials=self._google_credentials())
+        read_options = types.ReadSession.TableReadOptions(
+            selected_fields=columns or [], row_restriction=self._row_restriction or ""
+        )
+        session = client.create_read_session(
+            parent=f"projects/{self._project}",
+            read_session=types.ReadSession(
+                table=self._table_path(),
+                data_format=types.DataFormat.ARROW,
+                read_options=read_options,
+            ),
+            max_stream_count=self._max_stream_count,
+        )
+        for stream in session.streams:
+            for page in client.read_rows(stream.name).rows(session).pages:
+                yield page.to_arrow()
+
+    def describe(self) -> Dict:
+        return {
+            "backend": "bigquery",
+            "table": self._table,
+            "query": self._query,
+            "project": self._project,
+            "row_restriction": self._row_restriction,
+            "max_stream_count": self._max_stream_count,
+        }
+
+
+BACKENDS = {"local": LocalArrowBackend, "bigquery": BigQueryStorageBackend}
+
+
+def _infer_file_format(path: str) -> Optional[str]:
+    """File format of a file, or of the first file of a folder, from its extension
+
+    Parameters
+    ----------
+    path : str
+        File or folder
+
+    Returns
+    -------
+    Optional[str]
+        'ipc' or 'parquet', or None if the extension is not known
+    """
+    if os.path.isdir(path):
+        for _, _, files in os.walk(path):
+            for file_name in sorted(files):
+                file_format = _FILE_FORMATS.get(os.path.splitext(file_name)[1].lower())
+                if file_format is not None:
+                    return file_format
+        return None
+    return _FILE_FORMATS.get(os.path.splitext(path)[1].lower())
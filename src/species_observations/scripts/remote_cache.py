@@ -0,0 +1,260 @@
+"""Defines RemoteFileCache() class, a read-through local disk cache of remote files
+    (gs://, s3://, ...) used by CachedPartitionedDataSet.
+    A cached file is identified by the protocol and path of the object and by its
+    version (generation or etag, or size and modification time), so a new version of
+    an object is downloaded again and an unchanged object is never downloaded twice.
+    Files are fetched one at a time, when a partition is loaded, and the least
+    recently used files are evicted once the cache exceeds its size cap
+    """
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from species_observations.scripts.memory_budget import parse_memory_size
+
+logger = logging.getLogger(__name__)
+
+# Keys of fsspec's info() identifying the version of an object, by preference.
+# GCS gives 'generation', S3 and HTTP an 'ETag'.  Other filesystems fall back to the
+# size and modification time
+_VERSION_KEYS = ["generation", "etag", "ETag"]
+_FALLBACK_VERSION_KEYS = ["size", "mtime", "updated", "LastModified", "created"]
+
+
+def object_version(info: Dict) -> str:
+    """Version of a remote object, from its fsspec info
+
+    Parameters
+    ----------
+    info : Dict
+        Output of fsspec's AbstractFileSystem.info()
+
+    Returns
+    -------
+    str
+        Version of the object
+    """
+    for key in _VERSION_KEYS:
+        if info.get(key) is not None:
+            return f"{key}={info[key]}"
+    return ",".join(
+        f"{key}={info[key]}"
+        for key in _FALLBACK_VERSION_KEYS
+        if info.get(key) is not None
+    )
+
+
+def _protocol(file_system) -> str:
+    """First protocol of an fsspec filesystem, e.g. 'gs'"""
+    protocol = file_system.protocol
+    return protocol[0] if isinstance(protocol, (list, tuple)) else protocol
+
+
+class RemoteFileCache:
+    """Read-through cache of remote files in a local folder.  Files are downloaded
+    to a temporary file and renamed, so a cached file is always complete and several
+    processes and threads can share the folder.  The modification time of a cached
+    file is its last use.  Files are downloaded by the threads or processes which
+    load the partitions, e.g. the Prefetcher of streaming resampling or the workers
+    of 'parallel', so downloads overlap with processing"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size: Union[int, str, None] = None,
+        max_workers: int = 8,
+    ):
+        """Creates a cache in the folder path.
+
+        Parameters
+        ----------
+        path : Union[str, Path]
+            Local folder of the cache
+        max_size : Union[int, str, None], optional
+            Size cap of the cache, in bytes or with a unit ('10GB').
+            None for no cap, by default None.  Files being loaded are never
+            evicted, so the cache can exceed it by their size
+        max_workers : int, optional
+            Files downloaded at the same time by this process, by default 8
+        """
+        self._path = Path(path)
+        self._max_size = parse_memory_size(max_size)
+        self._max_workers = max_workers
+        self._init_locks()
+
+    def _init_locks(self):
+        """Creates the state shared by the threads using the cache"""
+        self._downloads = threading.BoundedSemaphore(self._max_workers)
+        self._in_use_lock = threading.Lock()
+        self._in_use: Dict[Path, int] = {}
+
+    def __getstate__(self) -> Dict:
+        state = dict(self.__dict__)
+        for key in ["_downloads", "_in_use_lock", "_in_use"]:
+            del state[key]
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._init_locks()
+
+    def get_path(self) -> Path:
+        """Allows access to the contents of protected attribute _path
+
+        Returns
+        -------
+        Path
+            Contents of _path
+        """
+        return self._path
+
+    def get_max_size(self) -> Optional[int]:
+        """Allows access to the contents of protected attribute _max_size
+
+        Returns
+        -------
+        Optional[int]
+            Contents of _max_size, in bytes
+        """
+        return self._max_size
+
+    def cache_file(self, protocol: str, remote_path: str, info: Dict) -> Path:
+        """Local file caching a version of a remote object.  The name keeps the
+            extension of the object, so its format can be inferred
+
+        Parameters
+        ----------
+        protocol : str
+            Protocol of the filesystem, e.g. 'gs'
+        remote_path : str
+            Path of the object, without protocol
+        info : Dict
+            fsspec info of the object
+
+        Returns
+        -------
+        Path
+            File in the cache folder
+        """
+        key = f"{protocol}://{remote_path}#{object_version(info)}"
+        key_hash = hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+        base_name = remote_path.rstrip("/").rsplit("/", 1)[-1]
+        safe_name = "".join(
+            char if char.isalnum() or char in "._-" else "_" for char in base_name
+        )
+        return self._path / f"{key_hash}_{safe_name}"
+
+    def fetch(self, file_system, remote_path: str, info: Dict) -> Path:
+        """Local copy of a remote file.  It is downloaded if it is not in the cache,
+            or if its version changed.  Then the least recently used files are
+            evicted to fit the size cap, keeping this one and those in use
+
+        Parameters
+        ----------
+        file_system : fsspec.AbstractFileSystem
+            Filesystem of the remote file
+        remote_path : str
+            Path of the remote file, as listed by file_system
+        info : Dict
+            fsspec info of the remote file, as given by the listing
+
+        Returns
+        -------
+        Path
+            Local file
+        """
+        local_file = self.cache_file(_protocol(file_system), remote_path, info)
+        if local_file.is_file():
+            now = time.time()
+            os.utime(local_file, (now, now))
+        else:
+            self._path.mkdir(parents=True, exist_ok=True)
+            temporary_file = local_file.with_name(
+                f"{local_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            try:
+                with self._downloads:
+                    file_system.get_file(remote_path, str(temporary_file))
+                os.replace(temporary_file, local_file)
+            finally:
+                if temporary_file.is_file():
+                    os.remove(temporary_file)
+            logger.debug("Remote cache %s: downloaded %s", self._path, remote_path)
+        self.evict(keep=[local_file])
+        return local_file
+
+    @contextmanager
+    def use(self, file_system, remote_path: str, info: Dict) -> Iterator[Path]:
+        """Local copy of a remote file, as given by fetch, which is not evicted by
+            the fetches of other threads until the context exits
+
+        Parameters
+        ----------
+        file_system : fsspec.AbstractFileSystem
+            Filesystem of the remote file
+        remote_path : str
+            Path of the remote file, as listed by file_system
+        info : Dict
+            fsspec info of the remote file, as given by the listing
+
+        Yields
+        ------
+        Path
+            Local file
+        """
+        local_file = self.cache_file(_protocol(file_system), remote_path, info)
+        with self._in_use_lock:
+            self._in_use[local_file] = self._in_use.get(local_file, 0) + 1
+        try:
+            yield self.fetch(file_system, remote_path, info)
+        finally:
+            with self._in_use_lock:
+                self._in_use[local_file] -= 1
+                if not self._in_use[local_file]:
+                    del self._in_use[local_file]
+
+    def evict(self, keep: List[Path] = None) -> List[Path]:
+        """Deletes the least recently used files until the cache fits max_size
+
+        Parameters
+        ----------
+        keep : List[Path], optional
+            Files which are not deleted, besides those in use, by default None
+
+        Returns
+        -------
+        List[Path]
+            Deleted files
+        """
+        if self._max_size is None or not self._path.is_dir():
+            return []
+        with self._in_use_lock:
+            keep = set(keep or []) | set(self._in_use)
+        files = []
+        for file_path in self._path.iterdir():
+            if file_path.name.endswith(".tmp") or not file_path.is_file():
+                continue
+            try:
+                files.append((file_path.stat(), file_path))
+            except FileNotFoundError:
+                # Evicted by another thread or process
+                pass
+        total_size = sum(stat.st_size for stat, _ in files)
+        evicted = []
+        for stat, file_path in sorted(files, key=lambda item: item[0].st_mtime):
+            if total_size <= self._max_size:
+                break
+            if file_path in keep:
+                continue
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            total_size -= stat.st_size
+            evicted.append(file_path)
+        return evicted
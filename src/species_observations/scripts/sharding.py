@@ -0,0 +1,134 @@
+"""Defines the assignment of raw partitions to shards, so N replicas of the pipeline
+    observations_time_shard split the partitions of species_data between them.
+    A partition belongs to shard md5(partition name) mod N, which does not depend on
+    the replica, the order of the partitions or the Python hash seed
+    """
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+_SHARD_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+_SHARD_NAME_PATTERN = re.compile(r"^shard_(\d+)_of_(\d+)$")
+
+
+def parse_shard(shard: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Reads a shard given as 'i/N', the i-th of N shards, counting from 0
+
+    Parameters
+    ----------
+    shard : Optional[str]
+        Shard, e.g. '0/4'.  None if the data is not sharded
+
+    Returns
+    -------
+    Optional[Tuple[int, int]]
+        (i, N), or None
+    """
+    if shard is None:
+        return None
+    match = _SHARD_PATTERN.match(str(shard))
+    if match is None or not int(match.group(1)) < int(match.group(2)):
+        raise ValueError(
+            f"""shard {shard} not valid.
+            It must be 'i/N' with 0 <= i < N, e.g. '0/4'"""
+        )
+    return int(match.group(1)), int(match.group(2))
+
+
+def shard_of(partition_name: str, n_shards: int) -> int:
+    """Shard of a partition
+
+    Parameters
+    ----------
+    partition_name : str
+        Name of the partition, as given by PartitionedDataSet
+    n_shards : int
+        Number of shards
+
+    Returns
+    -------
+    int
+        Shard of the partition, from 0 to n_shards - 1
+    """
+    digest = hashlib.md5(partition_name.encode("utf-8")).hexdigest()
+    return int(digest, 16) % n_shards
+
+
+def select_shard(pd_dict: Dict, shard_index: int, n_shards: int) -> Dict:
+    """Partitions of partitioned data which belong to a shard
+
+    Parameters
+    ----------
+    pd_dict : Dict
+        Data loaded with PartitionedDataSet
+    shard_index : int
+        Shard, from 0 to n_shards - 1
+    n_shards : int
+        Number of shards
+
+    Returns
+    -------
+    Dict
+        Entries of pd_dict assigned to shard_index
+    """
+    return {
+        partition_name: load_func
+        for partition_name, load_func in pd_dict.items()
+        if shard_of(partition_name, n_shards) == shard_index
+    }
+
+
+def shard_name(shard_index: int, n_shards: int) -> str:
+    """Name of the partial aggregate of a shard, in resampled_data_shards
+
+    Parameters
+    ----------
+    shard_index : int
+        Shard, from 0 to n_shards - 1
+    n_shards : int
+        Number of shards
+
+    Returns
+    -------
+    str
+        'shard_{i}_of_{N}'
+    """
+    return f"shard_{shard_index}_of_{n_shards}"
+
+
+def complete_shards(names: List[str]) -> List[str]:
+    """Checks that the partial aggregates of every shard of a run are present
+
+    Parameters
+    ----------
+    names : List[str]
+        Names of the stored partial aggregates, see shard_name()
+
+    Returns
+    -------
+    List[str]
+        names, sorted by shard
+    """
+    if not names:
+        raise ValueError("There are no partial aggregates of shards")
+    shards = {}
+    for name in names:
+        match = _SHARD_NAME_PATTERN.match(name)
+        if match is None:
+            raise ValueError(f"'{name}' is not the partial aggregate of a shard")
+        shards[name] = int(match.group(1)), int(match.group(2))
+
+    shard_counts = {n_shards for _, n_shards in shards.values()}
+    if len(shard_counts) != 1:
+        raise ValueError(
+            f"""The partial aggregates must come from a single run, with the same
+            number of shards.  Shard counts found: {sorted(shard_counts)}"""
+        )
+    n_shards = shard_counts.pop()
+    missing = set(range(n_shards)) - {shard_index for shard_index, _ in shards.values()}
+    if missing:
+        raise ValueError(
+            f"""The partial aggregates of shards {sorted(missing)} of {n_shards}
+            are missing"""
+        )
+    return sorted(shards, key=lambda name: shards[name][0])
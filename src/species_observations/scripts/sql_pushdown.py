@@ -0,0 +1,320 @@
+"""Defines the SQL backends of SQLBackendDataSet and period_aggregation_sql(), which
+    generates the GROUP BY query that sums individual counts by day or month, so the
+    aggregation runs in the database and only one row per period is transferred.
+    Dialects:
+        sqlite, duckdb: event dates stored as text, as in the raw CSV exports
+            ('2021-09-01 00:00:00 UTC'); the first 19 characters are the UTC time.
+            duckdb also reads TIMESTAMP columns in UTC
+        bigquery: event dates stored as TIMESTAMP, as in the GBIF public dataset
+    """
+# pylint: disable=import-outside-toplevel
+import sqlite3
+from contextlib import closing
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Name of the column of the period start, in the output of the queries
+PERIOD_COLUMN = "period"
+
+_DIALECTS = {
+    "sqlite": {
+        "quote": '"{}"',
+        "float": "REAL",
+        "D": "date(substr({col}, 1, 19))",
+        "M": "date(substr({col}, 1, 19), 'start of month')",
+    },
+    "duckdb": {
+        "quote": '"{}"',
+        "float": "DOUBLE",
+        "D": "CAST(CAST(substr(CAST({col} AS VARCHAR), 1, 19) AS TIMESTAMP) AS DATE)",
+        "M": (
+            "CAST(date_trunc('month', "
+            "CAST(substr(CAST({col} AS VARCHAR), 1, 19) AS TIMESTAMP)) AS DATE)"
+        ),
+    },
+    "bigquery": {
+        "quote": "`{}`",
+        "float": "FLOAT64",
+        "D": "DATE({col}, 'UTC')",
+        "M": "DATE_TRUNC(DATE({col}, 'UTC'), MONTH)",
+    },
+}
+
+
+def period_aggregation_sql(
+    table: str,
+    date_col: str,
+    count_col: str,
+    resample: str,
+    dialect: str,
+    where: str = None,
+    date_range: Dict = None,
+) -> str:  # pylint: disable=too-many-arguments
+    """SQL that sums count_col by period of date_col, equivalent to
+        Preprocessing.preprocessing_time_data followed by time_resampling:
+        missing counts are 0 and rows without date are dropped.
+        Periods without observations are not returned
+
+    Parameters
+    ----------
+    table : str
+        Table of the raw data, e.g. 'observations' or 'project.dataset.table'
+    date_col : str
+        Column of the event date
+    count_col : str
+        Column of the individual count
+    resample : str
+        'D' for days, 'M' for months
+    dialect : str
+        'sqlite', 'duckdb' or 'bigquery'
+    where : str, optional
+        Additional SQL condition on the rows, e.g. "species = 'Anas platyrhynchos'"
+    date_range : Dict, optional
+        {'start': 'YYYY-MM', 'end': 'YYYY-MM'}, the months aggregated.
+        None values read all of them
+
+    Returns
+    -------
+    str
+        Query returning the columns PERIOD_COLUMN (first day of the period, as a
+        date) and count_col, ordered by period
+    """
+    if dialect not in _DIALECTS:
+        raise ValueError(
+            f"""dialect {dialect} not valid.
+            Valid values are {list(_DIALECTS)}"""
+        )
+    if resample not in ["D", "M"]:
+        raise ValueError(
+            f""" 'resample' can only take values of ['D', 'M'].
+'{resample}' was given"""
+        )
+    quote = _DIALECTS[dialect]["quote"].format
+    date_sql = quote(date_col)
+    period_sql = _DIALECTS[dialect][resample].format(col=date_sql)
+    day_sql = _DIALECTS[dialect]["D"].format(col=date_sql)
+    float_type = _DIALECTS[dialect]["float"]
+
+    conditions = [f"{date_sql} IS NOT NULL"]
+    if where:
+        conditions.append(f"({where})")
+    date_range = date_range or {}
+    if date_range.get("start") is not None:
+        start = pd.Period(date_range["start"], freq="M").start_time
+        conditions.append(f"{day_sql} >= {_date_literal(start, dialect)}")
+    if date_range.get("end") is not None:
+        end = (pd.Period(date_range["end"], freq="M") + 1).start_time
+        conditions.append(f"{day_sql} < {_date_literal(end, dialect)}")
+
+    table_sql = quote(table) if dialect == "bigquery" else table
+    return (
+        f"SELECT {period_sql} AS {PERIOD_COLUMN}, "
+        f"SUM(COALESCE(CAST({quote(count_col)} AS {float_type}), 0)) "
+        f"AS {quote(count_col)}\n"
+        f"FROM {table_sql}\n"
+        f"WHERE {' AND '.join(conditions)}\n"
+        f"GROUP BY {PERIOD_COLUMN}\n"
+        f"ORDER BY {PERIOD_COLUMN}"
+    )
+
+
+def _date_literal(date: pd.Timestamp, dialect: str) -> str:
+    """Date literal comparable with the period expressions of dialect
+
+    Parameters
+    ----------
+    date : pd.Timestamp
+        Date
+    dialect : str
+        'sqlite', 'duckdb' or 'bigquery'
+
+    Returns
+    -------
+    str
+        SQL literal
+    """
+    text = date.strftime("%Y-%m-%d")
+    return f"'{text}'" if dialect == "sqlite" else f"DATE '{text}'"
+
+
+class SQLBackend:
+    """Database holding the raw data in a table, loaded by SQLBackendDataSet"""
+
+    dialect: str = None
+
+    def __init__(self, table: str, where: str = None):
+        """Defines the table of the raw data.
+
+        Parameters
+        ----------
+        table : str
+            Table of the raw data
+        where : str, optional
+            SQL condition selecting the rows of the raw data, by default None
+        """
+        self._table = table
+        self._where = where
+
+    def get_table(self) -> str:
+        """Allows access to the contents of protected attribute _table
+
+        Returns
+        -------
+        str
+            Contents of _table
+        """
+        return self._table
+
+    def get_where(self) -> Optional[str]:
+        """Allows access to the contents of protected attribute _where
+
+        Returns
+        -------
+        Optional[str]
+            Contents of _where
+        """
+        return self._where
+
+    def query(self, sql: str) -> pd.DataFrame:
+        """Runs a query
+
+        Parameters
+        ----------
+        sql : str
+            Query in the dialect of the backend
+
+        Returns
+        -------
+        pd.DataFrame
+            Result of the query
+        """
+        raise NotImplementedError
+
+    def describe(self) -> Dict:
+        """Parameters of the backend, without credentials
+
+        Returns
+        -------
+        Dict
+            Parameters of the backend
+        """
+        return {"dialect": self.dialect, "table": self._table, "where": self._where}
+
+
+class SQLiteBackend(SQLBackend):
+    """Table of a SQLite database file"""
+
+    dialect = "sqlite"
+
+    def __init__(self, database: str, table: str, where: str = None):
+        """Defines the database and table of the raw data.
+
+        Parameters
+        ----------
+        database : str
+            Path of the database file
+        table : str
+            Table of the raw data
+        where : str, optional
+            SQL condition selecting the rows of the raw data, by default None
+        """
+        super().__init__(table, where)
+        self._database = str(database)
+
+    def query(self, sql: str) -> pd.DataFrame:
+        with closing(sqlite3.connect(self._database)) as connection:
+            return pd.read_sql_query(sql, connection)
+
+    def describe(self) -> Dict:
+        return {**super().describe(), "database": self._database}
+
+
+class DuckDBBackend(SQLBackend):
+    """Table or view of a DuckDB database, which can also be a query over files,
+    e.g. table: "read_csv_auto('data/01_raw/species_bigQuery/*.csv')".
+    Needs the package duckdb"""
+
+    dialect = "duckdb"
+
+    def __init__(self, table: str, database: str = ":memory:", where: str = None):
+        """Defines the database and table of the raw data.
+
+        Parameters
+        ----------
+        table : str
+            Table of the raw data
+        database : str, optional
+            Path of the database file, by default ':memory:'
+        where : str, optional
+            SQL condition selecting the rows of the raw data, by default None
+        """
+        super().__init__(table, where)
+        self._database = str(database)
+
+    def query(self, sql: str) -> pd.DataFrame:
+        import duckdb
+
+        connection = duckdb.connect(
+            self._database, read_only=self._database != ":memory:"
+        )
+        try:
+            return connection.execute(sql).df()
+        finally:
+            connection.close()
+
+    def describe(self) -> Dict:
+        return {**super().describe(), "database": self._database}
+
+
+class BigQueryBackend(SQLBackend):
+    """BigQuery table.  Only the aggregated rows are downloaded.
+    Needs the package google-cloud-bigquery"""
+
+    dialect = "bigquery"
+
+    def __init__(
+        self,
+        table: str,
+        project: str = None,
+        where: str = None,
+        credentials: Dict = None,
+    ):
+        """Defines the table of the raw data.
+
+        Parameters
+        ----------
+        table : str
+            Table of the raw data, as 'project.dataset.table'
+        project : str, optional
+            Project billed for the query, by default the project of table
+        where : str, optional
+            SQL condition selecting the rows of the raw data, by default None
+        credentials : Dict, optional
+            Arguments of google.oauth2.credentials.Credentials, by default None
+            (application default credentials)
+        """
+        super().__init__(table, where)
+        self._project = project or table.split(".")[0]
+        self._credentials = credentials
+
+    def query(self, sql: str) -> pd.DataFrame:
+        from google.cloud import bigquery
+
+        credentials = None
+        if self._credentials is not None:
+            from google.oauth2.credentials import Credentials
+
+            credentials = Credentials(**self._credentials)
+        client = bigquery.Client(project=self._project, credentials=credentials)
+        return client.query(sql).to_dataframe()
+
+    def describe(self) -> Dict:
+        return {**super().describe(), "project": self._project}
+
+
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "duckdb": DuckDBBackend,
+    "bigquery": BigQueryBackend,
+}
@@ -0,0 +1,352 @@
+"""Defines SyntheticObservations() class, which generates GBIF-shaped raw data with the
+    same columns as the partitions in data/01_raw/species_bigQuery_sample, to measure
+    how the pipelines scale.  Partitions are generated one at a time, each from its
+    own seed, so the total number of rows is limited only by disk space
+    """
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+# Columns of the raw sample partitions, in order.  The first one is the unnamed index
+RAW_COLUMNS = [
+    "basisofrecord",
+    "class",
+    "countrycode",
+    "day",
+    "decimallatitude",
+    "decimallongitude",
+    "eventdate",
+    "family",
+    "gbifid",
+    "genus",
+    "individualcount",
+    "issue",
+    "kingdom",
+    "month",
+    "occurrencestatus",
+    "order",
+    "phylum",
+    "species",
+    "year",
+]
+
+# Country codes of the sample, by decreasing number of observations, and the mean
+# coordinates of their observations
+COUNTRY_CENTROIDS = {
+    "US": (40.7, -93.2),
+    "CA": (47.0, -87.7),
+    "NL": (52.1, 5.1),
+    "NO": (60.9, 9.5),
+    "ES": (40.3, -2.6),
+    "GB": (52.9, -1.0),
+    "DK": (55.8, 10.8),
+    "RU": (55.5, 39.7),
+    "DE": (49.9, 9.1),
+    "NZ": (-40.8, 173.9),
+    "PT": (39.7, -8.8),
+    "BE": (51.2, 4.0),
+    "PL": (51.2, 20.5),
+    "IT": (42.1, 12.0),
+    "CZ": (49.7, 16.1),
+    "EE": (58.6, 26.2),
+    "UA": (49.3, 31.5),
+    "TR": (38.5, 32.9),
+    "IL": (32.2, 34.9),
+    "AT": (47.8, 15.3),
+    "SE": (56.6, 15.6),
+    "FR": (47.5, 3.6),
+    "FI": (59.8, 22.8),
+    "IE": (53.1, -6.0),
+    "KR": (36.0, 127.0),
+    "MX": (19.5, -99.2),
+    "CN": (29.9, 95.6),
+    "IN": (26.6, 93.3),
+}
+
+# Frequency of the values of 'issue' in the sample
+ISSUE_WEIGHTS = {
+    "CONTINENT_DERIVED_FROM_COORDINATES": 0.76,
+    "COORDINATE_ROUNDED": 0.128,
+    "OCCURRENCE_STATUS_INFERRED_FROM_INDIVIDUAL_COUNT": 0.099,
+    "COUNTRY_DERIVED_FROM_COORDINATES": 0.009,
+    "GEODETIC_DATUM_ASSUMED_WGS84": 0.003,
+    "CONTINENT_COORDINATE_MISMATCH": 0.001,
+}
+
+
+def _zipf_weights(n_values: int, exponent: float) -> np.ndarray:
+    """Probabilities of ranks 1 to n_values under Zipf's law
+
+    Parameters
+    ----------
+    n_values : int
+        Number of values
+    exponent : float
+        Exponent of the law.  0 gives uniform probabilities
+
+    Returns
+    -------
+    np.ndarray
+        Probabilities, decreasing with rank
+    """
+    weights = 1.0 / np.arange(1, n_values + 1) ** exponent
+    return weights / weights.sum()
+
+
+class SyntheticObservations:
+    """Generates partitions of bird observations with the columns of the raw sample.
+    The skew of real GBIF exports is reproduced as:
+        species and countries follow Zipf's law, so a few dominate the counts
+        observations grow every year, peak in spring and autumn, and are more
+        frequent on weekends
+        a fraction of individualcount is missing, and the rest is heavy-tailed
+    """
+
+    def __init__(
+        self,
+        start: str = "2015-01-01",
+        end: str = "2023-12-31",
+        n_species: int = 2000,
+        species_skew: float = 1.1,
+        country_skew: float = 1.3,
+        yearly_growth: float = 1.2,
+        null_count_fraction: float = 0.1,
+        seed: int = 0,
+    ):  # pylint: disable=too-many-arguments
+        """Defines the taxonomy and the distributions of the data.
+
+        Parameters
+        ----------
+        start : str, optional
+            First date of the observations, by default '2015-01-01'
+        end : str, optional
+            Last date of the observations, by default '2023-12-31'
+        n_species : int, optional
+            Number of species, by default 2000
+        species_skew : float, optional
+            Zipf exponent of the species frequencies, by default 1.1
+        country_skew : float, optional
+            Zipf exponent of the country frequencies, by default 1.3
+        yearly_growth : float, optional
+            Ratio of the observations of a year to those of the previous one,
+            by default 1.2
+        null_count_fraction : float, optional
+            Fraction of rows without individualcount, by default 0.1
+        seed : int, optional
+            Seed of the data.  Partitions are reproducible for a given seed
+        """
+        self._seed = seed
+        self._null_count_fraction = null_count_fraction
+        self._taxonomy = self._make_taxonomy(n_species)
+        self._species_weights = _zipf_weights(n_species, species_skew)
+        self._countries = list(COUNTRY_CENTROIDS)
+        self._country_weights = _zipf_weights(len(self._countries), country_skew)
+        self._centroids = np.array(
+            [COUNTRY_CENTROIDS[code] for code in self._countries]
+        )
+        self._issues = list(ISSUE_WEIGHTS)
+        self._issue_weights = np.array(list(ISSUE_WEIGHTS.values()))
+        self._issue_weights = self._issue_weights / self._issue_weights.sum()
+
+        self._days = pd.date_range(start, end, freq="D")
+        years = (self._days - self._days[0]).days.to_numpy() / 365.25
+        season = 1 + 0.5 * np.cos(
+            4 * np.pi * (self._days.dayofyear.to_numpy() - 105) / 365.25
+        )
+        weekend = np.where(self._days.dayofweek.to_numpy() >= 5, 1.4, 1.0)
+        day_weights = yearly_growth**years * season * weekend
+        self._day_weights = day_weights / day_weights.sum()
+        self._day_labels = self._days.strftime("%Y-%m-%d 00:00:00 UTC").to_numpy()
+
+    def _make_taxonomy(self, n_species: int) -> pd.DataFrame:
+        """Taxonomy of the species, with about 5 species per genus, 4 genera per
+            family and 5 families per order.  The first species is the one of the sample
+
+        Parameters
+        ----------
+        n_species : int
+            Number of species
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per species, with the taxonomic columns of RAW_COLUMNS
+        """
+        rng = np.random.default_rng(self._seed)
+        n_genera = max(1, n_species // 5)
+        n_families = max(1, n_genera // 4)
+        n_orders = max(1, n_families // 5)
+        genus = np.sort(rng.integers(0, n_genera, n_species))
+        genus_family = np.sort(rng.integers(0, n_families, n_genera))
+        family_order = np.sort(rng.integers(0, n_orders, n_families))
+        genus[0], genus_family[0], family_order[0] = 0, 0, 0
+        family = genus_family[genus]
+        order = family_order[family]
+
+        def names(prefix: str, codes: np.ndarray, first_name: str) -> List[str]:
+            return [
+                first_name if code == 0 else f"{prefix}{code:05d}" for code in codes
+            ]
+
+        taxonomy = pd.DataFrame(
+            {
+                "kingdom": "Animalia",
+                "phylum": "Chordata",
+                "class": "Aves",
+                "order": names("Synthorder", order, "Anseriformes"),
+                "family": names("Synthfamily", family, "Anatidae"),
+                "genus": names("Synthgenus", genus, "Anas"),
+            }
+        )
+        taxonomy["species"] = [
+            f"{genus_name} species{number:05d}"
+            for number, genus_name in enumerate(taxonomy["genus"])
+        ]
+        taxonomy.loc[0, "species"] = "Anas platyrhynchos"
+        return taxonomy
+
+    def partition(self, n_rows: int, partition_number: int = 0) -> pd.DataFrame:
+        """Generates a partition
+
+        Parameters
+        ----------
+        n_rows : int
+            Number of rows
+        partition_number : int, optional
+            Number of the partition.  Together with the seed, it identifies the
+            rows generated, by default 0
+
+        Returns
+        -------
+        pd.DataFrame
+            Raw data with the columns RAW_COLUMNS, indexed by random row numbers
+        """
+        rng = np.random.default_rng([self._seed, partition_number])
+        day = rng.choice(len(self._days), n_rows, p=self._day_weights)
+        species = rng.choice(len(self._taxonomy), n_rows, p=self._species_weights)
+        country = rng.choice(len(self._countries), n_rows, p=self._country_weights)
+        coordinates = self._centroids[country] + rng.normal(0, 2.0, (n_rows, 2))
+        counts = np.ceil(rng.lognormal(1.7, 1.4, n_rows))
+        counts[rng.random(n_rows) < self._null_count_fraction] = np.nan
+        dates = self._days[day]
+
+        df_partition = pd.DataFrame(
+            {
+                "basisofrecord": np.where(
+                    rng.random(n_rows) < 0.99,
+                    "HUMAN_OBSERVATION",
+                    "MACHINE_OBSERVATION",
+                ),
+                "countrycode": np.array(self._countries)[country],
+                "day": dates.day.astype("float64"),
+                "decimallatitude": np.round(np.clip(coordinates[:, 0], -90, 90), 5),
+                "decimallongitude": np.round(coordinates[:, 1], 5),
+                "eventdate": self._day_labels[day],
+                "gbifid": 3_000_000_000
+                + partition_number * 1_000_000_000
+                + np.arange(n_rows),
+                "individualcount": counts,
+                "issue": np.array(self._issues)[
+                    rng.choice(len(self._issues), n_rows, p=self._issue_weights)
+                ],
+                "month": dates.month.astype("float64"),
+                "occurrencestatus": "PRESENT",
+                "year": dates.year,
+            },
+            index=rng.integers(0, 10_000_000, n_rows),
+        )
+        for column in self._taxonomy.columns:
+            df_partition[column] = self._taxonomy[column].to_numpy()[species]
+        return df_partition[RAW_COLUMNS]
+
+    def write(
+        self,
+        folder: Union[str, Path],
+        n_rows: int,
+        n_partitions: int = 1,
+        file_format: str = "csv",
+    ) -> List[Path]:
+        """Writes n_rows of raw data split in n_partitions files, as the
+            partitions of a PartitionedDataSet
+
+        Parameters
+        ----------
+        folder : Union[str, Path]
+            Folder of the partitions
+        n_rows : int
+            Total number of rows
+        n_partitions : int, optional
+            Number of partitions, by default 1
+        file_format : str, optional
+            'csv' or 'parquet', by default 'csv'
+
+        Returns
+        -------
+        List[Path]
+            Files written
+        """
+        writers = {
+            "csv": lambda df_partition, path: df_partition.to_csv(path),
+            "parquet": lambda df_partition, path: df_partition.to_parquet(path),
+        }
+        if file_format not in writers:
+            raise ValueError(
+                f"""file_format {file_format} not valid.
+                Valid values are {list(writers)}"""
+            )
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        files = []
+        for number, rows in enumerate(self.partition_sizes(n_rows, n_partitions)):
+            path = folder / f"species_synthetic({number + 1}).{file_format}"
+            writers[file_format](self.partition(rows, number), path)
+            files.append(path)
+        return files
+
+    @staticmethod
+    def partition_sizes(n_rows: int, n_partitions: int) -> List[int]:
+        """Rows of each partition, differing at most by one
+
+        Parameters
+        ----------
+        n_rows : int
+            Total number of rows
+        n_partitions : int
+            Number of partitions
+
+        Returns
+        -------
+        List[int]
+            Number of rows of each partition
+        """
+        sizes, remainder = divmod(n_rows, n_partitions)
+        return [sizes + (number < remainder) for number in range(n_partitions)]
+
+    def get_taxonomy(self) -> pd.DataFrame:
+        """Allows access to the contents of protected attribute _taxonomy
+
+        Returns
+        -------
+        pd.DataFrame
+            Copy of _taxonomy
+        """
+        return self._taxonomy.copy()
+
+    def describe(self) -> Dict:
+        """Parameters of the generated data
+
+        Returns
+        -------
+        Dict
+            Date range, number of species and countries, and seed
+        """
+        return {
+            "start": str(self._days[0].date()),
+            "end": str(self._days[-1].date()),
+            "n_species": len(self._taxonomy),
+            "n_countries": len(self._countries),
+            "null_count_fraction": self._null_count_fraction,
+            "seed": self._seed,
+        }
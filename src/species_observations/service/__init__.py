@@ -0,0 +1,17 @@
+"""Local asyncio HTTP service that answers queries over the aggregates precomputed
+    by the observations_time pipelines.  Run with:
+        python -m species_observations.service --env base
+    AggregateIndex and QueryService are imported on first access, so that
+    `python -m species_observations.service --help` does not import pandas
+    """
+import importlib
+
+__all__ = ["AggregateIndex", "QueryService"]
+
+_EXPORTS = {"AggregateIndex": ".aggregates", "QueryService": ".server"}
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,53 @@
+"""Runs the query service over the aggregates defined in the data catalog:
+    python -m species_observations.service --env base
+Run from the kedro project main folder.  Defaults are defined in
+conf/base/parameters/query_service.yml
+"""
+import argparse
+import asyncio
+import logging
+
+import species_observations.utils as utl
+
+
+def main():
+    """Parses the arguments and serves until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--env", default="base", help="kedro environment")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--cache-size", type=int, default=None)
+    parser.add_argument("--reload-interval", type=float, default=None)
+    args = parser.parse_args()
+
+    # pylint: disable=import-outside-toplevel
+    from .aggregates import AggregateIndex, catalog_sources
+    from .server import QueryService
+
+    config = utl.load_config_file_kedro(kedro_env=args.env)
+    parameters = config["parameters"]
+    service_params = parameters["query_service"]
+    sources = catalog_sources(config["catalog"], service_params["datasets"])
+
+    def load_index() -> AggregateIndex:
+        return AggregateIndex(sources, parameters)
+
+    def option(value, key):
+        return service_params[key] if value is None else value
+
+    logging.basicConfig(level=logging.INFO)
+    service = QueryService(
+        load_index,
+        cache_size=option(args.cache_size, "cache_size"),
+        reload_interval=option(args.reload_interval, "reload_interval"),
+    )
+    try:
+        asyncio.run(
+            service.serve_forever(option(args.host, "host"), option(args.port, "port"))
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Defines AggregateIndex() class, which keeps the precomputed aggregates in memory
+    and answers range, period and group queries over them"""
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import species_observations.utils as utl
+from species_observations.scripts.data_processing import Preprocessing
+
+
+class AggregateIndex:
+    """Loads the outputs of the observations_time pipelines once, and answers queries
+    from memory.  Range totals are two lookups in a cumulative sum of the
+    resampled counts"""
+
+    def __init__(self, sources: Dict[str, str], parameters: Dict):
+        """Loads the aggregates of sources.  Missing files are skipped.
+
+        Parameters
+        ----------
+        sources : Dict[str, str]
+            Local files of the aggregates, by key:
+                'resampled': output of node_preprocessing_time_data (required)
+                'rollups': output of node_time_rollups.  If missing, the rollups
+                    are computed from 'resampled'
+                'grouped': output of node_grouped_time_aggregation
+        parameters : Dict
+            Parameters defined in conf/base or kedro_env/parameters/observations_time.yml
+        """
+        self._sources = dict(sources)
+        self._prep = Preprocessing(parameters)
+        self._date_col = self._prep.get_date_col() + self._prep.get_datetime_suffix()
+        self._count_col = parameters["data_cols"]["individual_count"]
+        self._group_cols = {
+            key: parameters["data_cols"][key]
+            for key in parameters["preprocessing"]["grouping"]["keys"]
+        }
+        self._signature = self.current_signature()
+
+        resampled = self._read_csv("resampled")
+        if resampled is None:
+            raise ValueError(
+                f"""The resampled aggregate {self._sources.get('resampled')} does not exist.
+                Run the observations_time pipeline first"""
+            )
+        self._counts = self._prep.resampled_counts(resampled)
+        self._tz = self._counts.index.tz
+        self._cumsum = np.concatenate([[0.0], np.cumsum(self._counts.to_numpy())])
+
+        rollups = self._read_csv("rollups")
+        if rollups is None:
+            rollups = self._prep.time_rollups(resampled)
+        rollups[self._date_col] = utl.parse_dates_cached(rollups[self._date_col])
+        self._rollups = {
+            period: df_period.set_index(self._date_col)[self._count_col]
+            for period, df_period in rollups.groupby("resampling_period")
+        }
+
+        self._grouped = self._read_csv("grouped")
+        if self._grouped is not None:
+            self._grouped[self._date_col] = utl.parse_dates_cached(
+                self._grouped[self._date_col]
+            )
+            self._grouped = self._grouped.sort_values(self._date_col, kind="stable")
+
+    def _read_csv(self, key: str) -> Optional[pd.DataFrame]:
+        """Reads the aggregate of a source
+
+        Parameters
+        ----------
+        key : str
+            Key of the source
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            Aggregate, or None if the source is not defined or does not exist
+        """
+        filepath = self._sources.get(key)
+        if filepath is None or not os.path.isfile(filepath):
+            return None
+        return pd.read_csv(filepath)
+
+    def current_signature(self) -> Tuple:
+        """Size and modification time of every source, as they are now
+
+        Returns
+        -------
+        Tuple
+            (key, size, mtime) of every source.  (key, None, None) for missing files
+        """
+        signature = []
+        for key in sorted(self._sources):
+            try:
+                stat = os.stat(self._sources[key])
+                signature.append((key, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append((key, None, None))
+        return tuple(signature)
+
+    def is_stale(self) -> bool:
+        """Checks if any source changed since it was loaded
+
+        Returns
+        -------
+        bool
+            True if the index should be reloaded
+        """
+        return self.current_signature() != self._signature
+
+    def get_sources(self) -> Dict[str, str]:
+        """Allows access to the contents of protected attribute _sources
+
+        Returns
+        -------
+        Dict[str, str]
+            Copy of _sources
+        """
+        return dict(self._sources)
+
+    def _timestamp(self, date: Optional[str]) -> Optional[pd.Timestamp]:
+        """Converts a query date to the time zone of the aggregates
+
+        Parameters
+        ----------
+        date : Optional[str]
+            Date, as accepted by pd.Timestamp().  Dates without time zone are taken
+            in the time zone of the aggregates
+
+        Returns
+        -------
+        Optional[pd.Timestamp]
+            Date, or None if not specified
+        """
+        if date is None:
+            return None
+        try:
+            timestamp = pd.Timestamp(date)
+        except ValueError as exc:
+            raise ValueError(f"Invalid date: {date}") from exc
+        if self._tz is None:
+            return timestamp.tz_localize(None) if timestamp.tz else timestamp
+        if timestamp.tz is None:
+            return timestamp.tz_localize(self._tz)
+        return timestamp.tz_convert(self._tz)
+
+    def _bounds(
+        self, index: pd.DatetimeIndex, start: Optional[str], end: Optional[str]
+    ) -> slice:
+        """Positions of the labels of a sorted index from start to end, both included
+
+        Parameters
+        ----------
+        index : pd.DatetimeIndex
+            Sorted period labels
+        start : Optional[str]
+            First date.  If not specified, the first label
+        end : Optional[str]
+            Last date.  If not specified, the last label
+
+        Returns
+        -------
+        slice
+            Positions within index
+        """
+        start, end = self._timestamp(start), self._timestamp(end)
+        low = 0 if start is None else index.searchsorted(start, side="left")
+        high = len(index) if end is None else index.searchsorted(end, side="right")
+        return slice(low, max(low, high))
+
+    def range_query(self, start: str = None, end: str = None) -> Dict:
+        """Total count of the resampled periods from start to end, both included
+
+        Parameters
+        ----------
+        start : str, optional
+            First date, by default the first period
+        end : str, optional
+            Last date, by default the last period
+
+        Returns
+        -------
+        Dict
+            'start' and 'end' periods of the range, number of 'periods' and 'total'
+        """
+        bounds = self._bounds(self._counts.index, start, end)
+        index = self._counts.index[bounds]
+        return {
+            "start": index[0].isoformat() if len(index) else None,
+            "end": index[-1].isoformat() if len(index) else None,
+            "periods": len(index),
+            "total": float(self._cumsum[bounds.stop] - self._cumsum[bounds.start]),
+        }
+
+    def period_query(self, period: str, start: str = None, end: str = None) -> Dict:
+        """Series of a rollup period from start to end, both included
+
+        Parameters
+        ----------
+        period : str
+            Rollup period, as in 'rollup_periods'
+        start : str, optional
+            First date, by default the first period
+        end : str, optional
+            Last date, by default the last period
+
+        Returns
+        -------
+        Dict
+            'period' and its 'dates' and 'counts'
+        """
+        if period not in self._rollups:
+            raise ValueError(
+                f"""Period {period} not available.
+                Available periods are {sorted(self._rollups)}"""
+            )
+        series = self._rollups[period]
+        series = series.iloc[self._bounds(series.index, start, end)]
+        return {
+            "period": period,
+            "dates": [date.isoformat() for date in series.index],
+            "counts": series.tolist(),
+        }
+
+    def group_query(
+        self,
+        by: str,
+        start: str = None,
+        end: str = None,
+        value: str = None,
+        limit: int = None,
+    ) -> Dict:
+        """Counts of the groups of a grouping key, from start to end, both included
+
+        Parameters
+        ----------
+        by : str
+            Grouping key, as in preprocessing -> grouping -> keys
+        start : str, optional
+            First date, by default the first period
+        end : str, optional
+            Last date, by default the last period
+        value : str, optional
+            If specified, returns the series of periods of this group only
+        limit : int, optional
+            Maximum number of groups returned, by default all of them
+
+        Returns
+        -------
+        Dict
+            If value is None, 'groups' and their 'totals' in decreasing order.
+            Otherwise, 'dates' and 'counts' of the group
+        """
+        if self._grouped is None:
+            raise ValueError("The grouped aggregate is not available")
+        if by not in self._group_cols:
+            raise ValueError(
+                f"""Grouping key {by} not available.
+                Available keys are {sorted(self._group_cols)}"""
+            )
+        group_col = self._group_cols[by]
+        dates = pd.DatetimeIndex(self._grouped[self._date_col])
+        df_range = self._grouped.iloc[self._bounds(dates, start, end)]
+
+        if value is not None:
+            df_group = df_range[df_range[group_col] == value]
+            series = df_group.groupby(self._date_col)[self._count_col].sum()
+            return {
+                "by": by,
+                "value": value,
+                "dates": [date.isoformat() for date in series.index],
+                "counts": series.tolist(),
+            }
+
+        totals = (
+            df_range.groupby(group_col)[self._count_col]
+            .sum()
+            .sort_values(ascending=False, kind="stable")
+        )
+        if limit is not None:
+            totals = totals.iloc[:limit]
+        return {
+            "by": by,
+            "groups": [str(group) for group in totals.index],
+            "totals": totals.tolist(),
+        }
+
+    def describe(self) -> Dict:
+        """Summary of the loaded aggregates
+
+        Returns
+        -------
+        Dict
+            Sources, first and last resampled periods, rollup periods and grouping keys
+        """
+        index = self._counts.index
+        return {
+            "sources": self._sources,
+            "start": index[0].isoformat() if len(index) else None,
+            "end": index[-1].isoformat() if len(index) else None,
+            "periods": sorted(self._rollups),
+            "group_keys": sorted(self._group_cols) if self._grouped is not None else [],
+        }
+
+
+def catalog_sources(catalog: Dict, datasets: Dict[str, str]) -> Dict[str, str]:
+    """Local files of the aggregates defined in the data catalog
+
+    Parameters
+    ----------
+    catalog : Dict
+        Catalog config, as loaded by utils.load_config_file_kedro()
+    datasets : Dict[str, str]
+        Catalog entry of each source key
+
+    Returns
+    -------
+    Dict[str, str]
+        filepath of each source key whose catalog entry exists
+    """
+    return {
+        key: catalog[ds_name]["filepath"]
+        for key, ds_name in datasets.items()
+        if ds_name in catalog and "filepath" in catalog[ds_name]
+    }
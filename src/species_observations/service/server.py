@@ -0,0 +1,332 @@
+"""Defines QueryService() class, a minimal HTTP/1.1 server on asyncio streams that
+    answers queries with an AggregateIndex, caches the answers and reloads the index
+    when the aggregates change.
+
+    Endpoints, answered as JSON (dates as accepted by pd.Timestamp()):
+        /health                             loaded aggregates and cache statistics
+        /range?start=&end=                  total count of the range
+        /period?period=W&start=&end=        series of a rollup period
+        /groups?by=species&start=&end=&limit=   totals of the groups of a key
+        /groups?by=species&value=&start=&end=   series of one group
+    """
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .aggregates import AggregateIndex
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class LRUCache:
+    """Keeps the most recently used maxsize entries"""
+
+    def __init__(self, maxsize: int):
+        """Creates an empty cache.
+
+        Parameters
+        ----------
+        maxsize : int
+            Maximum number of entries.  0 disables the cache
+        """
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Value of key, marked as the most recently used
+
+        Parameters
+        ----------
+        key : Hashable
+            Key
+
+        Returns
+        -------
+        Optional[Any]
+            Value, or None if key is not cached
+        """
+        if key not in self._entries:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Hashable, value: Any):
+        """Caches value, evicting the least recently used entry if full
+
+        Parameters
+        ----------
+        key : Hashable
+            Key
+        value : Any
+            Value
+        """
+        if self._maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all entries"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Number of entries, hits and misses
+
+        Returns
+        -------
+        Dict[str, int]
+            'size', 'maxsize', 'hits' and 'misses'
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self._maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+class QueryService:
+    """Serves the queries of an AggregateIndex over HTTP.  Connections are kept alive
+    unless the client closes them, and the index is replaced in the background,
+    without blocking requests, when its sources change.
+    Queries are answered synchronously on the event loop, as they read aggregates
+    already in memory, so a slow query (e.g. /groups over many groups without
+    'limit') delays the requests of other connections until it is answered"""
+
+    def __init__(
+        self,
+        load_index: Callable[[], AggregateIndex],
+        cache_size: int = 1024,
+        reload_interval: float = 2.0,
+    ):
+        """Loads the index.
+
+        Parameters
+        ----------
+        load_index : Callable[[], AggregateIndex]
+            Function returning an AggregateIndex of the current aggregates
+        cache_size : int, optional
+            Number of answers kept in the LRU cache, by default 1024
+        reload_interval : float, optional
+            Seconds between checks for changes of the aggregates, by default 2.0.
+            0 disables the reload
+        """
+        self._load_index = load_index
+        self._index = load_index()
+        self._cache = LRUCache(cache_size)
+        self._reload_interval = reload_interval
+        self._reloads = 0
+        self._server = None
+        self._reload_task = None
+        self._routes = {
+            "/range": lambda index, params: index.range_query(**params),
+            "/period": lambda index, params: index.period_query(**params),
+            "/groups": lambda index, params: index.group_query(**params),
+        }
+
+    def get_index(self) -> AggregateIndex:
+        """Allows access to the contents of protected attribute _index
+
+        Returns
+        -------
+        AggregateIndex
+            Contents of _index
+        """
+        return self._index
+
+    def handle_query(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """Answers a query, from the cache if it was answered before with the
+            current index
+
+        Parameters
+        ----------
+        path : str
+            Endpoint
+        params : Dict[str, str]
+            Query parameters
+
+        Returns
+        -------
+        Tuple[int, Dict]
+            HTTP status and JSON body.  400 for invalid parameters, and 500 if the
+            query fails otherwise
+        """
+        if path == "/health":
+            return 200, {
+                "aggregates": self._index.describe(),
+                "cache": self._cache.stats(),
+                "reloads": self._reloads,
+            }
+        if path not in self._routes:
+            return 404, {"error": f"Unknown endpoint {path}"}
+
+        key = (path, tuple(sorted(params.items())))
+        answer = self._cache.get(key)
+        if answer is None:
+            try:
+                if "limit" in params:
+                    params = dict(params, limit=int(params["limit"]))
+                answer = (200, self._routes[path](self._index, params))
+            except (TypeError, ValueError) as exc:
+                answer = (400, {"error": str(exc)})
+            except Exception:  # pylint: disable=broad-except
+                # Not cached, so the query is tried again on the next request
+                logger.exception("Query %s %s failed", path, params)
+                return 500, {"error": _REASONS[500]}
+            self._cache.put(key, answer)
+        return answer
+
+    async def reload_if_stale(self) -> bool:
+        """Replaces the index if its sources changed.  The new index is loaded in a
+            thread, and the current one keeps answering meanwhile.  If loading fails
+            (e.g. a file being written), the current index is kept
+
+        Returns
+        -------
+        bool
+            True if the index was replaced
+        """
+        if not self._index.is_stale():
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            index = await loop.run_in_executor(None, self._load_index)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Reload of the aggregates failed", exc_info=True)
+            return False
+        self._index = index
+        self._cache.clear()
+        self._reloads += 1
+        logger.info("Aggregates reloaded from %s", index.get_sources())
+        return True
+
+    async def _reload_loop(self):
+        """Checks for changes of the aggregates every reload_interval seconds"""
+        while True:
+            await asyncio.sleep(self._reload_interval)
+            await self.reload_if_stale()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Answers the requests of a connection until the client closes it
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Stream of the requests
+        writer : asyncio.StreamWriter
+            Stream of the responses
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                keep_alive = headers.get("connection", "").lower() != "close" and (
+                    version == "HTTP/1.1"
+                    or headers.get("connection", "").lower() == "keep-alive"
+                )
+
+                if method != "GET":
+                    status, body = 405, {"error": f"Method {method} not allowed"}
+                else:
+                    url = urlsplit(target)
+                    status, body = self.handle_query(
+                        url.path, dict(parse_qsl(url.query))
+                    )
+
+                payload = json.dumps(body).encode("utf-8")
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                        "\r\n"
+                    ).encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080):
+        """Starts listening, and the reload of the index
+
+        Parameters
+        ----------
+        host : str, optional
+            Interface to listen on, by default only local connections
+        port : int, optional
+            Port, by default 8080.  0 picks a free port
+
+        Returns
+        -------
+        asyncio.Server
+            Server, whose sockets give the port in use
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        if self._reload_interval > 0:
+            self._reload_task = asyncio.create_task(self._reload_loop())
+        return self._server
+
+    async def stop(self):
+        """Stops listening and the reload of the index"""
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            self._reload_task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8080):
+        """Starts the service and serves until cancelled
+
+        Parameters
+        ----------
+        host : str, optional
+            Interface to listen on, by default only local connections
+        port : int, optional
+            Port, by default 8080
+        """
+        server = await self.start(host, port)
+        logger.info("Query service listening on %s", server.sockets[0].getsockname())
+        try:
+            await server.serve_forever()
+        finally:
+            await self.stop()
@@ -3,8 +3,9 @@ from the Kedro defaults. For further information, including these default values
 https://kedro.readthedocs.io/en/stable/kedro_project_setup/settings.html."""
 
 # Instantiated project hooks.
-# from species_observations.hooks import ProjectHooks
-# HOOKS = (ProjectHooks(),)
+from species_observations.hooks import ProjectHooks, TimingHooks
+
+HOOKS = (ProjectHooks(), TimingHooks())
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
@@ -37,8 +38,10 @@ from kedro.config import TemplatedConfigLoader  # new import
 
 CONFIG_LOADER_CLASS = TemplatedConfigLoader
 
-CONFIG_LOADER_ARGS = { "globals_pattern": "*vertexai.yml",
-                       "config_patterns": {"vertexai": ["vertexai*"]}}
+CONFIG_LOADER_ARGS = {
+    "globals_pattern": "*vertexai.yml",
+    "config_patterns": {"vertexai": ["vertexai*"]},
+}
 # Class that manages the Data Catalog.
 # from kedro.io import DataCatalog
 # DATA_CATALOG_CLASS = DataCatalog
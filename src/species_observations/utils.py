@@ -1,33 +1,276 @@
-"""Helper functions for various actions"""
-from typing import Dict, Tuple, Type
-import pandas as pd
-from kedro.io import PartitionedDataSet
-from kedro_datasets.pandas import CSVDataSet
-from kedro.config import ConfigLoader
-from kedro.framework.project import settings
-
-
-def partitioned_ds_to_df(pd_dict: Dict) -> pd.DataFrame:
-    """Converts data loaded with PartitionedDataSet into a single pandas dataframe
+"""Helper functions for various actions.
+    pandas, numpy, kedro.io, kedro.config and kedro.framework.project are imported by
+    the functions that use them, so importing this module (e.g. from settings.py, on every
+    kedro command) stays cheap.  See benchmarks/import_time_report.py
+"""
+# pylint: disable=import-outside-toplevel
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    from kedro.config import ConfigLoader
+
+
+def partitioned_ds_to_df(pd_dict: Dict, max_workers: int = None) -> pd.DataFrame:
+    """Converts data loaded with PartitionedDataSet into a single pandas dataframe.
+        Partitions are loaded concurrently by a bounded thread pool and concatenated
+        once, in the order of pd_dict
 
     Parameters
     ----------
     pd_dict : Dict
         Data loaded with PartitionedDataSet
+    max_workers : int, optional
+        Maximum number of partitions loaded at the same time,
+            by default None (ThreadPoolExecutor default)
 
     Returns
     -------
     pd.DataFrame
         Single dataframe with all data
     """
-    df_joined = pd.DataFrame()
-    for _, partition_load_func in pd_dict.items():
-        partition_data = partition_load_func()
-        df_joined = pd.concat([df_joined, partition_data], ignore_index=True, sort=True)
-    return df_joined
+    import pandas as pd
+
+    if not pd_dict:
+        return pd.DataFrame()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        partitions = list(executor.map(lambda load_func: load_func(), pd_dict.values()))
+    return pd.concat(partitions, ignore_index=True, sort=True)
+
+
+_FINGERPRINT_KEYS = [
+    "size",
+    "mtime",
+    "created",
+    "generation",
+    "etag",
+    "ETag",
+    "updated",
+]
+
+
+def partition_source(load_func: Callable) -> Optional[Tuple]:
+    """Recovers the file behind the load function of a partition given by
+        PartitionedDataSet
+
+    Parameters
+    ----------
+    load_func : Callable
+        Load function of the partition
+
+    Returns
+    -------
+    Optional[Tuple]
+        (filesystem, filepath, load_args) of the partition.
+        None if the partition is not backed by a file
+    """
+    # pylint: disable=protected-access
+    data_set = getattr(load_func, "__self__", None)
+    if not all(hasattr(data_set, attr) for attr in ["_fs", "_filepath", "_protocol"]):
+        return None
+    from kedro.io.core import get_filepath_str
+
+    filepath = get_filepath_str(data_set._filepath, data_set._protocol)
+    return data_set._fs, filepath, dict(getattr(data_set, "_load_args", {}))
 
 
-def load_partitioned_ds_kedro(path: str, dataset: Dict) -> pd.DataFrame:
+def partition_fingerprint(load_func: Callable) -> Optional[Dict]:
+    """Identifies the current version of a partition from the metadata of its file
+        (size, modification time, generation or etag), without loading it
+
+    Parameters
+    ----------
+    load_func : Callable
+        Load function of the partition, as given by PartitionedDataSet
+
+    Returns
+    -------
+    Optional[Dict]
+        Metadata of the file, as strings.  None if the partition is not backed by a file
+    """
+    source = partition_source(load_func)
+    if source is None:
+        return None
+    file_system, filepath, _ = source
+    info = file_system.info(filepath)
+    return {key: str(info[key]) for key in _FINGERPRINT_KEYS if key in info}
+
+
+def atomic_write(file_path: Path, write: Callable):
+    """Writes a file through a temporary file of the same folder, renamed when
+        complete, so the file is either the previous or the new version
+
+    Parameters
+    ----------
+    file_path : Path
+        File written
+    write : Callable
+        Function writing to the path it receives
+    """
+    temporary_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    try:
+        write(temporary_path)
+        os.replace(temporary_path, file_path)
+    finally:
+        if temporary_path.is_file():
+            os.remove(temporary_path)
+
+
+def content_fingerprint(df_in: pd.DataFrame) -> Dict:
+    """Identifies the contents of a dataframe with a hash of its values and index
+
+    Parameters
+    ----------
+    df_in : pd.DataFrame
+        Data to identify
+
+    Returns
+    -------
+    Dict
+        {'sha256': hash of the contents}
+    """
+    import pandas as pd
+
+    row_hashes = pd.util.hash_pandas_object(df_in, index=True).values
+    return {"sha256": hashlib.sha256(row_hashes.tobytes()).hexdigest()}
+
+
+def parse_dates_cached(dates: pd.Series, date_format: str = None) -> pd.Series:
+    """Converts a column of dates to datetime, parsing each distinct value only once
+        and broadcasting the result to all the rows with that value
+
+    Parameters
+    ----------
+    dates : pd.Series
+        Dates to be converted. Missing values are converted to NaT
+    date_format : str, optional
+        strftime format of the dates, by default None (format is inferred)
+
+    Returns
+    -------
+    pd.Series
+        Converted dates, with the index and name of dates
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(dates)
+    parsed = pd.to_datetime(uniques, format=date_format)
+    return pd.Series(
+        parsed.take(codes, allow_fill=True, fill_value=pd.NaT),
+        index=dates.index,
+        name=dates.name,
+    )
+
+
+def dates_from_components(
+    years: pd.Series, months: pd.Series, days: pd.Series, tz: str = None
+) -> pd.Series:
+    """Builds datetimes at midnight from year, month and day columns, converting
+        each distinct date only once
+
+    Parameters
+    ----------
+    years : pd.Series
+        Years
+    months : pd.Series
+        Months
+    days : pd.Series
+        Days
+    tz : str, optional
+        Time zone of the output, by default None
+
+    Returns
+    -------
+    pd.Series
+        Datetimes, with the index of years
+    """
+    import pandas as pd
+
+    date_keys = years.astype("int64") * 10000 + months.astype("int64") * 100 + days
+    codes, uniques = pd.factorize(date_keys.astype("int64"))
+    parsed = pd.DatetimeIndex(pd.to_datetime(uniques.astype(str), format="%Y%m%d"))
+    if tz is not None:
+        parsed = parsed.tz_localize(tz)
+    return pd.Series(parsed.take(codes), index=years.index)
+
+
+_ORDINAL_UNITS = {"D": "datetime64[D]", "M": "datetime64[M]"}
+
+
+def period_ordinals(dates: pd.Series, resample: str) -> np.ndarray:
+    """Converts datetimes to integer ordinals of their period: days or months since
+        1970-01-01, in the local time of the dates
+
+    Parameters
+    ----------
+    dates : pd.Series
+        Datetimes, without missing values
+    resample : str
+        'D' for days, 'M' for months
+
+    Returns
+    -------
+    np.ndarray
+        int64 ordinals
+    """
+    import pandas as pd
+
+    local_dates = pd.DatetimeIndex(dates).tz_localize(None)
+    return local_dates.values.astype(_ORDINAL_UNITS[resample]).astype("int64")
+
+
+def period_index(
+    first_ordinal: int, periods: int, resample: str, tz: str = None, name: str = None
+) -> pd.DatetimeIndex:
+    """Index of consecutive periods, labelled as by pd.DataFrame.resample():
+        the day itself for 'D' and the last day of the month for 'M'
+
+    Parameters
+    ----------
+    first_ordinal : int
+        Ordinal of the first period, as given by period_ordinals()
+    periods : int
+        Number of periods
+    resample : str
+        'D' for days, 'M' for months
+    tz : str, optional
+        Time zone of the index, by default None
+    name : str, optional
+        Name of the index, by default None
+
+    Returns
+    -------
+    pd.DatetimeIndex
+        Labels of the periods
+    """
+    import numpy as np
+    import pandas as pd
+
+    first_period = np.datetime64(int(first_ordinal), resample[0])
+    if resample == "M":
+        first_period = (first_period + 1).astype("datetime64[D]") - 1
+    return pd.date_range(
+        start=pd.Timestamp(first_period),
+        periods=periods,
+        freq=resample,
+        tz=tz,
+        name=name,
+    )
+
+
+def load_partitioned_ds_kedro(
+    path: str, dataset: Dict, load_args: Dict = None
+) -> pd.DataFrame:
     """Loads a partitioned data stored in the folder specified in path.
 
     Parameters
@@ -37,12 +280,21 @@ def load_partitioned_ds_kedro(path: str, dataset: Dict) -> pd.DataFrame:
     dataset : Dict
         Type of data to search for and load options
         (dataset option in kedro's catalog of type PartitionedDataSet)
+    load_args : Dict, optional
+        Load arguments added to those of each partition, by default None
+        e.g. Preprocessing.get_load_args()
 
     Returns
     -------
     pd.DataFrame
         joined dataset
     """
+    if load_args:
+        dataset = project_dataset_config(
+            {"type": "PartitionedDataSet", "dataset": dataset}, load_args
+        )["dataset"]
+    from kedro.io import PartitionedDataSet
+
     data_set = PartitionedDataSet(
         path=path,
         dataset=dataset,
@@ -53,23 +305,201 @@ def load_partitioned_ds_kedro(path: str, dataset: Dict) -> pd.DataFrame:
     return data_set.load()
 
 
-def load_config_file_kedro(kedro_env: str = "base") -> Dict:
-    """Loads kedro's yml files in the config folder as dictionaries
+def _dataset_target(ds_config: Dict) -> Dict:
+    """Configuration of the dataset that reads the files of a catalog entry:
+        the entry itself, or its 'dataset' for a PartitionedDataSet
+
+    Parameters
+    ----------
+    ds_config : Dict
+        Entry of the data catalog.  A string 'dataset' is converted to {'type': ...}
+
+    Returns
+    -------
+    Dict
+        Configuration of the dataset that reads the files
+    """
+    if str(ds_config["type"]).endswith("PartitionedDataSet"):
+        if not isinstance(ds_config["dataset"], dict):
+            ds_config["dataset"] = {"type": ds_config["dataset"]}
+        return ds_config["dataset"]
+    return ds_config
+
+
+def dataset_file_format(ds_config: Dict) -> Optional[str]:
+    """File format read by a catalog entry, also for partitions of a
+        PartitionedDataSet
+
+    Parameters
+    ----------
+    ds_config : Dict
+        Entry of the data catalog
+
+    Returns
+    -------
+    Optional[str]
+        'csv' or 'parquet'.  None for other types of dataset
+    """
+    target_type = _dataset_target(copy.deepcopy(ds_config))["type"]
+    if not isinstance(target_type, str):
+        target_type = target_type.__name__
+    target_type = target_type.lower()
+    for file_format in ["csv", "parquet"]:
+        if target_type.endswith(f"{file_format}dataset"):
+            return file_format
+    return None
+
+
+def project_dataset_config(ds_config: Dict, load_args: Dict) -> Dict:
+    """Adds load_args to the catalog configuration of a dataset, or of the
+        partitions of a PartitionedDataSet
+
+    Parameters
+    ----------
+    ds_config : Dict
+        Entry of the data catalog
+    load_args : Dict
+        Load arguments to add, e.g. {'usecols': [...], 'dtype': {...}}
+
+    Returns
+    -------
+    Dict
+        Copy of ds_config with the added load arguments
+    """
+    ds_config = copy.deepcopy(ds_config)
+    target = _dataset_target(ds_config)
+    target["load_args"] = {**target.get("load_args", {}), **load_args}
+    return ds_config
+
+
+def compact_dtypes(df_in: pd.DataFrame, exclude: List[str] = None) -> pd.DataFrame:
+    """Converts string columns to categoricals and downcasts integer columns
+
+    Parameters
+    ----------
+    df_in : pd.DataFrame
+        Data to convert
+    exclude : List[str], optional
+        Columns which are not converted, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        Converted data
+    """
+    import pandas as pd
+    from pandas.api.types import is_integer_dtype, is_object_dtype
+
+    for column in df_in.columns.difference(exclude or []):
+        if is_object_dtype(df_in[column]):
+            df_in[column] = df_in[column].astype("category")
+        elif is_integer_dtype(df_in[column]):
+            df_in[column] = pd.to_numeric(df_in[column], downcast="integer")
+    return df_in
+
+
+def arrow_column_type(dtype: str) -> pa.DataType:
+    """Arrow type parsed for a column given the pandas dtype of data_dtypes
+
+    Parameters
+    ----------
+    dtype : str
+        pandas dtype, e.g. 'str', 'category', 'float64'
+
+    Returns
+    -------
+    pa.DataType
+        Type given to the column by the CSV reader and in the staged Parquet
+        store.  Categories are dictionary encoded, and converted to pd.Categorical
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    dtype = str(dtype)
+    if dtype in ["str", "object", "string"]:
+        return pa.string()
+    if dtype == "category":
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.from_numpy_dtype(np.dtype(dtype))
+
+
+_CONFIG_CACHE: Dict[Tuple[str, str], Tuple[Tuple, ConfigLoader]] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+
+def _config_signature(conf_path: str, kedro_env: str) -> Tuple:
+    """Path, size and modification time of every file of the config folders read
+        for an environment: base and kedro_env
+
+    Parameters
+    ----------
+    conf_path : str
+        Folder of the config
+    kedro_env : str
+        Environment
+
+    Returns
+    -------
+    Tuple
+        (path, size, mtime) of every file, sorted by path
+    """
+    signature = []
+    for env in sorted({"base", kedro_env}):
+        for folder, _, files in os.walk(os.path.join(conf_path, env)):
+            for file_name in files:
+                path = os.path.join(folder, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(signature))
+
+
+def load_config_file_kedro(
+    kedro_env: str = "base", conf_source: str = None
+) -> ConfigLoader:
+    """Loads kedro's yml files in the config folder as dictionaries.
+        The config of each environment is cached, and parsed again only when a file
+        of its config folders is added, removed or modified
 
     Parameters
     ----------
     kedro_env : str, optional
         Environment from which the config files will be loaded, by default 'base'
+    conf_source : str, optional
+        Folder of the config, by default settings.CONF_SOURCE
 
     Returns
     -------
-    Dict
-        Configuration info as dictionary.
+    ConfigLoader
+        Configuration info, accessed as a dictionary.  A CachedConfigLoader, where
+        every access returns a copy.
             key 'catalog' returns the data catalog
             key 'parameters' returns pipeline parameters
     """
-    conf_path = str(settings.CONF_SOURCE)
-    return ConfigLoader(conf_source=conf_path, env=kedro_env)
+    from kedro.framework.project import settings
+
+    from species_observations.config_loader import CachedConfigLoader
+
+    conf_path = str(conf_source or settings.CONF_SOURCE)
+    cache_key = (os.path.abspath(conf_path), kedro_env)
+    signature = _config_signature(conf_path, kedro_env)
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is None or cached[0] != signature:
+            cached = (
+                signature,
+                CachedConfigLoader(conf_source=conf_path, env=kedro_env),
+            )
+            _CONFIG_CACHE[cache_key] = cached
+    return cached[1]
+
+
+def clear_config_cache():
+    """Empties the cache of load_config_file_kedro()"""
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE.clear()
 
 
 def load_pds_from_catalog(
@@ -187,6 +617,8 @@ def load_csv_from_filepath(filepath) -> pd.DataFrame:
     pd.DataFrame
         Loaded datafram
     """
+    from kedro_datasets.pandas import CSVDataSet
+
     data_set = CSVDataSet(filepath=filepath)
     return data_set.load()
 
@@ -204,6 +636,8 @@ def validates_dataframe(df_in: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame
         _description_
     """
+    import pandas as pd
+
     if isinstance(df_in, dict):
         df_in = partitioned_ds_to_df(df_in)
     if not isinstance(df_in, pd.DataFrame):
@@ -0,0 +1,53 @@
+"""Unit tests for the file arrow_batch_dataset.py"""
+from pathlib import Path
+
+import pytest
+import pandas as pd
+from kedro.io import DataSetError
+
+import species_observations.utils as utl
+from species_observations.extras.datasets.arrow_batch_dataset import (
+    ArrowRecordBatchDataSet,
+)
+from species_observations.pipelines.observations_time.nodes import (
+    node_preprocessing_time_data,
+)
+from species_observations.scripts.record_batches import LocalArrowBackend
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_arrow_record_batch_dataset(kedro_env: str, catalog_entry: str, tmp_path: Path):
+    """Test cases:
+            Loading gives a source of the local backend, without reading records
+            node_preprocessing_time_data gives the same output for the source and
+            for the dataframe of the same records
+            Saving and unknown backends raise DataSetError
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    parameters = utl.load_config_file_kedro(kedro_env=kedro_env)["parameters"]
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    filepath = tmp_path / "sample.parquet"
+    df_sample.to_parquet(filepath, index=False)
+
+    data_set = ArrowRecordBatchDataSet(
+        backend="local", backend_args={"path": str(filepath), "batch_size": 64}
+    )
+    source = data_set.load()
+    assert isinstance(source, LocalArrowBackend)
+    pd.testing.assert_frame_equal(
+        node_preprocessing_time_data(source, parameters),
+        node_preprocessing_time_data(df_sample, parameters),
+        check_freq=False,
+    )
+
+    with pytest.raises(DataSetError):
+        data_set.save(df_sample)
+    with pytest.raises(DataSetError):
+        ArrowRecordBatchDataSet(backend="unknown", backend_args={})
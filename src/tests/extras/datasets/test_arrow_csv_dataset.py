@@ -0,0 +1,148 @@
+"""Unit tests for the file arrow_csv_dataset.py"""
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+import pandas as pd
+from kedro.io import DataSetError
+
+import species_observations.utils as utl
+from species_observations.extras.datasets.arrow_csv_dataset import (
+    ArrowCSVDataSet,
+    arrow_column_type,
+)
+from species_observations.pipelines.observations_time.nodes import (
+    node_preprocessing_time_data,
+)
+from species_observations.scripts.data_processing import Preprocessing
+from species_observations.scripts.memory_budget import ChunkedPartitionReader
+
+ARROW_CSV_TYPE = (
+    "species_observations.extras.datasets.arrow_csv_dataset.ArrowCSVDataSet"
+)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_arrow_csv_dataset(kedro_env: str, catalog_entry: str):
+    """Test cases:
+            Partitions loaded with and without column projection are equal to
+            those loaded by pandas.CSVDataSet
+            node_preprocessing_time_data gives the same output
+            dtype_backend 'pyarrow' gives pd.ArrowDtype columns
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    """
+    parameters = utl.load_config_file_kedro(kedro_env=kedro_env)["parameters"]
+    load_args = Preprocessing(parameters).get_load_args()
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    arrow_dataset = {"type": ARROW_CSV_TYPE}
+
+    for partition_load_args in [None, load_args]:
+        pd_dict = utl.load_partitioned_ds_kedro(path, dataset, partition_load_args)
+        arrow_dict = utl.load_partitioned_ds_kedro(
+            path, arrow_dataset, partition_load_args
+        )
+        assert sorted(arrow_dict) == sorted(pd_dict)
+        for partition_name, load_func in pd_dict.items():
+            pd.testing.assert_frame_equal(arrow_dict[partition_name](), load_func())
+
+    pd.testing.assert_frame_equal(
+        node_preprocessing_time_data(arrow_dict, parameters),
+        node_preprocessing_time_data(pd_dict, parameters),
+    )
+
+    arrow_dict = utl.load_partitioned_ds_kedro(
+        path,
+        arrow_dataset,
+        {**load_args, "dtype_backend": "pyarrow", "block_size": 2**16},
+    )
+    df_arrow = next(iter(arrow_dict.values()))()
+    assert sorted(df_arrow.columns) == sorted(load_args["usecols"])
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df_arrow.dtypes)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_arrow_csv_dataset_chunks(kedro_env: str, catalog_entry: str):
+    """Test cases:
+            A partition of ArrowCSVDataSet larger than max_memory is read in
+            chunks by pandas, ignoring the arguments of the pyarrow reader
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    """
+    parameters = utl.load_config_file_kedro(kedro_env=kedro_env)["parameters"]
+    load_args = {
+        **Preprocessing(parameters).get_load_args(),
+        "use_threads": True,
+        "block_size": 2**16,
+    }
+    path, _ = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    arrow_dict = utl.load_partitioned_ds_kedro(
+        path, {"type": ARROW_CSV_TYPE}, load_args
+    )
+    load_func = next(iter(arrow_dict.values()))
+    reader = ChunkedPartitionReader(max_memory=1, sample_rows=100)
+    df_chunks = pd.concat(list(reader.iter_chunks(load_func)), ignore_index=True)
+    assert len(df_chunks) == len(load_func())
+    pd.testing.assert_frame_equal(
+        df_chunks[["individualcount"]], load_func()[["individualcount"]]
+    )
+
+
+def test_arrow_csv_dataset_errors(tmp_path: Path):
+    """Test cases:
+    Load arguments not supported raise DataSetError
+    A dtype_backend other than None or 'pyarrow' raises DataSetError
+    arrow_column_type gives the Arrow type of the dtypes of data_dtypes
+    """
+    filepath = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}).to_csv(filepath, index=False)
+
+    with pytest.raises(DataSetError):
+        ArrowCSVDataSet(filepath=str(filepath), load_args={"skiprows": 1}).load()
+    with pytest.raises(DataSetError):
+        ArrowCSVDataSet(
+            filepath=str(filepath), load_args={"dtype_backend": "numpy_nullable"}
+        ).load()
+
+    assert arrow_column_type("str") == pa.string()
+    assert arrow_column_type("float64") == pa.float64()
+    assert arrow_column_type("category") == pa.dictionary(pa.int32(), pa.string())
+
+
+def test_arrow_csv_dataset_empty_fields(tmp_path: Path):
+    """Test cases:
+    Empty fields, quoted or not, are loaded as missing values, as by
+    pandas.read_csv, with and without the types of data_dtypes
+    """
+    filepath = tmp_path / "data.csv"
+    filepath.write_text(
+        "species,countrycode,eventdate,individualcount\n"
+        'Pica pica,,2021-09-01 00:00:00 UTC,1\n,"",,\n'
+        '"",ES,2021-09-03 00:00:00 UTC,\nParus major,FR,"",2\n'
+    )
+    dtype = {
+        "species": "category",
+        "countrycode": "category",
+        "eventdate": "str",
+        "individualcount": "float64",
+    }
+    for load_args in [{}, {"usecols": list(dtype), "dtype": dtype}]:
+        df_arrow = ArrowCSVDataSet(filepath=str(filepath), load_args=load_args).load()
+        pd.testing.assert_frame_equal(df_arrow, pd.read_csv(filepath, **load_args))
+        assert df_arrow["species"].isna().sum() == 2
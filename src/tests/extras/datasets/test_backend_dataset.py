@@ -0,0 +1,86 @@
+"""Unit tests for the file backend_dataset.py"""
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+import pandas as pd
+
+from species_observations.extras.datasets.arrow_batch_dataset import (
+    ArrowRecordBatchDataSet,
+)
+from species_observations.extras.datasets.sql_backend_dataset import (
+    SQLBackendDataSet,
+)
+
+CREDENTIALS = {"token": "secret-token"}
+
+
+@pytest.mark.parametrize(
+    ("dataset_type", "backend", "backend_args"),
+    [
+        (ArrowRecordBatchDataSet, "local", {"path": "observations.parquet"}),
+        (SQLBackendDataSet, "sqlite", {"database": "observations.sqlite"}),
+        (SQLBackendDataSet, "duckdb", {}),
+    ],
+)
+def test_backend_dataset_credentials_ignored(
+    dataset_type: type, backend: str, backend_args: dict, tmp_path: Path
+):
+    """Test cases:
+            Backends which do not take credentials load with a catalog entry that
+            defines them
+            Credentials are not shown in the description of the dataset
+    Parameters
+    ----------
+    dataset_type : type
+        Subclass of BackendDataSet
+    backend : str
+        Backend without credentials
+    backend_args : dict
+        Arguments of the backend, with paths relative to tmp_path
+    tmp_path : Path
+        Folder of the data of the backend
+    """
+    df_data = pd.DataFrame({"individualcount": [1.0, 2.0]})
+    df_data.to_parquet(tmp_path / "observations.parquet")
+    with closing(sqlite3.connect(tmp_path / "observations.sqlite")) as connection:
+        df_data.to_sql("observations", connection, index=False)
+    backend_args = {key: str(tmp_path / value) for key, value in backend_args.items()}
+    if dataset_type is SQLBackendDataSet:
+        backend_args["table"] = (
+            "observations"
+            if backend == "sqlite"
+            else f"read_parquet('{(tmp_path / 'observations.parquet').as_posix()}')"
+        )
+
+    data_set = dataset_type(
+        backend=backend, backend_args=backend_args, credentials=CREDENTIALS
+    )
+    assert data_set.load() is not None
+    assert CREDENTIALS["token"] not in str(data_set)
+
+
+@pytest.mark.parametrize(
+    ("dataset_type", "backend_args"),
+    [
+        (ArrowRecordBatchDataSet, {"table": "project.dataset.table"}),
+        (SQLBackendDataSet, {"table": "project.dataset.table"}),
+    ],
+)
+def test_backend_dataset_credentials_bigquery(dataset_type: type, backend_args: dict):
+    """Test cases:
+            The bigquery backends receive the credentials of the catalog entry
+    Parameters
+    ----------
+    dataset_type : type
+        Subclass of BackendDataSet
+    backend_args : dict
+        Arguments of the bigquery backend
+    """
+    data_set = dataset_type(
+        backend="bigquery", backend_args=backend_args, credentials=CREDENTIALS
+    )
+    source = data_set.load()
+    assert getattr(source, "_credentials") == CREDENTIALS
+    assert CREDENTIALS["token"] not in str(data_set)
@@ -0,0 +1,111 @@
+"""Unit tests for the file cached_partitioned_dataset.py.  fsspec's in-memory
+filesystem stands in for GCS"""
+from pathlib import Path
+
+import fsspec
+import pytest
+import pandas as pd
+from kedro.io import DataSetError
+
+import species_observations.utils as utl
+from species_observations.extras.datasets.cached_partitioned_dataset import (
+    CachedPartitionedDataSet,
+)
+from species_observations.pipelines.observations_time.nodes import (
+    node_preprocessing_time_data,
+)
+
+
+@pytest.fixture
+def memory_bucket(tmp_path: Path):
+    """Empty folder of fsspec's in-memory filesystem, removed after the test"""
+    file_system = fsspec.filesystem("memory")
+    bucket = f"/bucket-{tmp_path.name}"
+    yield file_system, bucket
+    if file_system.exists(bucket):
+        file_system.rm(bucket, recursive=True)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_cached_partitioned_dataset(
+    kedro_env: str, catalog_entry: str, tmp_path: Path, memory_bucket, monkeypatch
+):
+    """Test cases:
+            Loading only lists the partitions, and each partition is downloaded
+            when it is loaded
+            Remote partitions are loaded from local copies, with the same output of
+            node_preprocessing_time_data as the original partitions
+            The file of a partition is the remote object, so it is fingerprinted
+            without downloading it
+            A second load downloads nothing, and a changed object is downloaded again
+            A cache without local folder raises DataSetError
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    """
+    parameters = utl.load_config_file_kedro(kedro_env=kedro_env)["parameters"]
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    file_system, bucket = memory_bucket
+    for local_file in sorted(Path(path).iterdir()):
+        file_system.pipe(f"{bucket}/raw/{local_file.name}", local_file.read_bytes())
+
+    downloads = []
+    get_file = type(file_system).get_file
+
+    def counting_get_file(self, rpath, lpath, **kwargs):
+        downloads.append(rpath)
+        return get_file(self, rpath, lpath, **kwargs)
+
+    monkeypatch.setattr(type(file_system), "get_file", counting_get_file)
+    cache_path = tmp_path / "cache"
+
+    def load():
+        return CachedPartitionedDataSet(
+            path=f"memory://{bucket}/raw",
+            dataset=dataset,
+            cache={"path": str(cache_path), "max_workers": 2},
+        ).load()
+
+    ds_dict = load()
+    assert sorted(ds_dict) == sorted(file.name for file in Path(path).iterdir())
+    assert downloads == []
+    first = sorted(ds_dict)[0]
+    ds_dict[first]()
+    assert len(downloads) == 1
+    assert all(
+        utl.partition_source(load_func)[1] == f"{bucket}/raw/{partition_name}"
+        for partition_name, load_func in ds_dict.items()
+    )
+    assert utl.partition_fingerprint(ds_dict[first])["size"]
+    assert len(downloads) == 1
+    pd.testing.assert_frame_equal(
+        node_preprocessing_time_data(ds_dict, parameters),
+        node_preprocessing_time_data(
+            utl.load_partitioned_ds_kedro(path, dataset), parameters
+        ),
+    )
+
+    assert len(downloads) == len(ds_dict)
+    assert len(list(cache_path.iterdir())) == len(ds_dict)
+
+    downloads.clear()
+    for load_func in load().values():
+        load_func()
+    assert downloads == []
+
+    changed = sorted(ds_dict)[0]
+    df_changed = ds_dict[changed]().head(10)
+    file_system.pipe(f"{bucket}/raw/{changed}", df_changed.to_csv(index=False).encode())
+    ds_dict = load()
+    pd.testing.assert_frame_equal(ds_dict[changed](), df_changed)
+    assert len(downloads) == 1
+
+    with pytest.raises(DataSetError):
+        CachedPartitionedDataSet(path=path, dataset=dataset, cache={})
@@ -0,0 +1,37 @@
+"""Unit tests for the file count_store_dataset.py"""
+from pathlib import Path
+
+import pytest
+import pandas as pd
+from kedro.io import DataSetError
+
+from species_observations.extras.datasets.count_store_dataset import (
+    CountStoreDataSet,
+)
+
+
+def test_count_store_dataset_save_load(tmp_path: Path):
+    """Test cases:
+            A series with an index frequency is saved and loaded as a CountStore
+            Raises DataSetError if the resampling period is unknown
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    """
+    counts = pd.Series(
+        [1.0, 0.0, 3.0],
+        index=pd.date_range("2021-01-01", periods=3, freq="D", tz="UTC"),
+        name="individualcount",
+    )
+    data_set = CountStoreDataSet(filepath=str(tmp_path / "store"))
+    assert not data_set.exists()
+    data_set.save(counts)
+
+    store = data_set.load()
+    assert store.get_resample() == "D"
+    assert store.total("2021-01-02", "2021-01-03") == 3.0
+    pd.testing.assert_series_equal(store.counts(), counts, check_freq=False)
+
+    with pytest.raises(DataSetError):
+        data_set.save(counts.iloc[[0, 2]])
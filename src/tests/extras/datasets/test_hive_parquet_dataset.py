@@ -0,0 +1,58 @@
+"""Unit tests for the file hive_parquet_dataset.py"""
+from pathlib import Path
+
+import pytest
+import pandas as pd
+
+from species_observations.extras.datasets.hive_parquet_dataset import (
+    HiveParquetDataSet,
+)
+
+
+@pytest.fixture
+def df_sample() -> pd.DataFrame:
+    """Small dataframe with partition columns"""
+    return pd.DataFrame(
+        {
+            "year": [2021, 2021, 2022],
+            "month": [1, 2, 1],
+            "individualcount": [1.0, 2.0, 3.0],
+        }
+    )
+
+
+def test_hive_parquet_dataset_save_load(tmp_path: Path, df_sample: pd.DataFrame):
+    """Test cases:
+            Data is saved in one folder per partition value
+            Saving replaces the previous contents of the store
+            Partitions given as functions are saved as well
+            load_args -> filters only reads the selected partitions
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    df_sample : pd.DataFrame
+        Data to save
+    """
+    filepath = str(tmp_path / "store")
+    data_set = HiveParquetDataSet(
+        filepath=filepath, save_args={"partition_cols": ["year", "month"]}
+    )
+    data_set.save(df_sample)
+    data_set.save({"part_1": df_sample, "part_2": lambda: df_sample})
+
+    assert (tmp_path / "store" / "year=2021" / "month=2").is_dir()
+    assert (
+        data_set.load()["individualcount"].sum()
+        == 2 * df_sample["individualcount"].sum()
+    )
+
+    filtered = HiveParquetDataSet(
+        filepath=filepath,
+        load_args={
+            "columns": ["individualcount"],
+            "filters": [[("year", "=", 2021), ("month", "=", 1)]],
+        },
+    ).load()
+    assert list(filtered.columns) == ["individualcount"]
+    assert list(filtered["individualcount"]) == [1.0, 1.0]
@@ -0,0 +1,59 @@
+"""Unit tests for the file sql_backend_dataset.py"""
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+import pandas as pd
+from kedro.io import DataCatalog, DataSetError
+from kedro.runner import SequentialRunner
+
+import species_observations.utils as utl
+from species_observations.extras.datasets.sql_backend_dataset import (
+    SQLBackendDataSet,
+)
+from species_observations.pipelines.observations_time import create_pushdown_pipeline
+from species_observations.pipelines.observations_time.nodes import (
+    node_preprocessing_time_data,
+)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_sql_backend_dataset_pipeline(
+    kedro_env: str, catalog_entry: str, tmp_path: Path
+):
+    """Test cases:
+            The pushdown pipeline, reading a SQLite table through the dataset,
+            gives the same resampled_data as node_preprocessing_time_data
+            Saving and unknown backends raise DataSetError
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    parameters = utl.load_config_file_kedro(kedro_env=kedro_env)["parameters"]
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    database = tmp_path / "observations.sqlite"
+    with closing(sqlite3.connect(database)) as connection:
+        df_sample.to_sql("observations", connection, index=False)
+
+    data_set = SQLBackendDataSet(
+        backend="sqlite",
+        backend_args={"database": str(database), "table": "observations"},
+    )
+    catalog = DataCatalog({"species_data_sql": data_set})
+    catalog.add_feed_dict({"parameters": parameters})
+    outputs = SequentialRunner().run(create_pushdown_pipeline(), catalog)
+    pd.testing.assert_frame_equal(
+        outputs["resampled_data"],
+        node_preprocessing_time_data(df_sample, parameters),
+    )
+
+    with pytest.raises(DataSetError):
+        data_set.save(df_sample)
+    with pytest.raises(DataSetError):
+        SQLBackendDataSet(backend="unknown", backend_args={})
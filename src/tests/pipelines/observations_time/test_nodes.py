@@ -1,11 +1,25 @@
 """
 Unit tests for node functions of pipeline observations_time
 """
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
 import pytest
 import pandas as pd
 
 import species_observations.utils as utl
 import species_observations.pipelines.observations_time.nodes as nd
+from species_observations.extras.datasets.hive_parquet_dataset import (
+    HiveParquetDataSet,
+)
+from species_observations.pipelines.observations_time.pipeline import (
+    create_staging_pipeline,
+)
+from species_observations.scripts.data_processing import Preprocessing
 
 
 @pytest.mark.parametrize(
@@ -54,3 +68,232 @@ def node_preprocessing_time_data_nan(kedro_env: str, catalog_entry: str):
     df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
     df_resampled = nd.node_preprocessing_time_data(df_sample, parameters)
     assert df_resampled.isna().sum().sum() == 0
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "date_range", "expected_months"),
+    [
+        ("test_cloud", "preprocessing", {"start": None, "end": None}, None),
+        ("test_cloud", "preprocessing", {"start": "2021-09", "end": "2021-10"}, 2),
+    ],
+)
+def test_node_stage_raw_parquet(
+    kedro_env: str,
+    catalog_entry: str,
+    date_range: Dict,
+    expected_months: int,
+    tmp_path,
+):
+    """Test cases:
+        Resampling the Parquet store gives the same output as the raw partitions
+        within 'date_range'
+        Only the required columns are read from the store
+        The store keeps all the raw columns, as the input of the staging pipeline
+        is not projected
+
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    date_range : Dict
+        Months read from the store
+    expected_months : int
+        Number of months of the output.  None for all of them
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    parameters[catalog_entry]["date_range"] = date_range
+    prep = Preprocessing(parameters)
+
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+    filepath = str(tmp_path / "staged")
+    HiveParquetDataSet(
+        filepath=filepath, save_args={"partition_cols": ["year", "month"]}
+    ).save(nd.node_stage_raw_parquet(ds_dict, parameters))
+
+    df_staged = HiveParquetDataSet(
+        filepath=filepath, load_args=prep.get_load_args("parquet")
+    ).load()
+    assert sorted(df_staged.columns) == sorted(prep.get_required_columns())
+    df_store = HiveParquetDataSet(filepath=filepath).load()
+    assert set(utl.validates_dataframe(ds_dict).columns) <= set(df_store.columns)
+    projection = parameters[catalog_entry]["column_projection"]
+    assert not set(create_staging_pipeline().inputs()) & set(
+        projection["datasets"] + projection["grouped_datasets"]
+    )
+
+    df_resampled = nd.node_preprocessing_time_data(df_staged, parameters)
+    df_expected = nd.node_preprocessing_time_data(ds_dict, parameters)
+    if expected_months is not None:
+        months = df_resampled.index.year * 12 + df_resampled.index.month
+        assert months.nunique() == expected_months
+        assert df_resampled.index.min() >= pd.Timestamp(date_range["start"], tz="UTC")
+        df_expected = df_expected.loc[
+            df_resampled.index.min() : df_resampled.index.max()
+        ]
+    pd.testing.assert_frame_equal(df_resampled, df_expected, check_freq=False)
+
+
+PROJECT_FOLDER = Path(__file__).resolve().parents[4]
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "n_shards"), [("test_cloud", "preprocessing", 3)]
+)
+def test_sharded_pipelines(
+    kedro_env: str, catalog_entry: str, n_shards: int, tmp_path: Path
+):
+    """Test cases:
+            n_shards processes run the pipeline observations_time_shard against a
+            local data folder, each with a different shard.  The pipeline
+            observations_time_shard_merge then writes the same resampled data as
+            node_preprocessing_time_data
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The CSV to be used as test data is specified catalog_entry
+        as tests -> csv_sample_catalog
+    n_shards : int
+        Number of shards, and of processes
+    tmp_path : Path
+        Folder of the config, raw partitions and outputs
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    raw_folder = tmp_path / "raw"
+    raw_folder.mkdir()
+    for part, df_part in df_sample.groupby(df_sample.index % 8):
+        df_part.to_csv(raw_folder / f"part-{part}.csv", index=False)
+
+    conf_folder = tmp_path / "conf"
+    shutil.copytree(PROJECT_FOLDER / "conf" / "base", conf_folder / "base")
+    (conf_folder / "shard_test").mkdir()
+    (conf_folder / "shard_test" / "catalog.yml").write_text(
+        f"""
+species_data:
+  type: PartitionedDataSet
+  path: {raw_folder.as_posix()}
+  dataset: pandas.CSVDataSet
+resampled_data_shards:
+  type: PartitionedDataSet
+  path: {(tmp_path / "shards").as_posix()}
+  dataset: pickle.PickleDataSet
+  filename_suffix: ".pkl"
+resampled_data:
+  type: pandas.CSVDataSet
+  filepath: {(tmp_path / "resampled.csv").as_posix()}
+  save_args:
+    index: True
+""",
+        encoding="utf-8",
+    )
+
+    (conf_folder / "shard_test" / "parameters.yml").write_text(
+        f"""
+monitoring:
+  enabled: True
+  jsonl_path: {(tmp_path / "timings.jsonl").as_posix()}
+  prometheus_path: {(tmp_path / "timings.prom").as_posix()}
+""",
+        encoding="utf-8",
+    )
+
+    # The replicas run the package of this checkout, also when it is not installed
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in [str(PROJECT_FOLDER / "src"), env.get("PYTHONPATH")] if path
+    )
+
+    def kedro_run(pipeline_name: str, params: str = None) -> subprocess.Popen:
+        args = [sys.executable, "-m", "species_observations", "--env", "shard_test"]
+        args += ["--conf-source", str(conf_folder), "--pipeline", pipeline_name]
+        if params is not None:
+            args += ["--params", params]
+        return subprocess.Popen(
+            args,
+            cwd=PROJECT_FOLDER,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    replicas = [
+        kedro_run(
+            "observations_time_shard",
+            f"{catalog_entry}.sharding.shard:{shard_index}/{n_shards}",
+        )
+        for shard_index in range(n_shards)
+    ]
+    for replica in replicas:
+        output, _ = replica.communicate(timeout=300)
+        assert replica.returncode == 0, output.decode()
+    assert len(list((tmp_path / "shards").iterdir())) == n_shards
+
+    merge = kedro_run("observations_time_shard_merge")
+    output, _ = merge.communicate(timeout=300)
+    assert merge.returncode == 0, output.decode()
+
+    df_merged = pd.read_csv(tmp_path / "resampled.csv", index_col=0)
+    df_expected = nd.node_preprocessing_time_data(df_sample, parameters)
+    assert list(df_merged.index) == [str(period) for period in df_expected.index]
+    assert df_merged.iloc[:, 0].tolist() == df_expected.iloc[:, 0].tolist()
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_node_stage_raw_parquet_null_columns(
+    kedro_env: str, catalog_entry: str, tmp_path
+):
+    """Test cases:
+        A partition whose grouping columns have only missing values is staged with
+        the same types as the other partitions, so the whole store can be loaded
+        The grouped aggregation of the store ignores the rows of that partition
+
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = Preprocessing(parameters)
+    group_cols = [
+        parameters["data_cols"][key] for key in ["species", "family", "country_code"]
+    ]
+
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+    df_null = utl.validates_dataframe(ds_dict)
+    df_null[group_cols] = float("nan")
+    filepath = str(tmp_path / "staged")
+    HiveParquetDataSet(
+        filepath=filepath, save_args={"partition_cols": ["year", "month"]}
+    ).save(nd.node_stage_raw_parquet({**ds_dict, "null": lambda: df_null}, parameters))
+
+    df_store = HiveParquetDataSet(filepath=filepath).load()
+    assert len(df_store) == 2 * len(df_null)
+    for column in group_cols:
+        assert isinstance(df_store[column].dtype, pd.CategoricalDtype)
+        assert df_store[column].isna().sum() >= len(df_null)
+
+    df_grouped = prep.grouped_time_aggregation(df_store)
+    df_expected = prep.grouped_time_aggregation(ds_dict)
+    pd.testing.assert_frame_equal(
+        df_grouped.reset_index(drop=True),
+        df_expected.reset_index(drop=True),
+        check_categorical=False,
+    )
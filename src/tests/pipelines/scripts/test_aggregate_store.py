@@ -0,0 +1,128 @@
+"""Unit tests for the file aggregate_store.py"""
+from pathlib import Path
+
+import pytest
+import pandas as pd
+
+from species_observations.scripts.aggregate_store import PartialAggregateStore
+
+
+@pytest.fixture
+def df_partial() -> pd.DataFrame:
+    """Partial aggregate of a partition"""
+    return pd.DataFrame(
+        {"individualcount": [1.0, 2.0]},
+        index=pd.DatetimeIndex(
+            ["2021-01-01", "2021-01-02"], tz="UTC", name="eventdate_datetime"
+        ),
+    )
+
+
+@pytest.mark.parametrize(("partition_name"), [("part(1).csv"), ("2021/part.csv")])
+def test_partial_aggregate_store_round_trip(
+    tmp_path: Path, df_partial: pd.DataFrame, partition_name: str
+):
+    """Test cases:
+            A saved partial is current for its fingerprint only, and is loaded unchanged
+            The manifest is reloaded by a new store with the same parameters_key
+            Stored partials are ignored for a different parameters_key
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    df_partial : pd.DataFrame
+        Partial aggregate of a partition
+    partition_name : str
+        Name of the partition
+    """
+    fingerprint = {"size": "10", "mtime": "1.0"}
+    store = PartialAggregateStore(tmp_path, "key")
+    store.save_partial(partition_name, fingerprint, df_partial)
+    store.save_manifest()
+
+    reloaded = PartialAggregateStore(tmp_path, "key")
+    assert reloaded.names() == [partition_name]
+    assert reloaded.is_current(partition_name, fingerprint)
+    assert not reloaded.is_current(partition_name, {"size": "11", "mtime": "1.0"})
+    pd.testing.assert_frame_equal(reloaded.load_partial(partition_name), df_partial)
+
+    assert PartialAggregateStore(tmp_path, "other_key").names() == []
+
+
+def test_partial_aggregate_store_remove(tmp_path: Path, df_partial: pd.DataFrame):
+    """Test cases:
+            Removing a partition deletes its partial and its manifest entry
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    df_partial : pd.DataFrame
+        Partial aggregate of a partition
+    """
+    store = PartialAggregateStore(tmp_path, "key")
+    store.save_partial("part_1", {"size": "1"}, df_partial)
+    store.save_partial("part_2", {"size": "2"}, df_partial)
+    store.remove("part_1")
+    store.save_manifest()
+
+    assert PartialAggregateStore(tmp_path, "key").names() == ["part_2"]
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+
+def test_partial_aggregate_store_checkpoints(tmp_path: Path, df_partial: pd.DataFrame):
+    """Test cases:
+            A new version of a partition does not overwrite the committed one,
+            which is deleted when the manifest is written
+            A partial whose file is missing is not current
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    df_partial : pd.DataFrame
+        Partial aggregate of a partition
+    """
+    store = PartialAggregateStore(tmp_path, "key")
+    store.save_partial("part_1", {"size": "1"}, df_partial)
+    store.save_manifest()
+    store.save_partial("part_1", {"size": "2"}, df_partial * 2)
+
+    committed = PartialAggregateStore(tmp_path, "key")
+    assert committed.is_current("part_1", {"size": "1"})
+    pd.testing.assert_frame_equal(committed.load_partial("part_1"), df_partial)
+
+    store.save_manifest()
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+    assert not list(tmp_path.glob("*.tmp"))
+    for file_path in tmp_path.glob("*.pkl"):
+        file_path.unlink()
+    assert not PartialAggregateStore(tmp_path, "key").is_current(
+        "part_1", {"size": "2"}
+    )
+
+
+def test_partial_aggregate_store_clean(tmp_path: Path, df_partial: pd.DataFrame):
+    """Test cases:
+            Partials not in the manifest and temporary files are stale
+            Every file is stale for a different parameters_key
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    df_partial : pd.DataFrame
+        Partial aggregate of a partition
+    """
+    store = PartialAggregateStore(tmp_path, "key")
+    store.save_partial("part_1", {"size": "1"}, df_partial)
+    store.save_manifest()
+    store.save_partial("part_2", {"size": "2"}, df_partial)
+    (tmp_path / "manifest.json.123.tmp").write_text("{", encoding="utf-8")
+
+    reloaded = PartialAggregateStore(tmp_path, "key")
+    assert len(reloaded.stale_files()) == 2
+    assert len(PartialAggregateStore(tmp_path, "other_key").stale_files()) == 4
+    assert reloaded.clean() != []
+    assert reloaded.stale_files() == []
+    assert reloaded.is_current("part_1", {"size": "1"})
+
+    PartialAggregateStore(tmp_path, "other_key").clean()
+    assert not list(tmp_path.iterdir())
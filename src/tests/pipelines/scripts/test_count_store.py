@@ -0,0 +1,143 @@
+"""Unit tests for the file count_store.py"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+import pandas as pd
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+from species_observations.scripts.count_store import (
+    HEADER_FILE,
+    CountStore,
+    write_count_store,
+)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample", "start", "end"),
+    [
+        ("test_cloud", "preprocessing", "D", "2021-03-10", "2021-06-20"),
+        ("test_cloud", "preprocessing", "M", "2021-03-10", "2021-06-20"),
+        ("test_cloud", "preprocessing", "D", "1990-01-01", "2100-01-01"),
+        ("test_cloud", "preprocessing", "D", "2100-01-01", "2100-12-31"),
+    ],
+)
+def test_count_store(
+    tmp_path: Path,
+    kedro_env: str,
+    catalog_entry: str,
+    resample: str,
+    start: str,
+    end: str,
+):
+    """Test cases:
+            counts() of a date range is the same as slicing the resampled data
+            total() of a date range is the same as summing the slice
+            Ranges outside of the stored periods are clipped
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    resample : str
+        Resampling period
+    start : str
+        First date of the range
+    end : str
+        Last date of the range
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+
+    df_sample = prep.preprocessing_time_data(
+        utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    )
+    counts = prep.resampled_counts(prep.time_resampling(df_sample, resample=resample))
+    write_count_store(tmp_path, counts, resample)
+
+    store = CountStore(tmp_path)
+    assert len(store) == len(counts)
+    pd.testing.assert_series_equal(store.counts(), counts)
+
+    tz = counts.index.tz
+    first = pd.Timestamp(start).to_period(resample).start_time.tz_localize(tz)
+    last = pd.Timestamp(end).to_period(resample).end_time.tz_localize(tz)
+    expected = counts[(counts.index >= first) & (counts.index <= last)]
+    pd.testing.assert_series_equal(
+        store.counts(start, end), expected, check_freq=False, check_index_type=False
+    )
+    assert store.total(start, end) == pytest.approx(expected.sum())
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_count_store_rewrite(tmp_path: Path, kedro_env: str, catalog_entry: str):
+    """Test cases:
+            Rewriting a store replaces its files, so a reader opened before keeps
+            the previous arrays, and a new reader gets the new ones
+            No temporary files are left
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    prep = dtp.Preprocessing(config["parameters"])
+    df_sample = prep.preprocessing_time_data(
+        utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    )
+    counts = prep.resampled_counts(prep.time_resampling(df_sample, resample="D"))
+    write_count_store(tmp_path, counts, "D")
+    store = CountStore(tmp_path)
+
+    counts_new = counts.iloc[: len(counts) // 2] * 2
+    write_count_store(tmp_path, counts_new, "D")
+    pd.testing.assert_series_equal(store.counts(), counts)
+    pd.testing.assert_series_equal(CountStore(tmp_path).counts(), counts_new)
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # A header read before a rewrite references arrays that are not modified
+    header = json.loads((tmp_path / HEADER_FILE).read_text(encoding="utf-8"))
+    write_count_store(tmp_path, counts, "D")
+    old_counts = np.fromfile(tmp_path / header["files"]["counts"], dtype="<f8")
+    assert old_counts.tolist() == counts_new.tolist()
+    assert len(list(tmp_path.glob("counts.*.f8"))) == 2
+    pd.testing.assert_series_equal(CountStore(tmp_path).counts(), counts)
+
+
+def test_count_store_legacy_header(tmp_path: Path):
+    """Test cases:
+            A store whose header has no 'files' is read from counts.f8 and cumsum.f8
+            Rewriting it removes these files once they are not referenced
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the store
+    """
+    counts = pd.Series(
+        [1.0, 2.0], index=pd.date_range("2021-01-01", periods=2, freq="D")
+    )
+    write_count_store(tmp_path, counts, "D")
+    header = json.loads((tmp_path / HEADER_FILE).read_text(encoding="utf-8"))
+    for key, file_name in [("counts", "counts.f8"), ("cumsum", "cumsum.f8")]:
+        (tmp_path / header["files"].pop(key)).rename(tmp_path / file_name)
+    del header["files"]
+    (tmp_path / HEADER_FILE).write_text(json.dumps(header), encoding="utf-8")
+
+    assert CountStore(tmp_path).counts().tolist() == [1.0, 2.0]
+    assert CountStore(tmp_path).total() == 3.0
+    write_count_store(tmp_path, counts * 2, "D")
+    write_count_store(tmp_path, counts * 3, "D")
+    assert not (tmp_path / "counts.f8").exists()
+    assert CountStore(tmp_path).counts().tolist() == [3.0, 6.0]
@@ -1,10 +1,15 @@
 """Unit tests for the file data_processing.py"""
+import shutil
+from typing import List
+
 import pytest
+import pandas as pd
 from pandas.api.types import is_datetime64_any_dtype as is_datetime
 from monthdelta import monthdelta
 
 import species_observations.utils as utl
 import species_observations.scripts.data_processing as dtp
+from species_observations.scripts.aggregate_store import PartialAggregateStore
 
 
 @pytest.mark.parametrize(
@@ -31,6 +36,9 @@ def test_preprocessing_class_attributes(kedro_env: str, catalog_entry: str):
     type_mapping = {
         "str": str,
         "dict": dict,
+        "bool": bool,
+        "int": int,
+        "list": list,
     }  # Add types as needed
     name_types = utl.attribute_names_types(
         parameters[catalog_entry]["tests"]["member_variables"], prep, type_mapping
@@ -269,3 +277,616 @@ def test_time_resampling_val_error(kedro_env: str, catalog_entry: str, resample:
     # Index is datetime?
     with pytest.raises(ValueError):
         df_out = prep.time_resampling(df_sample, resample=resample)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample"),
+    [("test_cloud", "preprocessing", "D"), ("test_cloud", "preprocessing", "M")],
+)
+def test_streaming_time_resampling(kedro_env: str, catalog_entry: str, resample: str):
+    """Test cases:
+            Streaming aggregation of partitioned data gives the same output as
+            concatenating all partitions before resampling
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+
+    df_serial = prep.time_resampling(
+        prep.preprocessing_time_data(ds_dict), resample=resample
+    )
+    df_streaming = prep.streaming_time_resampling(ds_dict, resample=resample)
+    pd.testing.assert_frame_equal(df_streaming, df_serial)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_merge_time_aggregations_empty(kedro_env: str, catalog_entry: str):
+    """Test cases:
+            Merging no partial aggregates gives an empty dataframe with the
+            count column and a datetime index
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+
+    df_out = prep.merge_time_aggregations([])
+    assert df_out.empty
+    assert is_datetime(df_out.index)
+    assert list(df_out.columns) == [parameters["data_cols"]["individual_count"]]
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "n_workers"),
+    [("test_cloud", "preprocessing", 2), ("test_cloud", "preprocessing", 3)],
+)
+def test_streaming_time_resampling_parallel(
+    kedro_env: str, catalog_entry: str, n_workers: int
+):
+    """Test cases:
+            Aggregating partitions in a process pool gives exactly the same output
+            as aggregating them in the current process
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    n_workers : int
+        Number of worker processes
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+
+    df_serial = prep.streaming_time_resampling(ds_dict, n_workers=1)
+    df_parallel = prep.streaming_time_resampling(ds_dict, n_workers=n_workers)
+    pd.testing.assert_frame_equal(df_parallel, df_serial)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "date_format"),
+    [
+        ("test_cloud", "preprocessing", "%Y-%m-%d %H:%M:%S %Z"),
+        ("test_cloud", "preprocessing", "%d/%m/%Y"),
+    ],
+)
+def test_parse_event_dates(kedro_env: str, catalog_entry: str, date_format: str):
+    """Test cases:
+            Dates are the same as with pd.to_datetime, at daily resolution, whether
+            they follow 'date_format' or are built from the year, month and day columns
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    date_format : str
+        Format of the dates given in the parameters
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    parameters[catalog_entry]["date_format"] = date_format
+    prep = dtp.Preprocessing(parameters)
+
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    dates = prep.parse_event_dates(df_sample).dt.floor("D")
+    expected = pd.to_datetime(df_sample[prep.get_date_col()]).dt.floor("D")
+    assert (dates == expected).all()
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_incremental_time_resampling(
+    kedro_env: str, catalog_entry: str, tmp_path, monkeypatch
+):
+    """Test cases:
+            Output is the same as the streaming resampling after new, changed and
+            removed partitions
+            Only new or changed partitions are aggregated again
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+
+    sample_path, dataset = utl.load_pds_from_catalog(
+        kedro_env, config_entry=catalog_entry
+    )
+    raw_path = tmp_path / "raw"
+    shutil.copytree(sample_path, raw_path)
+    store_path = tmp_path / "store"
+
+    aggregated = []
+    aggregate = dtp.Preprocessing.partition_time_aggregation
+
+    def counting_aggregate(self, df_partition, resample=None):
+        aggregated.append(len(df_partition))
+        return aggregate(self, df_partition, resample)
+
+    monkeypatch.setattr(
+        dtp.Preprocessing, "partition_time_aggregation", counting_aggregate
+    )
+
+    def check_run(expected_aggregations: int):
+        ds_dict = utl.load_partitioned_ds_kedro(str(raw_path), dataset)
+        aggregated.clear()
+        df_incremental = prep.incremental_time_resampling(
+            ds_dict, store_path=str(store_path), n_workers=1
+        )
+        assert len(aggregated) == expected_aggregations
+        pd.testing.assert_frame_equal(
+            df_incremental, prep.streaming_time_resampling(ds_dict, n_workers=1)
+        )
+
+    partition_files = sorted(raw_path.iterdir())
+    check_run(len(partition_files))
+    check_run(0)
+
+    shutil.copy(partition_files[0], raw_path / "new_partition.csv")
+    check_run(1)
+
+    df_changed = pd.read_csv(partition_files[1], index_col=0).iloc[:100]
+    df_changed.to_csv(partition_files[1])
+    check_run(1)
+
+    partition_files[2].unlink()
+    check_run(0)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_incremental_time_resampling_resume(
+    kedro_env: str, catalog_entry: str, tmp_path, monkeypatch
+):
+    """Test cases:
+            A run interrupted after aggregating some partitions keeps their
+            checkpoints, and the resumed run only aggregates the other partitions
+            The output of the resumed run is the same as the streaming resampling
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    prep = dtp.Preprocessing(config["parameters"])
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+    store_path = tmp_path / "store"
+
+    aggregated = []
+    aggregate = dtp._aggregate_partition  # pylint: disable=protected-access
+
+    def interrupted_aggregate(*args, **kwargs):
+        if len(aggregated) == 1:
+            raise MemoryError("Interrupted run")
+        aggregated.append(args[1])
+        return aggregate(*args, **kwargs)
+
+    monkeypatch.setattr(dtp, "_aggregate_partition", interrupted_aggregate)
+    with pytest.raises(MemoryError):
+        prep.incremental_time_resampling(ds_dict, store_path=str(store_path))
+    store = PartialAggregateStore(store_path, prep.get_parameters_key())
+    assert store.names() == sorted(ds_dict)[:1]
+    assert store.stale_files() == []
+
+    def counting_aggregate(*args, **kwargs):
+        aggregated.append(args[1])
+        return aggregate(*args, **kwargs)
+
+    aggregated.clear()
+    monkeypatch.setattr(dtp, "_aggregate_partition", counting_aggregate)
+    df_resumed = prep.incremental_time_resampling(
+        ds_dict, store_path=str(store_path), n_workers=1
+    )
+    assert len(aggregated) == len(ds_dict) - 1
+    pd.testing.assert_frame_equal(
+        df_resumed, prep.streaming_time_resampling(ds_dict, n_workers=1)
+    )
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample", "entry_name"),
+    [
+        ("test_cloud", "preprocessing", "D", "csv_sample_catalog"),
+        ("test_cloud", "preprocessing", "M", "csv_sample_catalog"),
+        (
+            "test_cloud",
+            "preprocessing",
+            "D",
+            "csv_sample_catalog_preprocessed_stage_01",
+        ),
+        (
+            "test_cloud",
+            "preprocessing",
+            "M",
+            "csv_sample_catalog_preprocessed_stage_01",
+        ),
+    ],
+)
+def test_time_resampling_numpy_engine(
+    kedro_env: str, catalog_entry: str, resample: str, entry_name: str
+):
+    """Test cases:
+            The numpy engine gives the same output as the pandas engine
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+    entry_name : str
+        Entry within catalog_entry -> tests with the CSV used as test data.
+        Raw data is preprocessed before resampling
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+
+    df_sample = utl.load_csv_from_catalog(
+        kedro_env, config_entry=catalog_entry, entry_name=entry_name
+    )
+    if entry_name == "csv_sample_catalog":
+        df_sample = prep.preprocessing_time_data(df_sample)
+
+    df_pandas = prep.time_resampling(df_sample.copy(), resample, engine="pandas")
+    df_numpy = prep.time_resampling(df_sample.copy(), resample, engine="numpy")
+    pd.testing.assert_frame_equal(df_numpy, df_pandas)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample", "tz"),
+    [
+        ("test_cloud", "preprocessing", "D", None),
+        ("test_cloud", "preprocessing", "M", None),
+        ("test_cloud", "preprocessing", "D", "America/Bogota"),
+        ("test_cloud", "preprocessing", "M", "America/Bogota"),
+    ],
+)
+def test_time_resampling_numpy_engine_edges(
+    kedro_env: str, catalog_entry: str, resample: str, tz: str
+):
+    """Test cases:
+            The numpy engine gives the same output as the pandas engine with missing
+            dates and counts, times at the end of the month and different time zones
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+    tz : str
+        Time zone of the dates
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+    date_col_datetime = prep.get_date_col() + prep.get_datetime_suffix()
+
+    dates = pd.to_datetime(
+        ["2021-01-31 23:30", None, "2021-03-01 00:00", "2020-12-31 10:00"]
+    ).tz_localize(tz)
+    df_sample = pd.DataFrame(
+        {
+            parameters["data_cols"]["individual_count"]: [1.0, 5.0, None, 2.0],
+            date_col_datetime: dates,
+        }
+    )
+    df_pandas = prep.time_resampling(df_sample.copy(), resample, engine="pandas")
+    df_numpy = prep.time_resampling(df_sample.copy(), resample, engine="numpy")
+    # pandas drops the frequency of the index when there are missing dates
+    pd.testing.assert_frame_equal(df_numpy, df_pandas, check_freq=False)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "engine"),
+    [("test_cloud", "preprocessing", "polars")],
+)
+def test_time_resampling_engine_error(kedro_env: str, catalog_entry: str, engine: str):
+    """Test cases:
+            Raises ValueError if the engine is not valid, in the constructor and
+            in time_resampling
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    engine : str
+        Invalid resampling engine
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+    df_sample = utl.load_csv_from_catalog(
+        kedro_env,
+        config_entry=catalog_entry,
+        entry_name="csv_sample_catalog_preprocessed_stage_01",
+    )
+    with pytest.raises(ValueError):
+        prep.time_resampling(df_sample, engine=engine)
+
+    parameters[catalog_entry]["resampling_engine"] = engine
+    with pytest.raises(ValueError):
+        dtp.Preprocessing(parameters)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "base_resample", "periods"),
+    [
+        ("test_cloud", "preprocessing", "D", ["D", "W", "M", "Q", "A"]),
+        ("test_cloud", "preprocessing", "M", ["M", "Q", "A"]),
+    ],
+)
+def test_time_rollups(
+    kedro_env: str, catalog_entry: str, base_resample: str, periods: List[str]
+):
+    """Test cases:
+            Every rollup is the same as resampling the raw data to its period
+            The base aggregate can be given indexed or as loaded from a CSV
+            With 'rollup_periods' null, the periods are all those derivable from
+            the base
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    base_resample : str
+        Resampling period of the base aggregate
+    periods : List[str]
+        Rollup periods
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+    date_col_datetime = prep.get_date_col() + prep.get_datetime_suffix()
+
+    df_sample = prep.preprocessing_time_data(
+        utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    )
+    df_base = prep.time_resampling(df_sample.copy(), resample=base_resample)
+    df_base_csv = df_base.reset_index().astype({date_col_datetime: "str"})
+
+    df_rollups = prep.time_rollups(df_base, base_resample=base_resample)
+    assert sorted(df_rollups["resampling_period"].unique()) == sorted(periods)
+
+    for df_in in [df_base, df_base_csv]:
+        df_rollups = prep.time_rollups(df_in, periods, base_resample=base_resample)
+        assert sorted(df_rollups["resampling_period"].unique()) == sorted(periods)
+        for period in periods:
+            df_period = df_rollups[df_rollups["resampling_period"] == period]
+            df_expected = df_sample.set_index(date_col_datetime).resample(period).sum()
+            pd.testing.assert_frame_equal(
+                df_period.drop(columns="resampling_period").set_index(
+                    date_col_datetime
+                ),
+                df_expected,
+                check_freq=False,
+            )
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "base_resample", "periods"),
+    [
+        ("test_cloud", "preprocessing", "M", ["W"]),
+        ("test_cloud", "preprocessing", "M", ["D"]),
+        ("test_cloud", "preprocessing", "D", ["X"]),
+    ],
+)
+def test_time_rollups_error(
+    kedro_env: str, catalog_entry: str, base_resample: str, periods: List[str]
+):
+    """Test cases:
+            Raises ValueError for periods that can not be derived from the base
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    base_resample : str
+        Resampling period of the base aggregate
+    periods : List[str]
+        Rollup periods
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+    df_base = utl.load_csv_from_catalog(
+        kedro_env,
+        config_entry=catalog_entry,
+        entry_name="csv_sample_catalog_preprocessed_stage_01",
+    )
+    with pytest.raises(ValueError):
+        prep.time_rollups(df_base, periods, base_resample=base_resample)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample", "keys", "max_cells"),
+    [
+        ("test_cloud", "preprocessing", "D", ["species"], None),
+        (
+            "test_cloud",
+            "preprocessing",
+            "M",
+            ["species", "family", "country_code"],
+            None,
+        ),
+        ("test_cloud", "preprocessing", "D", ["species", "country_code"], 1),
+    ],
+)
+def test_grouped_time_aggregation(
+    kedro_env: str,
+    catalog_entry: str,
+    resample: str,
+    keys: List[str],
+    max_cells: int,
+    monkeypatch,
+):
+    """Test cases:
+            Same sums as pd.DataFrame.groupby() over the groups and resampled dates
+            Only (group, period) cells with observations are returned
+            Grouping columns are categoricals
+            Same output when the cell ids would overflow int64
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    resample : str
+        Resampling period
+    keys : List[str]
+        Keys of 'data_cols' of the grouping columns
+    max_cells : int
+        Cells which can be identified by an int64.  None for the actual limit
+    """
+    if max_cells is not None:
+        monkeypatch.setattr(dtp, "MAX_CELLS", max_cells)
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+    date_col_datetime = prep.get_date_col() + prep.get_datetime_suffix()
+    group_cols = [parameters["data_cols"][key] for key in keys]
+    count_col = parameters["data_cols"]["individual_count"]
+
+    df_raw = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    df_grouped = prep.grouped_time_aggregation(df_raw.copy(), keys, resample)
+
+    df_expected = df_raw.assign(
+        **{
+            date_col_datetime: prep.parse_event_dates(df_raw),
+            count_col: df_raw[count_col].fillna(0),
+        }
+    )
+    df_expected = (
+        df_expected.groupby(
+            group_cols + [pd.Grouper(key=date_col_datetime, freq=resample)],
+            observed=True,
+        )[count_col]
+        .sum()
+        .reset_index()
+    )
+    assert len(df_grouped) == len(
+        df_grouped.drop_duplicates(group_cols + [date_col_datetime])
+    )
+    for column in group_cols:
+        assert isinstance(df_grouped[column].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        df_grouped.astype({column: str for column in group_cols}),
+        df_expected.astype({column: str for column in group_cols}),
+    )
+
+
+ORIGINAL_ITER_CHUNKS = dtp.ChunkedPartitionReader.iter_chunks
+
+
+def counted_chunks(self, load_func):
+    """ChunkedPartitionReader.iter_chunks, keeping the size of every chunk"""
+    for df_chunk in ORIGINAL_ITER_CHUNKS(self, load_func):
+        counted_chunks.sizes.append(len(df_chunk))
+        yield df_chunk
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample", "max_memory", "n_workers"),
+    [
+        ("test_cloud", "preprocessing", "D", "20KB", 1),
+        ("test_cloud", "preprocessing", "M", "20KB", 1),
+        ("test_cloud", "preprocessing", "D", "1GB", 1),
+        ("test_cloud", "preprocessing", "D", "20KB", 2),
+    ],
+)
+def test_streaming_time_resampling_max_memory(
+    monkeypatch,
+    kedro_env: str,
+    catalog_entry: str,
+    resample: str,
+    max_memory: str,
+    n_workers: int,
+):
+    """Test cases:
+            With 'max_memory', partitions exceeding it are read in chunks, and the
+            output is the same as concatenating all partitions before resampling
+            Partitions within the budget are read whole
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        Lowers the minimum chunk size, so the sample partitions are chunked
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+    max_memory : str
+        Memory budget
+    n_workers : int
+        Number of worker processes
+    """
+    monkeypatch.setattr(dtp.ChunkedPartitionReader, "iter_chunks", counted_chunks)
+    monkeypatch.setattr(
+        "species_observations.scripts.memory_budget.MIN_CHUNK_ROWS", 100
+    )
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    parameters[catalog_entry]["max_memory"] = max_memory
+    prep = dtp.Preprocessing(parameters)
+
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+    df_serial = prep.time_resampling(
+        prep.preprocessing_time_data(ds_dict), resample=resample
+    )
+
+    counted_chunks.sizes = []
+    df_budget = prep.streaming_time_resampling(
+        ds_dict, resample=resample, n_workers=n_workers
+    )
+    pd.testing.assert_frame_equal(df_budget, df_serial)
+    if n_workers == 1:
+        expected_chunks = 3 if max_memory == "1GB" else 30
+        assert len(counted_chunks.sizes) == expected_chunks
@@ -0,0 +1,164 @@
+"""Unit tests for the file engines.py.  Every execution engine must give the same
+output as the pandas engine"""
+import pytest
+import pandas as pd
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+
+ENGINES = ["pandas", "polars", "duckdb"]
+
+
+def engine_resampling(
+    prep: dtp.Preprocessing, engine: str, df_raw, resample: str
+) -> pd.DataFrame:
+    """Resamples df_raw with engine, skipping the test if it is not installed
+
+    Parameters
+    ----------
+    prep : dtp.Preprocessing
+        Preprocessing of the test parameters
+    engine : str
+        'pandas', 'polars' or 'duckdb'
+    df_raw : pd.DataFrame or dict of dataframes loaded from partitioned data
+        Raw data
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+
+    Returns
+    -------
+    pd.DataFrame
+        Resampled data
+    """
+    if engine == "pandas":
+        return prep.time_resampling(
+            prep.preprocessing_time_data(df_raw), resample=resample
+        )
+    pytest.importorskip(engine)
+    return prep.engine_time_resampling(df_raw, resample=resample, engine=engine)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_engine_expected_output(kedro_env: str, catalog_entry: str, engine: str):
+    """Test cases:
+            Daily resampling of the CSV sample gives the expected output stored in
+            tests -> resampled_sample_catalog
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    engine : str
+        Execution engine
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    prep = dtp.Preprocessing(config["parameters"])
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+
+    df_engine = engine_resampling(prep, engine, df_sample, "D")
+    df_expected = utl.load_csv_from_catalog(
+        kedro_env, config_entry=catalog_entry, entry_name="resampled_sample_catalog"
+    )
+    index_col = df_expected.columns[0]
+    df_expected = df_expected.set_index(
+        pd.DatetimeIndex(pd.to_datetime(df_expected.pop(index_col)), name=index_col)
+    )
+    pd.testing.assert_frame_equal(df_engine, df_expected, check_freq=False)
+
+
+@pytest.mark.parametrize("engine", ENGINES[1:])
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample"),
+    [("test_cloud", "preprocessing", "D"), ("test_cloud", "preprocessing", "M")],
+)
+def test_engine_partitioned(
+    kedro_env: str, catalog_entry: str, resample: str, engine: str
+):
+    """Test cases:
+            The partitions of local CSV files are scanned by the engine, with the
+            same output as the pandas engine
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+    engine : str
+        Execution engine
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    prep = dtp.Preprocessing(config["parameters"])
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+    assert dtp._local_csv_files(ds_dict)  # pylint: disable=protected-access
+
+    df_engine = engine_resampling(prep, engine, ds_dict, resample)
+    df_expected = engine_resampling(prep, "pandas", ds_dict, resample)
+    pd.testing.assert_frame_equal(df_engine, df_expected, check_freq=False)
+
+
+@pytest.mark.parametrize("engine", ENGINES[1:])
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample"),
+    [("test_cloud", "preprocessing", "D"), ("test_cloud", "preprocessing", "M")],
+)
+def test_engine_missing_values(
+    kedro_env: str, catalog_entry: str, resample: str, engine: str
+):
+    """Test cases:
+            Rows without date are dropped and missing counts are zeros, as in the
+            pandas engine
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+    engine : str
+        Execution engine
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    prep = dtp.Preprocessing(config["parameters"])
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    count_col = config["parameters"]["data_cols"]["individual_count"]
+    df_sample.loc[df_sample.index[:5], prep.get_date_col()] = None
+    df_sample.loc[df_sample.index[5:10], count_col] = None
+
+    df_engine = engine_resampling(prep, engine, df_sample.copy(), resample)
+    df_expected = engine_resampling(prep, "pandas", df_sample.copy(), resample)
+    pd.testing.assert_frame_equal(df_engine, df_expected, check_freq=False)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_execution_engine_error(kedro_env: str, catalog_entry: str):
+    """Test cases:
+            An engine which is not defined raises ValueError
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    parameters[catalog_entry]["execution_engine"] = "spark"
+    with pytest.raises(ValueError):
+        dtp.Preprocessing(parameters)
+    parameters[catalog_entry]["execution_engine"] = "pandas"
+    with pytest.raises(ValueError):
+        dtp.Preprocessing(parameters).engine_time_resampling(
+            pd.DataFrame(), engine="pandas"
+        )
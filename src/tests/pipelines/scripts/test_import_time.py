@@ -0,0 +1,81 @@
+"""Unit tests for the file import_time.py, and import-time budgets of the package"""
+from pathlib import Path
+
+import pytest
+
+from species_observations.scripts.import_time import (
+    heavy_modules_imported,
+    measure_command,
+    parse_importtime,
+)
+
+PROJECT_FOLDER = str(Path(__file__).resolve().parents[4])
+
+
+def test_parse_importtime():
+    """Test cases:
+    Records are read with their depth, and other lines are ignored
+    """
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     pandas.core",
+            "import time:       300 |        420 |   pandas",
+            "import time:        10 |        430 | species_observations.utils",
+            "Usage: species-observations [OPTIONS]",
+        ]
+    )
+    records = parse_importtime(stderr)
+    assert [record["module"] for record in records] == [
+        "pandas.core",
+        "pandas",
+        "species_observations.utils",
+    ]
+    assert [record["depth"] for record in records] == [2, 1, 0]
+    assert records[1]["cumulative_us"] == 420
+    assert heavy_modules_imported(records) == ["pandas"]
+
+
+@pytest.mark.parametrize(
+    ("args", "budget_seconds"),
+    [
+        (["-c", "import species_observations"], 0.25),
+        (["-c", "import species_observations.utils"], 0.15),
+        (["-c", "import species_observations.settings"], 1.0),
+        (["-m", "species_observations", "--help"], 1.5),
+        (["-m", "species_observations.service", "--help"], 0.5),
+    ],
+)
+def test_import_time_budget(args, budget_seconds):
+    """Test cases:
+            The command succeeds without importing pandas, numpy, pyarrow or
+            kedro_datasets
+            The cumulative time of its imports, best of 3 runs, is within budget.
+            Budgets are about twice the measures of benchmarks/import_time_report.py
+    Parameters
+    ----------
+    args : List[str]
+        Arguments of python
+    budget_seconds : float
+        Maximum import time
+    """
+    measure = measure_command(args, repeats=3, cwd=PROJECT_FOLDER)
+    assert measure["returncode"] == 0
+    assert heavy_modules_imported(measure["records"]) == []
+    assert measure["import_seconds"] <= budget_seconds
+
+
+def test_utils_import_without_kedro():
+    """Test cases:
+    Importing species_observations.utils does not import kedro, whose modules are
+    imported by the functions of utils that use them
+    """
+    measure = measure_command(
+        ["-c", "import species_observations.utils"], cwd=PROJECT_FOLDER
+    )
+    assert measure["returncode"] == 0
+    assert not [
+        record["module"]
+        for record in measure["records"]
+        if record["module"].split(".")[0] == "kedro"
+    ]
@@ -0,0 +1,62 @@
+"""Unit tests for the file memory_budget.py"""
+import pytest
+
+from species_observations.scripts.memory_budget import (
+    MemoryMonitor,
+    parse_memory_size,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        (1024, 1024),
+        ("512MB", 512 * 10**6),
+        ("2 GiB", 2 * 2**30),
+        ("1.5gb", 1_500_000_000),
+    ],
+)
+def test_parse_memory_size(value, expected):
+    """Test cases:
+            Bytes and sizes with decimal or binary units are converted to bytes
+    Parameters
+    ----------
+    value : Union[int, str, None]
+        Memory size
+    expected : Optional[int]
+        Bytes
+    """
+    assert parse_memory_size(value) == expected
+
+
+@pytest.mark.parametrize(("value"), [("10XB"), ("GB"), ("-1MB")])
+def test_parse_memory_size_error(value: str):
+    """Test cases:
+            Raises ValueError for invalid sizes
+    Parameters
+    ----------
+    value : str
+        Invalid memory size
+    """
+    with pytest.raises(ValueError):
+        parse_memory_size(value)
+
+
+def test_memory_monitor():
+    """Test cases:
+    Every stage is reported once, in order of first use, with its total time
+    Peak traced memory includes the allocations of the stage
+    Items of iterate() are produced within their stage
+    """
+    with MemoryMonitor(trace=True) as monitor:
+        for item in monitor.iterate("load", range(3)):
+            with monitor.stage("process"):
+                data = bytearray(10**6 * (item + 1))
+            del data
+
+    report = monitor.report()
+    assert list(report) == ["load", "process"]
+    assert report["process"]["peak_traced_bytes"] >= 3 * 10**6
+    assert report["process"]["peak_rss_bytes"] > 0
+    assert all(stage["seconds"] >= 0 for stage in report.values())
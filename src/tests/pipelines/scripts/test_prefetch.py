@@ -0,0 +1,136 @@
+"""Unit tests for the file prefetch.py"""
+import time
+
+import pytest
+import pandas as pd
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+from species_observations.scripts.prefetch import Prefetcher
+
+
+def test_prefetcher_order():
+    """Test cases:
+    Items are yielded in order.  Every iteration iterates over the items again,
+    so an iterator is read only once
+    """
+    prefetcher = Prefetcher(range(10), depth=3)
+    assert list(prefetcher) == list(range(10))
+    assert prefetcher.stats()["items"] == 10
+    assert list(prefetcher) == list(range(10))
+    prefetcher = Prefetcher(iter(range(10)), depth=3)
+    assert list(prefetcher) == list(range(10))
+    assert list(prefetcher) == []
+
+
+@pytest.mark.parametrize("depth", [1, 3])
+def test_prefetcher_back_pressure(depth: int):
+    """Test cases:
+            With slow processing, the reader blocks once depth items wait in the
+            queue, and its blocked time is measured as load_stall_seconds
+    Parameters
+    ----------
+    depth : int
+        Items read ahead
+    """
+    loaded, processed, ahead = [], [], []
+
+    def items():
+        for item in range(8):
+            loaded.append(item)
+            ahead.append(len(loaded) - len(processed))
+            yield item
+
+    prefetcher = Prefetcher(items(), depth=depth)
+    for item in prefetcher:
+        time.sleep(0.02)
+        processed.append(item)
+    assert processed == list(range(8))
+    # being processed, in the queue, and read by the blocked reader
+    assert max(ahead) <= depth + 2
+    assert prefetcher.stats()["load_stall_seconds"] > 0.05
+
+
+def test_prefetcher_overlap():
+    """Test cases:
+    Reading and processing overlap, so the iteration takes less than their sum,
+    and processing waiting for slow reads is measured as process_stall_seconds
+    """
+
+    def slow_items():
+        for item in range(8):
+            time.sleep(0.04)
+            yield item
+
+    start = time.perf_counter()
+    prefetcher = Prefetcher(slow_items(), depth=2)
+    for _ in prefetcher:
+        time.sleep(0.03)
+    elapsed = time.perf_counter() - start
+    stats = prefetcher.stats()
+    assert elapsed < 0.9 * (stats["load_seconds"] + stats["process_seconds"])
+    assert stats["process_stall_seconds"] > 0.02
+
+
+def test_prefetcher_errors():
+    """Test cases:
+    Errors of the reader are raised by the iteration, after the previous items.
+    Stopping the iteration early stops the reader, and a depth lower than 1
+    raises ValueError
+    """
+
+    def failing_items():
+        yield 1
+        raise OSError("Read failed")
+
+    received = []
+    with pytest.raises(OSError):
+        for item in Prefetcher(failing_items(), depth=2):
+            received.append(item)
+    assert received == [1]
+
+    loaded = []
+
+    def items():
+        for item in range(1000):
+            loaded.append(item)
+            yield item
+
+    for item in Prefetcher(items(), depth=2):
+        if item == 3:
+            break
+    assert len(loaded) <= 3 + 1 + 3
+
+    with pytest.raises(ValueError):
+        Prefetcher(range(3), depth=0)
+
+
+@pytest.mark.parametrize("prefetch_depth", [0, 1, 4])
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_streaming_prefetch(kedro_env: str, catalog_entry: str, prefetch_depth: int):
+    """Test cases:
+            Streaming resampling gives the same output with or without prefetch
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    prefetch_depth : int
+        Partitions loaded ahead
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    parameters[catalog_entry]["prefetch_depth"] = prefetch_depth
+    prep = dtp.Preprocessing(parameters)
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+
+    df_expected = prep.time_resampling(prep.preprocessing_time_data(ds_dict))
+    pd.testing.assert_frame_equal(
+        prep.streaming_time_resampling(ds_dict, n_workers=1), df_expected
+    )
@@ -0,0 +1,120 @@
+"""Unit tests for the file record_batches.py"""
+from pathlib import Path
+
+import pytest
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+from species_observations.scripts.record_batches import (
+    BigQueryStorageBackend,
+    LocalArrowBackend,
+)
+
+
+def write_sample_files(df_sample: pd.DataFrame, folder: Path, file_format: str):
+    """Writes df_sample split in two Arrow IPC or Parquet files
+
+    Parameters
+    ----------
+    df_sample : pd.DataFrame
+        Raw data
+    folder : Path
+        Folder of the files
+    file_format : str
+        'ipc' or 'parquet'
+    """
+    folder.mkdir()
+    half = len(df_sample) // 2
+    for number, df_part in enumerate([df_sample.iloc[:half], df_sample.iloc[half:]]):
+        table = pa.Table.from_pandas(df_part, preserve_index=False)
+        if file_format == "ipc":
+            feather.write_feather(table, folder / f"part_{number}.arrow")
+        else:
+            df_part.to_parquet(folder / f"part_{number}.parquet", index=False)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "file_format"),
+    [
+        ("test_cloud", "preprocessing", "ipc"),
+        ("test_cloud", "preprocessing", "parquet"),
+    ],
+)
+def test_local_arrow_backend(
+    kedro_env: str, catalog_entry: str, file_format: str, tmp_path: Path
+):
+    """Test cases:
+            The file format is inferred from the files of the folder
+            Batches have at most batch_size rows and only the requested columns
+            Every iteration reads all the records again
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    file_format : str
+        'ipc' or 'parquet'
+    """
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    write_sample_files(df_sample, tmp_path / "raw", file_format)
+
+    source = LocalArrowBackend(str(tmp_path / "raw"), batch_size=100)
+    assert source.describe()["file_format"] == file_format
+    assert set(source.get_schema().names) == set(df_sample.columns)
+
+    columns = ["eventdate", "individualcount"]
+    batches = list(source.iter_batches(columns=columns))
+    assert all(batch.num_rows <= 100 for batch in batches)
+    assert all(batch.schema.names == columns for batch in batches)
+    assert sum(batch.num_rows for batch in batches) == len(df_sample)
+    assert sum(batch.num_rows for batch in source) == len(df_sample)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample"),
+    [("test_cloud", "preprocessing", "D"), ("test_cloud", "preprocessing", "M")],
+)
+def test_record_batch_time_resampling(
+    kedro_env: str, catalog_entry: str, resample: str, tmp_path: Path
+):
+    """Test cases:
+            Aggregating the records batch by batch gives the same output as
+            resampling the whole dataframe
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    prep = dtp.Preprocessing(config["parameters"])
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    write_sample_files(df_sample, tmp_path / "raw", "parquet")
+
+    source = LocalArrowBackend(str(tmp_path / "raw"), batch_size=50)
+    df_batches = prep.record_batch_time_resampling(source, resample=resample)
+    df_expected = prep.time_resampling(
+        prep.preprocessing_time_data(df_sample.copy()), resample=resample
+    )
+    pd.testing.assert_frame_equal(df_batches, df_expected, check_freq=False)
+
+
+def test_backend_errors(tmp_path: Path):
+    """Test cases:
+    Raises ValueError for unknown file formats, and for BigQuery sources
+    without a table or a query, or with both
+    """
+    (tmp_path / "data.csv").write_text("a\n1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        LocalArrowBackend(str(tmp_path / "data.csv"))
+    with pytest.raises(ValueError):
+        BigQueryStorageBackend()
+    with pytest.raises(ValueError):
+        BigQueryStorageBackend(table="project.dataset.table", query="SELECT 1")
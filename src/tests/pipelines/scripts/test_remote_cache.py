@@ -0,0 +1,75 @@
+"""Unit tests for the file remote_cache.py.  The local filesystem stands in for
+GCS"""
+import os
+import pickle
+from pathlib import Path
+
+import fsspec
+
+from species_observations.scripts.remote_cache import RemoteFileCache, object_version
+
+
+def test_object_version():
+    """Test cases:
+    The generation or etag identifies a version, otherwise the size and
+    modification time
+    """
+    assert object_version({"generation": "17", "etag": "abc", "size": 1}) == (
+        "generation=17"
+    )
+    assert object_version({"ETag": '"abc"', "size": 1}) == 'ETag="abc"'
+    assert object_version({"size": 1, "mtime": 2.5}) == "size=1,mtime=2.5"
+
+
+def test_remote_file_cache_lru(tmp_path: Path):
+    """Test cases:
+            Cached files keep the contents and extension of the remote files
+            Once the cache exceeds max_size, the least recently used files are
+            evicted, but not the file fetched nor the files in use
+            The cache does not exceed max_size when no file is in use
+            A changed remote file gets a new cache file
+            The cache can be pickled, e.g. for the workers of 'parallel'
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the remote files and of the cache
+    """
+    remote_folder = tmp_path / "remote"
+    remote_folder.mkdir()
+    for name in ["a", "b", "c"]:
+        (remote_folder / f"{name}.csv").write_bytes(name.encode() * 100)
+    file_system = fsspec.filesystem("file")
+    cache = RemoteFileCache(tmp_path / "cache", max_size=250, max_workers=2)
+
+    def fetch(name: str) -> Path:
+        remote_path = str(remote_folder / f"{name}.csv")
+        return cache.fetch(file_system, remote_path, file_system.info(remote_path))
+
+    def cache_size() -> int:
+        return sum(file.stat().st_size for file in cache.get_path().iterdir())
+
+    file_a = fetch("a")
+    assert file_a.read_bytes() == b"a" * 100 and file_a.suffix == ".csv"
+    file_b = fetch("b")
+    os.utime(file_a, (1, 1))
+    os.utime(file_b, (2, 2))
+    fetch("c")
+    assert not file_a.exists() and file_b.exists()
+    assert cache_size() <= 250
+
+    remote_path = str(remote_folder / "b.csv")
+    with cache.use(file_system, remote_path, file_system.info(remote_path)) as used:
+        os.utime(used, (1, 1))
+        fetch("a")
+        fetch("c")
+        assert used.exists() and cache_size() == 200
+    fetch("a")
+    assert not used.exists() and cache_size() <= 250
+
+    (remote_folder / "a.csv").write_bytes(b"new")
+    os.utime(remote_folder / "a.csv", (10, 10))
+    file_new = fetch("a")
+    assert file_new != file_a and file_new.read_bytes() == b"new"
+
+    cache_copy = pickle.loads(pickle.dumps(cache))
+    assert cache_copy.get_path() == cache.get_path()
@@ -0,0 +1,109 @@
+"""Unit tests for the file sharding.py"""
+import pytest
+import pandas as pd
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+from species_observations.scripts.sharding import (
+    complete_shards,
+    parse_shard,
+    select_shard,
+    shard_name,
+    shard_of,
+)
+
+
+def test_parse_shard():
+    """Test cases:
+    'i/N' is read as (i, N), None is not sharded, and other values raise ValueError
+    """
+    assert parse_shard("0/4") == (0, 4)
+    assert parse_shard(" 3 / 4 ") == (3, 4)
+    assert parse_shard(None) is None
+    for shard in ["4/4", "-1/4", "1", "a/b", "1/0"]:
+        with pytest.raises(ValueError):
+            parse_shard(shard)
+
+
+def test_select_shard():
+    """Test cases:
+    Every partition belongs to exactly one shard, and the assignment does not
+    depend on the order of the partitions
+    """
+    names = [
+        f"year={year}/part-{part}.csv"
+        for year in range(2000, 2024)
+        for part in range(5)
+    ]
+    pd_dict = {name: name for name in names}
+    n_shards = 4
+    shards = [
+        select_shard(pd_dict, shard_index, n_shards) for shard_index in range(n_shards)
+    ]
+    assert sorted(name for shard in shards for name in shard) == sorted(names)
+    assert all(shards)
+    reversed_dict = dict(reversed(list(pd_dict.items())))
+    assert set(select_shard(reversed_dict, 1, n_shards)) == set(shards[1])
+    assert shard_of(names[0], n_shards) == shard_of(names[0], n_shards)
+
+
+def test_complete_shards():
+    """Test cases:
+    Shards are sorted by index.  Missing shards, shards of different runs and
+    names which are not shards raise ValueError
+    """
+    names = [shard_name(shard_index, 3) for shard_index in [2, 0, 1]]
+    assert complete_shards(names) == ["shard_0_of_3", "shard_1_of_3", "shard_2_of_3"]
+    for names in [
+        [],
+        ["shard_0_of_3", "shard_2_of_3"],
+        ["shard_0_of_2", "shard_1_of_2", "shard_0_of_3"],
+        ["shard_0_of_1", "manifest"],
+    ]:
+        with pytest.raises(ValueError):
+            complete_shards(names)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "duckdb"])
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "n_shards"),
+    [("test_cloud", "preprocessing", 2), ("test_cloud", "preprocessing", 5)],
+)
+def test_shard_time_aggregation(
+    kedro_env: str, catalog_entry: str, n_shards: int, engine: str
+):
+    """Test cases:
+            Merging the partial aggregates of all the shards, some of which can be
+            empty, gives the same output as resampling all the partitions
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    n_shards : int
+        Number of shards
+    engine : str
+        Execution engine of the shards
+    """
+    if engine != "pandas":
+        pytest.importorskip(engine)
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    parameters[catalog_entry]["execution_engine"] = engine
+    prep = dtp.Preprocessing(parameters)
+    path, dataset = utl.load_pds_from_catalog(kedro_env, config_entry=catalog_entry)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+
+    partials = [
+        prep.shard_time_aggregation(ds_dict, shard=(shard_index, n_shards))
+        for shard_index in range(n_shards)
+    ]
+    df_expected = prep.time_resampling(prep.preprocessing_time_data(ds_dict))
+    pd.testing.assert_frame_equal(
+        prep.merge_time_aggregations(partials), df_expected, check_freq=False
+    )
+    with pytest.raises(ValueError):
+        prep.shard_time_aggregation(ds_dict)
@@ -0,0 +1,158 @@
+"""Unit tests for the file sql_pushdown.py"""
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+import pandas as pd
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+from species_observations.scripts.sql_pushdown import (
+    DuckDBBackend,
+    SQLiteBackend,
+    period_aggregation_sql,
+)
+
+
+def sqlite_sample(df_sample: pd.DataFrame, tmp_path: Path) -> SQLiteBackend:
+    """Loads df_sample in the table observations of a SQLite database, with some
+        rows without date or count
+
+    Parameters
+    ----------
+    df_sample : pd.DataFrame
+        Raw data
+    tmp_path : Path
+        Folder of the database
+
+    Returns
+    -------
+    SQLiteBackend
+        Backend of the table
+    """
+    database = tmp_path / "observations.sqlite"
+    with closing(sqlite3.connect(database)) as connection:
+        df_sample.to_sql("observations", connection, index=False)
+    return SQLiteBackend(database=str(database), table="observations")
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "resample"),
+    [("test_cloud", "preprocessing", "D"), ("test_cloud", "preprocessing", "M")],
+)
+def test_pushdown_time_resampling_sqlite(
+    kedro_env: str, catalog_entry: str, resample: str, tmp_path: Path
+):
+    """Test cases:
+            Aggregating in SQLite gives the same output as the pandas path,
+            with missing counts as zeros and rows without date dropped
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    resample : str
+        Resample period. 'D' -> Daily.  'M' -> Montly
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    prep = dtp.Preprocessing(config["parameters"])
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    df_sample.loc[df_sample.index[:5], prep.get_date_col()] = None
+    backend = sqlite_sample(df_sample, tmp_path)
+
+    df_pushdown = prep.pushdown_time_resampling(backend, resample=resample)
+    df_expected = prep.time_resampling(
+        prep.preprocessing_time_data(df_sample.copy()), resample=resample
+    )
+    pd.testing.assert_frame_equal(df_pushdown, df_expected, check_freq=False)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_pushdown_date_range(kedro_env: str, catalog_entry: str, tmp_path: Path):
+    """Test cases:
+            Only the months within 'date_range' are aggregated
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    parameters = utl.load_config_file_kedro(kedro_env=kedro_env)["parameters"]
+    parameters[catalog_entry]["date_range"] = {"start": "2021-03", "end": "2022-02"}
+    prep = dtp.Preprocessing(parameters)
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    backend = sqlite_sample(df_sample, tmp_path)
+
+    df_pushdown = prep.pushdown_time_resampling(backend)
+    months = df_sample[prep.get_date_col()].str[:7]
+    df_in_range = df_sample[(months >= "2021-03") & (months <= "2022-02")]
+    df_expected = prep.time_resampling(prep.preprocessing_time_data(df_in_range.copy()))
+    pd.testing.assert_frame_equal(df_pushdown, df_expected, check_freq=False)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_pushdown_time_resampling_duckdb(
+    kedro_env: str, catalog_entry: str, tmp_path: Path
+):
+    """Test cases:
+            Aggregating in DuckDB, over the raw CSV file, gives the same output as
+            the pandas path
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    pytest.importorskip("duckdb")
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    prep = dtp.Preprocessing(config["parameters"])
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+    filepath = tmp_path / "sample.csv"
+    df_sample.to_csv(filepath, index=False)
+    backend = DuckDBBackend(table=f"read_csv_auto('{filepath}', all_varchar=true)")
+
+    pd.testing.assert_frame_equal(
+        prep.pushdown_time_resampling(backend),
+        prep.time_resampling(prep.preprocessing_time_data(df_sample.copy())),
+    )
+
+
+@pytest.mark.parametrize(
+    ("dialect", "resample", "expected"),
+    [
+        ("sqlite", "D", 'date(substr("eventdate", 1, 19)) AS period'),
+        ("bigquery", "M", "DATE_TRUNC(DATE(`eventdate`, 'UTC'), MONTH) AS period"),
+        ("bigquery", "D", "FROM `project.dataset.table`"),
+    ],
+)
+def test_period_aggregation_sql(dialect: str, resample: str, expected: str):
+    """Test cases:
+            Period expressions and identifiers follow the dialect
+            Raises ValueError for unknown dialects and resampling periods
+    Parameters
+    ----------
+    dialect : str
+        SQL dialect
+    resample : str
+        Resample period
+    expected : str
+        Part of the query
+    """
+    table = "project.dataset.table" if dialect == "bigquery" else "observations"
+    sql = period_aggregation_sql(
+        table, "eventdate", "individualcount", resample, dialect
+    )
+    assert expected in sql
+    assert "GROUP BY period" in sql
+    with pytest.raises(ValueError):
+        period_aggregation_sql(table, "eventdate", "individualcount", "W", dialect)
+    with pytest.raises(ValueError):
+        period_aggregation_sql(table, "eventdate", "individualcount", resample, "x")
@@ -0,0 +1,64 @@
+"""Unit tests for the file synthetic_data.py"""
+from pathlib import Path
+
+import pytest
+import pandas as pd
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+from species_observations.scripts.synthetic_data import SyntheticObservations
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "n_rows", "n_partitions"),
+    [("test_cloud", "preprocessing", 20_000, 3)],
+)
+def test_synthetic_observations(
+    tmp_path: Path, kedro_env: str, catalog_entry: str, n_rows: int, n_partitions: int
+):
+    """Test cases:
+            Partitions have the columns and types of the sample partitions
+            The total number of rows is split across n_partitions files
+            Partitions are reproducible, and gbifid is unique
+            The fraction of missing individualcount is close to the configured one
+            The first species is the most observed one
+            The partitions can be preprocessed and resampled
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the partitions
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    n_rows : int
+        Total number of rows
+    n_partitions : int
+        Number of partitions
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    df_sample = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+
+    generator = SyntheticObservations(null_count_fraction=0.2, seed=1)
+    files = generator.write(tmp_path, n_rows, n_partitions)
+    assert len(files) == n_partitions
+    df_synthetic = pd.concat([pd.read_csv(file) for file in files], ignore_index=True)
+
+    assert len(df_synthetic) == n_rows
+    pd.testing.assert_series_equal(
+        df_synthetic.dtypes, df_sample.dtypes.loc[df_synthetic.columns]
+    )
+    assert df_synthetic["gbifid"].is_unique
+    assert df_synthetic["individualcount"].isna().mean() == pytest.approx(0.2, abs=0.02)
+    assert df_synthetic["species"].value_counts().index[0] == "Anas platyrhynchos"
+    pd.testing.assert_frame_equal(
+        generator.partition(100, 2),
+        SyntheticObservations(null_count_fraction=0.2, seed=1).partition(100, 2),
+    )
+
+    prep = dtp.Preprocessing(parameters)
+    df_resampled = prep.time_resampling(prep.preprocessing_time_data(df_synthetic))
+    assert df_resampled[parameters["data_cols"]["individual_count"]].sum() == (
+        df_synthetic["individualcount"].sum()
+    )
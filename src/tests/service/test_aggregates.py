@@ -0,0 +1,131 @@
+"""Unit tests for the file aggregates.py"""
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+import pandas as pd
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+from species_observations.service.aggregates import AggregateIndex
+
+
+def write_sources(
+    tmp_path: Path, kedro_env: str, catalog_entry: str
+) -> Tuple[Dict[str, str], Dict, pd.Series, pd.DataFrame]:
+    """Writes the resampled and grouped aggregates of the sample data, as the
+        pipelines save them
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the aggregates
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+
+    Returns
+    -------
+    Tuple[Dict[str, str], Dict, pd.Series, pd.DataFrame]
+        Sources, parameters, resampled counts and grouped aggregate
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    prep = dtp.Preprocessing(parameters)
+    df_raw = utl.load_csv_from_catalog(kedro_env, config_entry=catalog_entry)
+
+    df_resampled = prep.time_resampling(prep.preprocessing_time_data(df_raw.copy()))
+    df_grouped = prep.grouped_time_aggregation(df_raw)
+    sources = {
+        "resampled": str(tmp_path / "resampled.csv"),
+        "rollups": str(tmp_path / "missing_rollups.csv"),
+        "grouped": str(tmp_path / "grouped.csv"),
+    }
+    df_resampled.to_csv(sources["resampled"])
+    df_grouped.to_csv(sources["grouped"], index=False)
+    return sources, parameters, prep.resampled_counts(df_resampled), df_grouped
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_aggregate_index_queries(tmp_path: Path, kedro_env: str, catalog_entry: str):
+    """Test cases:
+            range_query() total is the sum of the resampled counts of the range
+            period_query() is the same as resampling the counts, when the rollups
+                file is missing
+            group_query() totals and series are the same as grouping the aggregate
+            Invalid periods and grouping keys raise ValueError
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the aggregates
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    sources, parameters, counts, df_grouped = write_sources(
+        tmp_path, kedro_env, catalog_entry
+    )
+    index = AggregateIndex(sources, parameters)
+    start, end = "2021-03-10", "2021-06-20"
+    in_range = counts[start:end]
+
+    answer = index.range_query(start, end)
+    assert answer["periods"] == len(in_range)
+    assert answer["total"] == pytest.approx(in_range.sum())
+    assert index.range_query()["total"] == pytest.approx(counts.sum())
+    assert index.range_query("2100-01-01")["periods"] == 0
+
+    answer = index.period_query("M", start, end)
+    monthly = counts.resample("M").sum()
+    monthly = monthly[(monthly.index >= start) & (monthly.index <= end)]
+    assert answer["counts"] == monthly.tolist()
+    assert answer["dates"] == [date.isoformat() for date in monthly.index]
+
+    group_col = parameters["data_cols"]["species"]
+    date_col = list(df_grouped.columns)[-2]
+    df_range = df_grouped[df_grouped[date_col].between(start, end)]
+    totals = df_range.groupby(group_col, observed=True)[counts.name].sum()
+    answer = index.group_query("species", start, end, limit=3)
+    assert answer["totals"] == totals.sort_values(ascending=False).iloc[:3].tolist()
+
+    value = answer["groups"][0]
+    answer = index.group_query("species", start, end, value=value)
+    assert sum(answer["counts"]) == pytest.approx(totals[value])
+
+    for query, kwargs in [
+        (index.period_query, {"period": "X"}),
+        (index.group_query, {"by": "unknown"}),
+    ]:
+        with pytest.raises(ValueError):
+            query(**kwargs)
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_aggregate_index_is_stale(tmp_path: Path, kedro_env: str, catalog_entry: str):
+    """Test cases:
+            The index is stale only after one of its sources changes
+            Raises ValueError if the resampled aggregate does not exist
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the aggregates
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    sources, parameters, _, _ = write_sources(tmp_path, kedro_env, catalog_entry)
+    index = AggregateIndex(sources, parameters)
+    assert not index.is_stale()
+    os.utime(sources["grouped"], ns=(0, 0))
+    assert index.is_stale()
+
+    with pytest.raises(ValueError):
+        AggregateIndex(dict(sources, resampled=str(tmp_path / "none.csv")), parameters)
@@ -0,0 +1,158 @@
+"""Unit tests for the file server.py"""
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+
+from species_observations.service.aggregates import AggregateIndex
+from species_observations.service.server import LRUCache, QueryService
+from tests.service.test_aggregates import write_sources
+
+
+async def http_get(port: int, targets: list) -> list:
+    """Sends GET requests over a single keep-alive connection
+
+    Parameters
+    ----------
+    port : int
+        Port of the local service
+    targets : list
+        Paths with query of the requests
+
+    Returns
+    -------
+    list
+        (status, JSON body) of every response
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for target in targets:
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        body = await reader.readexactly(int(headers["content-length"]))
+        responses.append((status, json.loads(body)))
+    writer.close()
+    return responses
+
+
+def test_lru_cache():
+    """Test cases:
+    The least recently used entry is evicted
+    Hits and misses are counted
+    """
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 1}
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_query_service(tmp_path: Path, kedro_env: str, catalog_entry: str):
+    """Test cases:
+            Answers are the same as the queries of AggregateIndex
+            Repeated queries are answered from the cache
+            Invalid queries give 400, unknown endpoints 404
+            The index is reloaded when an aggregate changes, and the cache emptied
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the aggregates
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    sources, parameters, counts, _ = write_sources(tmp_path, kedro_env, catalog_entry)
+    service = QueryService(
+        lambda: AggregateIndex(sources, parameters), cache_size=8, reload_interval=0
+    )
+
+    async def scenario() -> Tuple[list, list, bool]:
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        first = await http_get(
+            port,
+            [
+                "/range?start=2021-03-10&end=2021-06-20",
+                "/range?end=2021-06-20&start=2021-03-10",
+                "/period?period=X",
+                "/unknown",
+                "/health",
+            ],
+        )
+        counts.iloc[:1].to_frame().to_csv(sources["resampled"])
+        os.utime(sources["resampled"], ns=(1, 1))
+        reloaded = await service.reload_if_stale()
+        second = await http_get(port, ["/range", "/health"])
+        await service.stop()
+        return first, second, reloaded
+
+    first, second, reloaded = asyncio.run(scenario())
+    expected = service.get_index().range_query()
+    assert [status for status, _ in first] == [200, 200, 400, 404, 200]
+    assert first[0][1] == first[1][1]
+    assert first[0][1]["total"] == pytest.approx(
+        counts["2021-03-10":"2021-06-20"].sum()
+    )
+    assert first[4][1]["cache"]["hits"] == 1
+
+    assert reloaded
+    assert second[0] == (200, expected)
+    assert second[0][1]["total"] == counts.iloc[0]
+    assert second[1][1]["reloads"] == 1
+    assert second[1][1]["cache"]["size"] == 1
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_query_service_error(
+    tmp_path: Path, kedro_env: str, catalog_entry: str, monkeypatch
+):
+    """Test cases:
+            A query failing with an unexpected error gives 500 over HTTP
+            The failure is not cached, so the query is answered once it works
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the aggregates
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    sources, parameters, _, _ = write_sources(tmp_path, kedro_env, catalog_entry)
+    service = QueryService(
+        lambda: AggregateIndex(sources, parameters), cache_size=8, reload_interval=0
+    )
+    range_query = service.get_index().range_query
+
+    def failing_range_query(**kwargs):
+        raise KeyError("missing aggregate")
+
+    async def scenario() -> list:
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(service.get_index(), "range_query", failing_range_query)
+        failed = await http_get(port, ["/range"])
+        monkeypatch.setattr(service.get_index(), "range_query", range_query)
+        answered = await http_get(port, ["/range"])
+        await service.stop()
+        return failed + answered
+
+    failed, answered = asyncio.run(scenario())
+    assert failed == (500, {"error": "Internal Server Error"})
+    assert answered == (200, range_query())
@@ -0,0 +1,247 @@
+"""Unit tests for the file hooks.py"""
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+import pandas as pd
+from kedro.io import DataCatalog
+from kedro.pipeline import node
+
+import species_observations.utils as utl
+import species_observations.scripts.data_processing as dtp
+from species_observations.hooks import ProjectHooks, TimingHooks
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry", "test_entry"),
+    [
+        ("test_cloud", "preprocessing", "partitioned_sample_catalog"),
+        ("test_cloud", "preprocessing", "csv_sample_catalog"),
+    ],
+)
+def test_after_catalog_created_projection(
+    kedro_env: str, catalog_entry: str, test_entry: str
+):
+    """Test cases:
+            Datasets listed in column_projection only load the required columns,
+            with the expected types
+            Resampling the projected data gives the same output as the full data
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    test_entry : str
+        Entry within catalog_entry -> tests with the name of the catalog dataset
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    ds_name = parameters[catalog_entry]["tests"][test_entry]
+    conf_catalog = {ds_name: config["catalog"][ds_name]}
+    parameters[catalog_entry]["column_projection"]["datasets"] = [ds_name]
+
+    catalog = DataCatalog.from_config(conf_catalog)
+    df_full = utl.validates_dataframe(catalog.load(ds_name))
+    ProjectHooks().after_catalog_created(
+        catalog, conf_catalog, {}, {"parameters": parameters}, None, {}
+    )
+    df_projected = utl.validates_dataframe(catalog.load(ds_name))
+
+    prep = dtp.Preprocessing(parameters)
+    required_columns = prep.get_required_columns()
+    assert sorted(df_projected.columns) == sorted(required_columns)
+    for column, dtype in required_columns.items():
+        assert df_projected[column].dtype == pd.Series(dtype=dtype).dtype
+
+    pd.testing.assert_frame_equal(
+        prep.time_resampling(prep.preprocessing_time_data(df_projected)),
+        prep.time_resampling(prep.preprocessing_time_data(df_full)),
+    )
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_after_catalog_created_grouped_projection(kedro_env: str, catalog_entry: str):
+    """Test cases:
+            Datasets listed in column_projection -> grouped_datasets also load the
+            grouping columns, with 'grouping' disabled
+            The grouped aggregation of the projected data is the same as that of
+            the full data
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    ds_name = parameters[catalog_entry]["tests"]["partitioned_sample_catalog"]
+    conf_catalog = {ds_name: config["catalog"][ds_name]}
+    parameters[catalog_entry]["grouping"]["enabled"] = False
+    parameters[catalog_entry]["column_projection"]["datasets"] = []
+    parameters[catalog_entry]["column_projection"]["grouped_datasets"] = [ds_name]
+
+    catalog = DataCatalog.from_config(conf_catalog)
+    df_full = utl.validates_dataframe(catalog.load(ds_name))
+    ProjectHooks().after_catalog_created(
+        catalog, conf_catalog, {}, {"parameters": parameters}, None, {}
+    )
+    df_projected = utl.validates_dataframe(catalog.load(ds_name))
+
+    prep = dtp.Preprocessing(parameters)
+    assert sorted(df_projected.columns) == sorted(
+        prep.get_required_columns(grouped=True)
+    )
+    assert len(prep.get_required_columns(grouped=True)) > len(
+        prep.get_required_columns()
+    )
+    pd.testing.assert_frame_equal(
+        prep.grouped_time_aggregation(df_projected),
+        prep.grouped_time_aggregation(df_full),
+    )
+
+
+def test_timing_hooks(tmp_path: Path):
+    """Test cases:
+            Node and dataset events are appended to the JSONL file, with the run
+            Rows and file bytes are recorded for dataframes and file-based datasets
+            The Prometheus textfile sums the operations of each dataset
+            Parameters are not recorded, and nothing is recorded if disabled
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the output files and of the dataset
+    """
+    monitoring = {
+        "enabled": True,
+        "jsonl_path": str(tmp_path / "timings.jsonl"),
+        "prometheus_path": str(tmp_path / "timings.prom"),
+    }
+    df_data = pd.DataFrame({"individualcount": [1.0, 2.0, 3.0]})
+    catalog = DataCatalog.from_config(
+        {"data": {"type": "pandas.CSVDataSet", "filepath": str(tmp_path / "data.csv")}}
+    )
+    hooks = TimingHooks()
+    hooks.after_catalog_created(catalog, {"parameters": {"monitoring": monitoring}})
+
+    test_node = node(lambda df: df, inputs="data", outputs="data_copy", name="copy")
+    hooks.before_dataset_saved("data")
+    catalog.save("data", df_data)
+    hooks.after_dataset_saved("data", df_data)
+    for _ in range(2):
+        hooks.before_dataset_loaded("data")
+        hooks.after_dataset_loaded("data", catalog.load("data"))
+    hooks.before_dataset_loaded("parameters")
+    hooks.after_dataset_loaded("parameters", {})
+    hooks.before_node_run(test_node)
+    hooks.after_node_run(test_node, {"data": df_data}, {"data_copy": df_data})
+    hooks.after_pipeline_run({"session_id": "s", "pipeline_name": None, "env": "base"})
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "timings.jsonl").read_text().splitlines()
+    ]
+    assert len(records) == 4
+    assert {record["pipeline"] for record in records} == {"__default__"}
+    node_record = [record for record in records if record["event"] == "node"][0]
+    assert node_record["input_rows"] == node_record["output_rows"] == 3
+    save_record = [record for record in records if record["event"] == "dataset_save"][0]
+    assert save_record["rows"] == 3
+    assert save_record["file_bytes"] == (tmp_path / "data.csv").stat().st_size
+
+    prometheus = (tmp_path / "timings.prom").read_text()
+    assert (
+        'species_observations_dataset_operations{pipeline="__default__",'
+        'dataset="data",operation="load"} 2'
+    ) in prometheus
+    assert 'node="copy"' in prometheus
+    assert "parameters" not in prometheus
+
+    disabled = TimingHooks()
+    disabled.after_catalog_created(catalog, {"parameters": {}})
+    disabled.before_node_run(test_node)
+    disabled.after_node_run(test_node, {}, {})
+    disabled.after_pipeline_run({})
+    assert len((tmp_path / "timings.jsonl").read_text().splitlines()) == 4
+
+
+@pytest.mark.parametrize(
+    ("kedro_env", "catalog_entry"), [("test_cloud", "preprocessing")]
+)
+def test_timing_hooks_partitions(kedro_env: str, catalog_entry: str, tmp_path: Path):
+    """Test cases:
+            The partitions of a PartitionedDataSet loaded by a node are timed, and
+            their rows are the input rows of the node
+            Timed load functions keep the file of the partition and can be pickled
+            Datasets outside the local filesystem have no file bytes
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    catalog_entry : str
+        Entry from the .yml configuration file associated to the kedro pipeline
+        The partitioned data to be used as test data is specified in catalog_entry
+        as tests -> partitioned_sample_catalog
+    tmp_path : Path
+        Folder of the output files
+    """
+    config = utl.load_config_file_kedro(kedro_env=kedro_env)
+    parameters = config["parameters"]
+    ds_name = parameters[catalog_entry]["tests"]["partitioned_sample_catalog"]
+    catalog = DataCatalog.from_config(
+        {
+            ds_name: config["catalog"][ds_name],
+            "remote": {"type": "pandas.CSVDataSet", "filepath": "memory://data.csv"},
+        }
+    )
+    hooks = TimingHooks()
+    hooks.after_catalog_created(
+        catalog,
+        {
+            "parameters": {
+                "monitoring": {
+                    "enabled": True,
+                    "jsonl_path": str(tmp_path / "timings.jsonl"),
+                    "prometheus_path": None,
+                }
+            }
+        },
+    )
+
+    total_rows = len(utl.validates_dataframe(catalog.load(ds_name)))
+    hooks.before_dataset_loaded(ds_name)
+    pd_dict = catalog.load(ds_name)
+    hooks.after_dataset_loaded(ds_name, pd_dict)
+    load_func = next(iter(pd_dict.values()))
+    assert utl.partition_source(load_func) is not None
+    assert isinstance(pickle.loads(pickle.dumps(load_func))(), pd.DataFrame)
+
+    test_node = node(
+        dtp.Preprocessing(parameters).preprocessing_time_data,
+        inputs=ds_name,
+        outputs="preprocessed",
+        name="preprocess",
+    )
+    hooks.before_node_run(test_node)
+    outputs = {"preprocessed": test_node.run({ds_name: pd_dict})["preprocessed"]}
+    hooks.after_node_run(test_node, {ds_name: pd_dict}, outputs)
+    hooks.before_dataset_saved("remote")
+    catalog.save("remote", outputs["preprocessed"])
+    hooks.after_dataset_saved("remote", outputs["preprocessed"])
+    hooks.after_pipeline_run({})
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "timings.jsonl").read_text().splitlines()
+    ]
+    records = {record["event"]: record for record in records}
+    assert records["dataset_load"]["partitions"] == len(pd_dict)
+    assert records["dataset_partition_load"]["partitions"] == len(pd_dict)
+    assert records["dataset_partition_load"]["rows"] == total_rows
+    assert records["node"]["input_rows"] == total_rows
+    assert records["node"]["rows_per_second"] > 0
+    assert records["dataset_save"]["file_bytes"] is None
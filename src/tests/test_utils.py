@@ -1,9 +1,11 @@
 """Unit tests for the file utils.py"""
+from pathlib import Path
 from typing import Dict
 import os
 import pytest
 
 import pandas as pd
+from kedro.config import ConfigLoader, MissingConfigException
 from kedro_datasets.pandas import CSVDataSet
 
 import species_observations.utils as utl
@@ -195,3 +197,171 @@ def test_validates_dataframe(data_type: str, path: str):
 def test_validates_dataframe_type(input_data: object):
     with pytest.raises(ValueError):
         utl.validates_dataframe(input_data)
+
+
+@pytest.mark.parametrize(("max_workers"), [(1), (4)])
+def test_partitioned_ds_to_df_column_union(max_workers: int):
+    """Test cases:
+            Partitions with different columns are joined with the union of
+            their columns, sorted, and in the order of the partitions
+    Parameters
+    ----------
+    max_workers : int
+        Maximum number of partitions loaded at the same time
+    """
+    pd_dict = {
+        "part_1": lambda: pd.DataFrame({"b": [1.0, 2.0], "a": ["x", "y"]}),
+        "part_2": lambda: pd.DataFrame({"c": [3.0], "a": ["z"]}),
+    }
+    df_out = utl.partitioned_ds_to_df(pd_dict, max_workers=max_workers)
+    assert list(df_out.columns) == ["a", "b", "c"]
+    assert list(df_out["a"]) == ["x", "y", "z"]
+    assert list(df_out.index) == [0, 1, 2]
+    assert utl.partitioned_ds_to_df({}).empty
+
+
+@pytest.mark.parametrize(
+    ("ds_config", "file_format"),
+    [
+        ({"type": "pandas.CSVDataSet", "filepath": "data.csv"}, "csv"),
+        (
+            {
+                "type": "PartitionedDataSet",
+                "path": "data",
+                "dataset": "pandas.CSVDataSet",
+            },
+            "csv",
+        ),
+        ({"type": "pandas.ParquetDataSet", "filepath": "data.parquet"}, "parquet"),
+        ({"type": "pandas.GBQQueryDataSet", "sql": "SELECT 1"}, None),
+    ],
+)
+def test_project_dataset_config(ds_config: Dict, file_format: str):
+    """Test cases:
+            The file format of datasets and of partitions is recovered
+            load_args are added to the dataset or to its partitions
+            The input configuration is not modified
+    Parameters
+    ----------
+    ds_config : Dict
+        Entry of the data catalog
+    file_format : str
+        Expected file format
+    """
+    assert utl.dataset_file_format(ds_config) == file_format
+
+    load_args = {"usecols": ["eventdate"], "dtype": {"eventdate": "str"}}
+    ds_out = utl.project_dataset_config(ds_config, load_args)
+    target = ds_out["dataset"] if "dataset" in ds_out else ds_out
+    assert target["load_args"] == load_args
+    assert "load_args" not in ds_config
+
+
+@pytest.mark.parametrize(
+    ("filepath", "date_col", "date_format"),
+    [
+        ("data//01_raw//species_bigQuery_sample.csv", "eventdate", None),
+        (
+            "data//01_raw//species_bigQuery_sample.csv",
+            "eventdate",
+            "%Y-%m-%d %H:%M:%S %Z",
+        ),
+    ],
+)
+def test_parse_dates_cached(filepath: str, date_col: str, date_format: str):
+    """Test cases:
+            Output is the same as pd.to_datetime, including missing values
+    Parameters
+    ----------
+    filepath : str
+        Location of csv
+    date_col : str
+        Column with the dates
+    date_format : str
+        strftime format of the dates
+    """
+    dates = utl.load_csv_from_filepath(filepath)[date_col]
+    dates.iloc[::7] = None
+    pd.testing.assert_series_equal(
+        utl.parse_dates_cached(dates, date_format), pd.to_datetime(dates)
+    )
+
+
+@pytest.mark.parametrize(("filepath"), [("data//01_raw//species_bigQuery_sample.csv")])
+def test_dates_from_components(filepath: str):
+    """Test cases:
+            Dates built from year, month and day are the same as the parsed eventdate,
+            at daily resolution
+    Parameters
+    ----------
+    filepath : str
+        Location of csv
+    """
+    df_sample = utl.load_csv_from_filepath(filepath)
+    dates = utl.dates_from_components(
+        df_sample["year"], df_sample["month"], df_sample["day"], tz="UTC"
+    )
+    assert (dates == pd.to_datetime(df_sample["eventdate"]).dt.floor("D")).all()
+
+
+@pytest.mark.parametrize(("kedro_env"), [("test_cloud")])
+def test_partition_fingerprint(kedro_env: str):
+    """Test cases:
+            Partitions backed by files are identified by their size and mtime
+            Partitions not backed by files have no fingerprint
+            Content fingerprints change with the contents
+    Parameters
+    ----------
+    kedro_env : str
+        kedro environment to be used
+    """
+    path, dataset = utl.load_pds_from_catalog(kedro_env)
+    ds_dict = utl.load_partitioned_ds_kedro(path, dataset)
+    for _, load_func in ds_dict.items():
+        fingerprint = utl.partition_fingerprint(load_func)
+        assert {"size", "mtime"}.issubset(fingerprint)
+        assert utl.partition_source(load_func)[1].endswith(".csv")
+
+    df_sample = pd.DataFrame({"a": [1, 2]})
+    assert utl.partition_fingerprint(lambda: df_sample) is None
+    assert utl.content_fingerprint(df_sample) == utl.content_fingerprint(
+        df_sample.copy()
+    )
+    assert utl.content_fingerprint(df_sample) != utl.content_fingerprint(
+        df_sample.iloc[:1]
+    )
+
+
+def test_load_config_file_kedro_cache(tmp_path: Path):
+    """Test cases:
+            The config of an environment is parsed once, and reused while its
+            files do not change
+            Modifying what is returned does not modify the cache
+            Modifying a config file parses the config again
+            The config is a ConfigLoader, with its interface
+    Parameters
+    ----------
+    tmp_path : Path
+        Folder of the config
+    """
+    parameters_file = tmp_path / "base" / "parameters.yml"
+    parameters_file.parent.mkdir()
+    parameters_file.write_text("preprocessing:\n  resampling_period: D\n")
+
+    config = utl.load_config_file_kedro(conf_source=str(tmp_path))
+    parameters = config["parameters"]
+    parameters["preprocessing"]["resampling_period"] = "X"
+    assert utl.load_config_file_kedro(conf_source=str(tmp_path)) is config
+    assert config["parameters"]["preprocessing"]["resampling_period"] == "D"
+    assert isinstance(config, ConfigLoader)
+    assert config.get(*config.config_patterns["parameters"]) == config["parameters"]
+    with pytest.raises(MissingConfigException):
+        config["catalog"]
+    config["catalog"] = {}
+    assert "catalog" in config and config["catalog"] == {}
+
+    parameters_file.write_text("preprocessing:\n  resampling_period: M\n")
+    os.utime(parameters_file, ns=(0, 0))
+    reloaded = utl.load_config_file_kedro(conf_source=str(tmp_path))
+    assert reloaded is not config
+    assert reloaded["parameters"]["preprocessing"]["resampling_period"] == "M"